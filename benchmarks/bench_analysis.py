@@ -0,0 +1,54 @@
+"""``GraphAnalysis`` caches and ``KnowledgeGraph.update``."""
+
+from node_graph.analysis import GraphAnalysis
+
+from common import TOPOLOGIES, add, annotated_add, chain
+
+
+class AnalysisRebuild:
+    params = [["chain", "diamonds"], [100, 1000, 10000]]
+    param_names = ["topology", "tasks"]
+    number = 1
+    repeat = 3
+
+    def setup(self, topology, n):
+        self.graph = TOPOLOGIES[topology](n)
+
+    def time_rebuild(self, topology, n):
+        GraphAnalysis(self.graph).build_connectivity()
+
+    def time_reachability(self, topology, n):
+        GraphAnalysis(self.graph).reachability()
+
+
+class AnalysisAfterEdit:
+    """Query descendants after adding and removing a task, which invalidates caches."""
+
+    params = [100, 1000, 10000]
+    param_names = ["tasks"]
+    number = 1
+    repeat = 3
+
+    def setup(self, n):
+        self.graph = chain(n)
+        self.analysis = GraphAnalysis(self.graph)
+        self.analysis.build_connectivity()
+        self.first = self.graph.tasks["t0"]
+
+    def time_edit_and_query(self, n):
+        extra = self.graph.add_task(add, "extra", x=self.first.outputs.result, y=1)
+        self.analysis.get_all_descendants(self.first)
+        self.graph.delete_tasks([extra.name])
+        self.analysis.get_all_descendants(self.first)
+
+
+class KnowledgeGraphUpdate:
+    params = [100, 1000]
+    param_names = ["tasks"]
+    number = 1
+
+    def setup(self, n):
+        self.graph = chain(n, fn=annotated_add)
+
+    def time_update(self, n):
+        self.graph.knowledge_graph.update()
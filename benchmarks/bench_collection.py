@@ -0,0 +1,43 @@
+"""Positional and uuid access on large collections."""
+
+from node_graph.collection import Collection
+
+
+class Item:
+    def __init__(self, i):
+        self.name = f"item{i}"
+        self.uuid = f"uuid-{i}"
+
+
+class CollectionAccess:
+    params = [1000, 10000]
+    param_names = ["items"]
+    number = 1
+
+    def setup(self, n):
+        self.collection = Collection()
+        for i in range(n):
+            self.collection._append(Item(i))
+
+    def time_getitem_by_position(self, n):
+        coll = self.collection
+        for i in range(n):
+            coll[i]
+
+    def time_get_by_uuid(self, n):
+        coll = self.collection
+        for i in range(n):
+            coll._get_by_uuid(f"uuid-{i}")
+
+    def time_delete_by_position(self, n):
+        # from the back, as Graph.delete_tasks deletes links
+        coll = self.collection
+        for i in reversed(range(0, n, 2)):
+            del coll[i]
+
+    def time_delete_by_name_then_read(self, n):
+        coll = self.collection
+        for i in range(0, n, 2):
+            del coll[f"item{i}"]
+        for i in range(len(coll)):
+            coll[i]
@@ -0,0 +1,17 @@
+"""Running graphs of trivial tasks, i.e. the per-task cost of the engine."""
+
+from node_graph.engine.local import LocalEngine
+
+from common import TOPOLOGIES
+
+
+class LocalEngineRun:
+    params = [["chain", "fan_out", "diamonds"], [100, 1000], ["proxy", "light"]]
+    param_names = ["topology", "tasks", "tagging"]
+    number = 1
+
+    def setup(self, topology, n, tagging):
+        self.graph = TOPOLOGIES[topology](n)
+
+    def time_run(self, topology, n, tagging):
+        LocalEngine(tagging=tagging).run(self.graph)
@@ -0,0 +1,69 @@
+"""Building and serializing graphs."""
+
+from node_graph import Graph
+
+from common import TOPOLOGIES, entry_point_chain, lattice, yaml_chain
+
+
+class BuildGraph:
+    """``Graph.add_task`` with linked inputs, i.e. ``add_link`` for every edge."""
+
+    params = [["chain", "fan_out", "diamonds"], [100, 1000, 10000]]
+    param_names = ["topology", "tasks"]
+    number = 1
+    repeat = 3
+
+    def time_build(self, topology, n):
+        TOPOLOGIES[topology](n)
+
+
+class DeleteTasks:
+    """``Graph.delete_tasks`` of every tenth task of a graph with 20k links."""
+
+    params = [1000]
+    param_names = ["deleted"]
+    number = 1
+    repeat = 3
+
+    def setup(self, n):
+        self.graph = lattice(10 * n + 2)
+        self.names = [f"t{i}" for i in range(2, 10 * n + 2, 10)]
+
+    def time_delete_tasks(self, n):
+        self.graph.delete_tasks(self.names)
+
+
+class DictRoundTrip:
+    params = [100, 1000, 10000]
+    param_names = ["tasks"]
+    number = 1
+    repeat = 3
+
+    def setup(self, n):
+        self.graph = entry_point_chain(n)
+        self.data = self.graph.to_dict()
+
+    def time_to_dict(self, n):
+        self.graph.to_dict()
+
+    def time_from_dict(self, n):
+        Graph.from_dict(self.data)
+
+
+class YamlRoundTrip:
+    """``to_yaml`` of a built graph and ``from_yaml`` of the authoring format."""
+
+    params = [100, 1000]
+    param_names = ["tasks"]
+    number = 1
+    repeat = 3
+
+    def setup(self, n):
+        self.graph = entry_point_chain(n)
+        self.text = yaml_chain(n)
+
+    def time_to_yaml(self, n):
+        self.graph.to_yaml()
+
+    def time_from_yaml(self, n):
+        Graph.from_yaml(string=self.text)
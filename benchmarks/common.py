@@ -0,0 +1,104 @@
+"""Graphs shared by the benchmarks."""
+
+from __future__ import annotations
+from typing import Annotated
+
+from node_graph import Graph, task
+from node_graph.socket_spec import meta
+
+
+@task()
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+energy = meta(
+    semantics={
+        "label": "Energy",
+        "iri": "qudt:Energy",
+        "context": {"qudt": "http://qudt.org/schema/qudt/"},
+    }
+)
+
+
+@task()
+def annotated_add(x: int, y: int) -> Annotated[int, energy]:
+    return x + y
+
+
+def chain(n: int, fn=add) -> Graph:
+    """``n`` tasks, each reading the result of the previous one."""
+    ng = Graph(name="chain")
+    prev = ng.add_task(fn, "t0", x=1, y=1)
+    for i in range(1, n):
+        prev = ng.add_task(fn, f"t{i}", x=prev.outputs.result, y=1)
+    return ng
+
+
+def fan_out(n: int, fn=add) -> Graph:
+    """One source task read by ``n - 1`` independent tasks."""
+    ng = Graph(name="fan_out")
+    source = ng.add_task(fn, "t0", x=1, y=1)
+    for i in range(1, n):
+        ng.add_task(fn, f"t{i}", x=source.outputs.result, y=i)
+    return ng
+
+
+def diamonds(n: int, fn=add) -> Graph:
+    """A chain of diamonds: ``a -> (b, c) -> d``, where ``d`` is the next ``a``."""
+    ng = Graph(name="diamonds")
+    top = ng.add_task(fn, "t0", x=1, y=1)
+    for i in range(1, n - 2, 3):
+        left = ng.add_task(fn, f"t{i}", x=top.outputs.result, y=1)
+        right = ng.add_task(fn, f"t{i + 1}", x=top.outputs.result, y=2)
+        top = ng.add_task(
+            fn, f"t{i + 2}", x=left.outputs.result, y=right.outputs.result
+        )
+    return ng
+
+
+TOPOLOGIES = {"chain": chain, "fan_out": fan_out, "diamonds": diamonds}
+
+
+def entry_point_chain(n: int) -> Graph:
+    """Like ``chain``, with a task loaded from an entry point, so it serializes."""
+    ng = Graph(name="chain")
+    prev = ng.add_task("node_graph.test_add", "t0", x=1, y=1)
+    for i in range(1, n):
+        task_ = ng.add_task("node_graph.test_add", f"t{i}", y=1)
+        ng.add_link(prev.outputs.result, task_.inputs.x)
+        prev = task_
+    return ng
+
+
+def yaml_chain(n: int) -> str:
+    """A ``chain`` of ``n`` tasks in the authoring format read by ``Graph.from_yaml``."""
+    import yaml
+
+    tasks = [
+        {"identifier": "node_graph.test_add", "name": f"t{i}", "inputs": {"y": 1.0}}
+        for i in range(n)
+    ]
+    links = [
+        {
+            "from_task": f"t{i - 1}",
+            "from_socket": "result",
+            "to_task": f"t{i}",
+            "to_socket": "x",
+        }
+        for i in range(1, n)
+    ]
+    return yaml.dump({"name": "chain", "tasks": tasks, "links": links})
+
+
+def lattice(n: int, fn=add) -> Graph:
+    """``n`` tasks, each reading the results of the two previous tasks."""
+    ng = Graph(name="lattice")
+    tasks = [ng.add_task(fn, "t0", x=1, y=1), ng.add_task(fn, "t1", x=1, y=1)]
+    for i in range(2, n):
+        tasks.append(
+            ng.add_task(
+                fn, f"t{i}", x=tasks[-1].outputs.result, y=tasks[-2].outputs.result
+            )
+        )
+    return ng
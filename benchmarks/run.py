@@ -0,0 +1,165 @@
+"""
+Run the benchmarks and store the timings as JSON.
+
+Benchmarks follow the asv conventions: a ``bench_*.py`` module holds classes whose
+``time_*`` methods are timed once per combination of the class ``params``; ``setup``
+(and ``teardown``) receive the same parameters and are not timed. ``number`` and
+``repeat`` class attributes override how often a method runs per sample and how many
+samples are taken.
+
+    python benchmarks/run.py                      # all benchmarks
+    python benchmarks/run.py -b engine -o new.json
+    python benchmarks/run.py --compare old.json   # flag regressions against old.json
+"""
+
+from __future__ import annotations
+import argparse
+import datetime
+import importlib
+import itertools
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+RESULTS = HERE / "results"
+
+
+def discover() -> Iterator[Tuple[str, type, str]]:
+    """Yield ``(name, class, method)`` of every benchmark."""
+    sys.path.insert(0, str(HERE))
+    for path in sorted(HERE.glob("bench_*.py")):
+        module = importlib.import_module(path.stem)
+        for cls_name, cls in sorted(vars(module).items()):
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for method in sorted(m for m in vars(cls) if m.startswith("time_")):
+                yield f"{path.stem[6:]}.{cls_name}.{method}", cls, method
+
+
+def _param_grid(cls: type) -> List[Tuple[Any, ...]]:
+    params = getattr(cls, "params", None)
+    if params is None:
+        return [()]
+    if not (params and isinstance(params[0], (list, tuple))):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def time_benchmark(cls: type, method: str, args: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Samples of seconds per call of ``cls().method(*args)``."""
+    bench = cls()
+    number = getattr(cls, "number", 0)
+    repeat = getattr(cls, "repeat", 5)
+    samples = []
+    for _ in range(repeat):
+        if hasattr(bench, "setup"):
+            bench.setup(*args)
+        try:
+            timer = timeit.Timer(lambda: getattr(bench, method)(*args))
+            if not number:
+                # enough calls for a sample of at least 0.2 s, as ``timeit`` does
+                number, _ = timer.autorange()
+            samples.append(timer.timeit(number) / number)
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown(*args)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "number": number,
+        "samples": samples,
+    }
+
+
+def _metadata() -> Dict[str, Any]:
+    import node_graph
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "node_graph": node_graph.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], factor: float
+) -> List[str]:
+    """Print the ratio to ``baseline`` of every benchmark; return the regressions."""
+    regressions = []
+    for name, new in results["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratio = new["min"] / old["min"]
+        flag = ""
+        if ratio > factor:
+            flag = "  slower"
+            regressions.append(name)
+        elif ratio < 1 / factor:
+            flag = "  faster"
+        print(f"{ratio:6.2f}x  {name}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "-b", "--bench", help="regex selecting benchmarks, e.g. 'engine' or '1000'"
+    )
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    parser.add_argument("--compare", help="JSON results to compare against")
+    parser.add_argument(
+        "--factor",
+        type=float,
+        default=1.1,
+        help="slowdown reported as a regression by --compare (default 1.1)",
+    )
+    args = parser.parse_args(argv)
+
+    metadata = _metadata()
+    results: Dict[str, Any] = {"metadata": metadata, "results": {}}
+    for name, cls, method in discover():
+        for params in _param_grid(cls):
+            key = f"{name}({', '.join(map(repr, params))})" if params else name
+            if args.bench and not re.search(args.bench, key):
+                continue
+            timing = time_benchmark(cls, method, params)
+            results["results"][key] = timing
+            print(f"{timing['min'] * 1e3:12.3f} ms  {key}", flush=True)
+
+    output = Path(
+        args.output
+        or RESULTS / f"{metadata['node_graph']}-{metadata['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(results, baseline, args.factor):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ from .executor import SafeExecutor, RuntimeExecutor
 from .tasks import TaskPool
 from .collection import group
 from .socket_spec import namespace, dynamic
-from .manager import get_current_graph, While, If
+from .manager import get_current_graph, While, If, Map
 
 __version__ = "0.5.4"
 
@@ -24,5 +24,6 @@ __all__ = [
     "get_current_graph",
     "While",
     "If",
+    "Map",
     "KnowledgeGraph",
 ]
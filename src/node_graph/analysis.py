@@ -1,11 +1,23 @@
 from __future__ import annotations
+import heapq
 import numpy as np
-from typing import Any, Dict, List, Set, TYPE_CHECKING, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Set,
+    TYPE_CHECKING,
+    Optional,
+    Tuple,
+    Union,
+)
+from node_graph.config import BUILTIN_TASKS
 from node_graph.link import TaskLink
 from node_graph import Task
-from node_graph.socket import TaskSocketNamespace
-from scipy.sparse import coo_matrix
-from scipy.sparse.csgraph import depth_first_order
+from node_graph.socket import TaskSocketNamespace, TaggedValue
+from scipy.sparse import coo_matrix, csr_matrix
 
 if TYPE_CHECKING:
     from node_graph import Graph
@@ -42,12 +54,189 @@ def build_adjacency_matrix(graph: Graph):
     return adjacency, name_to_index, nodes
 
 
+def _edges(adjacency: csr_matrix, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """All edges leaving ``rows`` as ``(parents, children)`` index arrays."""
+    starts = adjacency.indptr[rows]
+    counts = adjacency.indptr[rows + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    positions = offsets + np.arange(counts.sum())
+    return np.repeat(rows, counts), adjacency.indices[positions]
+
+
+def topological_levels(adjacency: csr_matrix) -> np.ndarray:
+    """
+    Depth of every node of a DAG: 0 for nodes without predecessors, else one more
+    than the deepest predecessor. Processes one whole level per step.
+    """
+    n = adjacency.shape[0]
+    indegree = np.bincount(adjacency.indices, minlength=n)
+    levels = np.full(n, -1, dtype=np.int64)
+    frontier = np.flatnonzero(indegree == 0)
+    depth = 0
+    while frontier.size:
+        levels[frontier] = depth
+        _, children = _edges(adjacency, frontier)
+        indegree -= np.bincount(children, minlength=n)
+        children = np.unique(children)
+        frontier = children[indegree[children] == 0]
+        depth += 1
+    if (levels < 0).any():
+        raise ValueError("The graph has a cycle; levels are only defined for a DAG.")
+    return levels
+
+
+def _level_groups(levels: np.ndarray) -> List[np.ndarray]:
+    """Node indices per level, shallowest level first."""
+    order = np.argsort(levels, kind="stable")
+    bounds = np.flatnonzero(np.diff(levels[order])) + 1
+    return np.split(order, bounds) if order.size else []
+
+
+def _bit_masks(nodes: np.ndarray) -> np.ndarray:
+    """The bit of each node within its byte, in ``np.packbits`` order."""
+    return np.left_shift(1, 7 - (nodes & 7)).astype(np.uint8)
+
+
+def descendant_bits(adjacency: csr_matrix) -> np.ndarray:
+    """
+    Descendants of every node of a DAG as packed bit rows: bit ``j`` of row ``i``
+    (in ``np.packbits`` order) is set if node ``j`` is downstream of node ``i``.
+
+    Rows are propagated level by level, deepest level first: the rows of all nodes
+    of a level are OR-ed into their parents in one step.
+    """
+    n = adjacency.shape[0]
+    bits = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+    nodes = np.arange(n)
+    # every node reaches itself while propagating
+    bits[nodes, nodes >> 3] = _bit_masks(nodes)
+    for group in reversed(_level_groups(topological_levels(adjacency))):
+        parents, children = _edges(adjacency, group)
+        if not parents.size:
+            continue
+        # the edges of a parent are contiguous
+        starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+        bits[parents[starts]] |= np.bitwise_or.reduceat(bits[children], starts)
+    bits[nodes, nodes >> 3] &= ~_bit_masks(nodes)
+    return bits
+
+
+# average tasks per level below which longest_paths takes the scalar pass
+_NARROW_LEVELS = 8
+
+
+def longest_paths(
+    adjacency: csr_matrix,
+    levels: np.ndarray,
+    weights: np.ndarray,
+    downstream: bool = False,
+) -> np.ndarray:
+    """
+    Weight of the heaviest path of a DAG ending at every node, or starting at it
+    with ``downstream``, the node's own weight included.
+
+    Wide graphs are processed one level per vectorized step. Deep, narrow graphs
+    (e.g. long chains) have about as many levels as nodes, which would make that
+    quadratic, so they take a scalar pass over the nodes in topological order.
+    """
+    n = len(weights)
+    groups = _level_groups(levels)
+    if len(groups) * _NARROW_LEVELS > n:
+        return _longest_paths_scalar(adjacency, levels, weights, downstream)
+    total = np.zeros(n)
+    best = np.zeros(n)  # heaviest neighbour path, excluding the node
+    if downstream:
+        for group in reversed(groups):
+            parents, children = _edges(adjacency, group)
+            np.maximum.at(best, parents, total[children])
+            total[group] = weights[group] + best[group]
+    else:
+        for group in groups:
+            total[group] = best[group] + weights[group]
+            parents, children = _edges(adjacency, group)
+            np.maximum.at(best, children, total[parents])
+    return total
+
+
+def _longest_paths_scalar(
+    adjacency: csr_matrix,
+    levels: np.ndarray,
+    weights: np.ndarray,
+    downstream: bool,
+) -> np.ndarray:
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    weight = weights.tolist()
+    order = np.argsort(levels, kind="stable").tolist()
+    total = [0.0] * len(weight)
+    if downstream:
+        for i in reversed(order):
+            children = indices[indptr[i] : indptr[i + 1]]
+            total[i] = weight[i] + max((total[j] for j in children), default=0.0)
+    else:
+        best = [0.0] * len(weight)
+        for i in order:
+            total[i] = best[i] + weight[i]
+            for j in indices[indptr[i] : indptr[i + 1]]:
+                if total[i] > best[j]:
+                    best[j] = total[i]
+    return np.array(total, dtype=float)
+
+
+# number of set bits of every byte value
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1)
+
+
+class Reachability:
+    """
+    Descendant sets of all tasks of a graph, as rows of packed bits (see
+    ``descendant_bits``): ``n * n / 8`` bytes for ``n`` tasks, and a reachability
+    query is a single bit test.
+    """
+
+    def __init__(self, names: List[str], bits: np.ndarray):
+        self.names = names
+        self.bits = bits
+        self._index = {name: i for i, name in enumerate(names)}
+        self._names = np.array(names, dtype=object)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def has_path(self, source: str, target: str) -> bool:
+        """Whether ``target`` is downstream of ``source``."""
+        j = self._index[target]
+        return bool(self.bits[self._index[source], j >> 3] & _bit_masks(j))
+
+    def mask(self, *names: str) -> np.ndarray:
+        """Boolean array over ``names`` of the tasks downstream of any of ``names``."""
+        rows = self.bits[[self._index[name] for name in names]]
+        packed = np.bitwise_or.reduce(rows, axis=0)
+        return np.unpackbits(packed, count=len(self.names)).view(bool)
+
+    def descendants(self, *names: str) -> List[str]:
+        """Names of the tasks downstream of any of ``names``, in graph order."""
+        return self._names[self.mask(*names)].tolist()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of descendants of every task."""
+        counts = _POPCOUNT[self.bits].sum(axis=1) if self.bits.size else []
+        return dict(zip(self.names, np.asarray(counts).tolist()))
+
+
+# task name -> seconds, or recorded runs (see GraphAnalysis.task_durations)
+Weights = Union[Mapping[str, float], Iterable[Any]]
+
+
 class GraphAnalysis:
     """
     Utility to analyze a Graph, with caching to handle large graphs:
       - get_input_links / get_output_links
-      - get_direct_children / get_all_descendants
+      - get_direct_children / get_all_descendants / has_path / reachability
       - compare_graphs by task name
+      - levels / critical_path / max_parallelism / estimated_makespan
     """
 
     def __init__(self, graph: Graph):
@@ -58,14 +247,24 @@ class GraphAnalysis:
         # a task or link is added/removed, etc. If you don't have that,
         # you can implement your own triggers or approach.
         self._cached_version = -1
+        # positions in the change logs of graph.tasks / graph.links
+        self._tasks_position: Optional[int] = None
+        self._links_position: Optional[int] = None
         self._adjacency = None
         self._name_to_idx = {}
         self._tasks_list = []
         # Caches
         self._cache_input_links: Dict[str, List[str]] = {}
         self._cache_output_links: Dict[str, List[str]] = {}
-        self._cache_descendants: Dict[str, Set[str]] = {}
-        self._cache_zone: Dict[str, Dict[str, List[str]]] = {}
+        # descendants are computed on demand: task name -> names in graph order,
+        # and (once needed) the same names as a set for reachability queries
+        self._cache_descendants: Dict[str, List[str]] = {}
+        # task name -> increasing number in the order the tasks were added
+        self._cache_position: Dict[str, int] = {}
+        self._cache_reachable: Dict[str, Set[str]] = {}
+        self._cache_zone: Optional[Dict[str, Dict[str, List[str]]]] = None
+        self._cache_bits: Optional[Reachability] = None
+        self._cache_dag: Optional[Tuple[csr_matrix, List[str], np.ndarray]] = None
 
     def get_input_links(self, task: Task) -> List[TaskLink]:
         """
@@ -91,9 +290,139 @@ class GraphAnalysis:
         return [lk for lk in links]
 
     def get_all_descendants(self, task: Task) -> list[str]:
+        """
+        Names of all tasks downstream of ``task``. Computed on the first query and
+        kept up to date as links are added; removing a link only drops the affected
+        results.
+        """
+        self._ensure_cache_valid()
+        return self._descendants(task.name)
 
+    def has_path(self, source: Union[Task, str], target: Union[Task, str]) -> bool:
+        """Whether ``target`` is downstream of ``source``."""
         self._ensure_cache_valid()
-        return self._cache_descendants.get(task.name, [])
+        source, target = self._to_name(source), self._to_name(target)
+        bits = self._cache_bits
+        if bits is not None and source in bits and target in bits:
+            return bits.has_path(source, target)
+        if source not in self._cache_reachable:
+            self._cache_reachable[source] = set(self._descendants(source))
+        return target in self._cache_reachable[source]
+
+    def reachability(self) -> Reachability:
+        """
+        Descendants of every task at once, as packed bit sets. Suited to many
+        queries on a large graph between edits; raises ``ValueError`` if the graph
+        has a cycle.
+        """
+        self._ensure_cache_valid()
+        if self._cache_bits is None:
+            self._build_adjacency()
+            names = [task.name for task in self._tasks_list]
+            bits = descendant_bits(self._adjacency.tocsr())
+            self._cache_bits = Reachability(names, bits)
+        return self._cache_bits
+
+    def levels(self) -> Dict[str, int]:
+        """
+        Topological depth of every task: 0 for tasks without upstream tasks, else one
+        more than the deepest upstream task. Built-in tasks are left out.
+        """
+        _, names, levels = self._dag()
+        return dict(zip(names, levels.tolist()))
+
+    def max_parallelism(self) -> int:
+        """Largest number of tasks sharing a level, i.e. that may run at the same time."""
+        _, _, levels = self._dag()
+        return int(np.bincount(levels).max()) if levels.size else 0
+
+    def critical_path(
+        self, weights: Optional[Weights] = None, default: float = 0.0
+    ) -> Tuple[List[str], float]:
+        """
+        The chain of dependent tasks with the largest total weight, and that weight.
+
+        ``weights`` maps task names to durations, or is a list of recorded runs
+        (see :meth:`task_durations`); tasks without a weight count as ``default``.
+        Without weights every task counts 1, so the path is the longest chain.
+        """
+        adjacency, names, levels = self._dag()
+        if not names:
+            return [], 0.0
+        w = self._weight_vector(names, weights, default)
+        finish = longest_paths(adjacency, levels, w)
+        # walk back from the last task to finish through the latest upstream task
+        upstream = adjacency.tocsc()
+        indptr, indices = upstream.indptr.tolist(), upstream.indices.tolist()
+        done = finish.tolist()
+        node = int(np.argmax(finish))
+        path = [node]
+        while indptr[node] < indptr[node + 1]:
+            node = max(indices[indptr[node] : indptr[node + 1]], key=done.__getitem__)
+            path.append(node)
+        return [names[i] for i in reversed(path)], float(finish.max())
+
+    def estimated_makespan(
+        self,
+        workers: Optional[int] = None,
+        weights: Optional[Weights] = None,
+        default: float = 0.0,
+    ) -> float:
+        """
+        Estimated wall time of a run on ``workers`` parallel workers.
+
+        Simulates list scheduling: whenever a worker is free it starts the ready task
+        with the longest remaining path. With ``workers=None`` (unlimited workers) this
+        is the length of the critical path. ``weights`` as for :meth:`critical_path`.
+        """
+        if workers is None:
+            return self.critical_path(weights, default)[1]
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        adjacency, names, levels = self._dag()
+        w = self._weight_vector(names, weights, default)
+        # longest path from each task to the end, including the task itself
+        remaining = longest_paths(adjacency, levels, w, downstream=True)
+
+        indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+        indegree = np.bincount(adjacency.indices, minlength=len(names)).tolist()
+        weight, priority = w.tolist(), (-remaining).tolist()
+        ready = [(priority[i], i) for i, d in enumerate(indegree) if d == 0]
+        heapq.heapify(ready)
+        running: List[Tuple[float, int]] = []
+        now = 0.0
+        while ready or running:
+            while ready and len(running) < workers:
+                _, i = heapq.heappop(ready)
+                heapq.heappush(running, (now + weight[i], i))
+            now, i = heapq.heappop(running)
+            for j in indices[indptr[i] : indptr[i + 1]]:
+                indegree[j] -= 1
+                if not indegree[j]:
+                    heapq.heappush(ready, (priority[j], j))
+        return now
+
+    @staticmethod
+    def task_durations(records: Iterable[Any]) -> Dict[str, float]:
+        """
+        Mean duration in seconds per task name of finished runs. ``records`` are
+        provenance ``ProcessNode`` records (e.g. ``recorder.process_nodes.values()``) or
+        the ``TaskMetrics`` of an engine ``Instrumentation``.
+        """
+        totals: Dict[str, List[float]] = {}
+        for record in records:
+            if getattr(record, "state", None) != "FINISHED":
+                continue
+            if hasattr(record, "duration"):
+                name, seconds = record.task, record.duration
+            elif record.start_time is not None and record.end_time is not None:
+                name, seconds = record.name, record.end_time - record.start_time
+            else:
+                continue
+            total = totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+        return {name: seconds / count for name, (seconds, count) in totals.items()}
 
     @staticmethod
     def compare_graphs(g1: Graph, g2: Graph) -> Dict[str, Any]:
@@ -141,10 +470,10 @@ class GraphAnalysis:
     def build_connectivity(self):
         self._ensure_cache_valid()
         connectivity = {
-            "child_node": self._cache_descendants,
+            "child_node": self._all_descendants(),
             "input_node": self._cache_input_links,
             "output_node": self._cache_output_links,
-            "zone": self._cache_zone,
+            "zone": self._zones(),
         }
         return connectivity
 
@@ -165,7 +494,7 @@ class GraphAnalysis:
         the zone.
         """
         self._ensure_cache_valid()
-        return self._cache_zone
+        return self._zones()
 
     @staticmethod
     def _task_changed(g1: Graph, n1: Task, g2: Graph, n2: Task) -> bool:
@@ -184,16 +513,16 @@ class GraphAnalysis:
     def _input_links_changed(g1: Graph, n1: Task, g2: Graph, n2: Task) -> bool:
         """Compare input links (all links where .to_task == n1 vs. .to_task == n2)."""
         # We'll gather a set of (.from_task_name, from_socket_name) for each
-        in_links_1 = set()
-        for lk in g1.links:
-            if lk.to_task == n1:
-                in_links_1.add((lk.from_task.name, lk.from_socket._name))
-
-        in_links_2 = set()
-        for lk in g2.links:
-            if lk.to_task == n2:
-                in_links_2.add((lk.from_task.name, lk.from_socket._name))
-
+        in_links_1 = {
+            (lk.from_task.name, lk.from_socket._name)
+            for lk in g1.links._get_input_links(n1.name)
+            if lk.to_task == n1
+        }
+        in_links_2 = {
+            (lk.from_task.name, lk.from_socket._name)
+            for lk in g2.links._get_input_links(n2.name)
+            if lk.to_task == n2
+        }
         return in_links_1 != in_links_2
 
     @staticmethod
@@ -213,6 +542,9 @@ class GraphAnalysis:
         for name in in1:
             if isinstance(n1.inputs[name], TaskSocketNamespace):
                 continue
+            # linked values are produced upstream; the links are compared separately
+            if n1.inputs[name]._links and n2.inputs[name]._links:
+                continue
             v1 = n1.inputs[name].value
             v2 = n2.inputs[name].value
             if GraphAnalysis._values_different(v1, v2):
@@ -226,6 +558,12 @@ class GraphAnalysis:
         for other special cases. If you don't use NumPy, or if your array
         type is different, adjust accordingly.
         """
+        # Compare the wrapped values of tagged outputs from a previous run
+        if isinstance(v1, TaggedValue):
+            v1 = v1.__wrapped__
+        if isinstance(v2, TaggedValue):
+            v2 = v2.__wrapped__
+
         # Case 1: Different types => different
         if type(v1) != type(v2):
             return True
@@ -243,61 +581,223 @@ class GraphAnalysis:
         # Fallback to normal "!=" comparison
         return v1 != v2
 
+    def _dag(self) -> Tuple[csr_matrix, List[str], np.ndarray]:
+        """Adjacency, names and levels of the non-built-in tasks."""
+        self._ensure_cache_valid()
+        if self._cache_dag is None:
+            self._build_adjacency()
+            keep = [
+                i
+                for i, task in enumerate(self._tasks_list)
+                if task.name not in BUILTIN_TASKS
+            ]
+            adjacency = self._adjacency.tocsr()[keep][:, keep].tocsr()
+            names = [self._tasks_list[i].name for i in keep]
+            self._cache_dag = (adjacency, names, topological_levels(adjacency))
+        return self._cache_dag
+
+    @staticmethod
+    def _weight_vector(
+        names: List[str], weights: Optional[Weights], default: float
+    ) -> np.ndarray:
+        if weights is None:
+            return np.ones(len(names))
+        if not isinstance(weights, Mapping):
+            weights = GraphAnalysis.task_durations(weights)
+        return np.array([weights.get(name, default) for name in names], dtype=float)
+
     def _ensure_cache_valid(self):
         """
-        If the graph version changed, rebuild the adjacency-based caches:
-          - input_links[task.name]
-          - output_links[task.name]
-          - all_descendants[task.name]
+        Bring the caches up to date if the graph version changed. Tasks and links
+        added or removed since the last call are replayed from the change logs of
+        the collections; everything is rebuilt only on the first call, or when the
+        logs do not reach back far enough.
         """
         current_version = getattr(self.graph, "_version", 0)
-        if current_version != self._cached_version:
+        if current_version == self._cached_version:
+            return
+        task_changes, self._tasks_position = self.graph.tasks._changes_since(
+            self._tasks_position
+        )
+        link_changes, self._links_position = self.graph.links._changes_since(
+            self._links_position
+        )
+        if task_changes is None or link_changes is None:
             self._rebuild_cache()
-            self._cached_version = current_version
+        else:
+            self._apply_changes(task_changes, link_changes)
+        # cheap to rebuild and not worth updating: computed again when asked for
+        self._cache_zone = None
+        self._cache_bits = None
+        self._cache_dag = None
+        self._cached_version = current_version
 
     def _rebuild_cache(self):
         """
-        Rebuild adjacency caches for all nodes:
-          self._cache_input_links[name] = [links leading into name]
-          self._cache_output_links[name] = [links from name]
-          self._cache_descendants[name] = set of all downstream task names
+        Rebuild the link caches for all nodes and forget the descendants:
+          self._cache_input_links[name] = [tasks linking into name]
+          self._cache_output_links[name] = [tasks linked from name]
         """
         self._cache_input_links.clear()
         self._cache_output_links.clear()
         self._cache_descendants.clear()
+        self._cache_reachable.clear()
+        self._cache_position.clear()
 
         # Initialize empty lists for each task name
         for task in self.graph.tasks:
             self._cache_input_links[task.name] = []
             self._cache_output_links[task.name] = []
+            self._cache_position[task.name] = len(self._cache_position)
 
         # Populate input/output links
         for link in self.graph.links:
-            from_name = link.from_task.name
-            to_name = link.to_task.name
-            # in case the task does not belong to the graph
-            if from_name not in self.graph.tasks or to_name not in self.graph.tasks:
+            self._link_added(link.from_task.name, link.to_task.name)
+
+    def _link_added(self, from_name: str, to_name: str) -> bool:
+        # in case the task does not belong to the graph
+        if (
+            from_name not in self._cache_output_links
+            or to_name not in self._cache_input_links
+        ):
+            return False
+        self._cache_output_links[from_name].append(to_name)
+        self._cache_input_links[to_name].append(from_name)
+        return True
+
+    def _link_removed(self, from_name: str, to_name: str) -> None:
+        for links, name in (
+            (self._cache_output_links.get(from_name), to_name),
+            (self._cache_input_links.get(to_name), from_name),
+        ):
+            if links is not None and name in links:
+                links.remove(name)
+
+    def _apply_changes(
+        self,
+        task_changes: List[Tuple[bool, str, Task]],
+        link_changes: List[Tuple[bool, str, TaskLink]],
+    ) -> None:
+        """
+        Replay added and removed tasks and links on the caches. Tasks go first, so
+        the links of a task that was deleted and added again end up on the new one.
+
+        Descendants computed before are only affected for the upstream tasks of the
+        changed links. After insertions alone they are extended by a search that
+        starts from the new links; otherwise they are dropped and computed again
+        when asked for.
+        """
+        removed = False
+        for added, name, _ in task_changes:
+            if added:
+                self._cache_input_links.setdefault(name, [])
+                self._cache_output_links.setdefault(name, [])
+                # a task added again moves to the end, as in ``graph.tasks``
+                self._cache_position.pop(name, None)
+                self._cache_position[name] = self._next_position()
+            else:
+                removed = True
+                self._cache_input_links.pop(name, None)
+                self._cache_output_links.pop(name, None)
+                self._cache_position.pop(name, None)
+                self._cache_descendants.pop(name, None)
+                self._cache_reachable.pop(name, None)
+        inserted: List[Tuple[str, str]] = []
+        for added, _, link in link_changes:
+            edge = (link.from_task.name, link.to_task.name)
+            if not added:
+                removed = True
+                self._link_removed(*edge)
+            elif self._link_added(*edge):
+                inserted.append(edge)
+        if not self._cache_descendants or not (removed or inserted):
+            return
+
+        # tasks reaching a changed link, the link's source included
+        upstream = {link.from_task.name for _, _, link in link_changes}
+        stack = list(upstream)
+        while stack:
+            for parent in self._cache_input_links.get(stack.pop(), ()):
+                if parent not in upstream:
+                    upstream.add(parent)
+                    stack.append(parent)
+        affected = [name for name in self._cache_descendants if name in upstream]
+        for name in affected:
+            if removed:
+                del self._cache_descendants[name]
+                self._cache_reachable.pop(name, None)
+                continue
+            # continue the search of ``name`` through the inserted links
+            order = self._cache_descendants[name]
+            reachable = self._cache_reachable.get(name)
+            seen = set(order) if reachable is None else reachable
+            seen.add(name)
+            self._search(
+                [child for parent, child in inserted if parent in seen],
+                order,
+                seen,
+            )
+            seen.discard(name)
+            order.sort(key=self._cache_position.__getitem__)
+
+    def _descendants(self, name: str) -> List[str]:
+        if name not in self._cache_descendants:
+            if name not in self._cache_output_links:
+                return []
+            order: List[str] = []
+            seen = {name}
+            self._search(list(self._cache_output_links[name]), order, seen)
+            seen.discard(name)
+            order.sort(key=self._cache_position.__getitem__)
+            self._cache_descendants[name] = order
+            self._cache_reachable[name] = seen
+        return self._cache_descendants[name]
+
+    def _search(self, stack: List[str], order: List[str], seen: Set[str]) -> None:
+        """Depth-first search from ``stack``, appending newly found tasks to ``order``."""
+        children = self._cache_output_links
+        stack.reverse()
+        while stack:
+            name = stack.pop()
+            if name in seen:
                 continue
-            self._cache_output_links[from_name].append(to_name)
-            self._cache_input_links[to_name].append(from_name)
+            seen.add(name)
+            order.append(name)
+            stack.extend(reversed(children.get(name, ())))
+
+    def _next_position(self) -> int:
+        if not self._cache_position:
+            return 0
+        return self._cache_position[next(reversed(self._cache_position))] + 1
+
+    def _all_descendants(self) -> Dict[str, List[str]]:
+        """Descendants of every task; the missing ones from ``reachability``."""
+        missing = [
+            name
+            for name in self._cache_output_links
+            if name not in self._cache_descendants
+        ]
+        if missing:
+            try:
+                bits = self.reachability()
+            except ValueError:
+                # a cycle: one search per task
+                for name in missing:
+                    self._descendants(name)
+            else:
+                for name in missing:
+                    self._cache_descendants[name] = bits.descendants(name)
+        return self._cache_descendants
 
-        # For descendants, do a DFS/BFS from each task
+    def _build_adjacency(self) -> None:
         self._adjacency, self._name_to_idx, self._tasks_list = build_adjacency_matrix(
             self.graph
         )
-        for task in self.graph.tasks:
-            if task.name not in self._name_to_idx:
-                self._cache_descendants[task.name] = []
-
-            idx = self._name_to_idx[task.name]
-            order, _ = depth_first_order(self._adjacency, idx)
-            # Filter out the starting task
-            order = [x for x in order if x != idx]
-            self._cache_descendants[task.name] = [
-                self._tasks_list[x].name for x in order
-            ]
-        # Build zone cache
-        self._compute_zone_cache()
+
+    def _zones(self) -> Dict[str, Dict[str, List[str]]]:
+        if self._cache_zone is None:
+            self._compute_zone_cache()
+        return self._cache_zone
 
     def _compute_zone_cache(self):
         """
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Union, Optional, Callable, Dict
+from typing import TYPE_CHECKING, List, Union, Optional, Callable, Dict, Tuple
 import difflib
 from importlib.metadata import entry_points, EntryPoint
 import sys
@@ -69,6 +69,20 @@ class Collection:
             parent (object, optional): object this collection belongs to.
         """
         self._items: Dict[str, object] = {}
+        # Positional index of ``_items``: the keys in insertion order, with ``None``
+        # holes left by deletions. Holes are compacted lazily, on the first positional
+        # access at or behind the first hole, so deleting from the back and reading
+        # positions in front of the holes stays O(1).
+        self._keys: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._first_hole: Optional[int] = None
+        self._uuids: Dict[str, str] = {}
+        # the dict the index was built for; ``_items`` may be replaced wholesale
+        self._indexed: Optional[Dict[str, object]] = self._items
+        # ``(added, key, item)`` log for readers that follow the collection (see
+        # ``_changes_since``); only kept once a reader has asked for it
+        self._changes: Optional[List[Tuple[bool, str, object]]] = None
+        self._changes_start = 0
         self.parent = parent
         self.graph = graph
         # one can specify the pool or entry_point to get the pool
@@ -86,8 +100,7 @@ class Collection:
 
     def __getitem__(self, index: Union[int, str]) -> object:
         if isinstance(index, int):
-            # If indexing by int, convert dict keys to a list and index it
-            return self._items[list(self._items.keys())[index]]
+            return self._items[self._key_at(index)]
         elif isinstance(index, str):
             return self._items[index]
 
@@ -148,7 +161,7 @@ Acceptable names are {self._get_keys()}. This collection belongs to {self.parent
         """Append item into this collection."""
         if item.name in self._items:
             raise Exception(f"{item.name} already exists, please choose another name.")
-        self._items[item.name] = item
+        self._add_item(item.name, item)
 
     def _extend(self, items: List[object]) -> None:
         new_names = set([item.name for item in items])
@@ -185,10 +198,13 @@ Acceptable names are {self._get_keys()}. This collection belongs to {self._paren
         Returns:
             object: _description_
         """
-        for item in self._items.values():
-            if item.uuid == uuid:
-                return item
-        return None
+        self._check_index()
+        item = self._items.get(self._uuids.get(uuid))
+        if item is not None and getattr(item, "uuid", None) == uuid:
+            return item
+        # missing or stale: the uuid of an item was reassigned after it was added
+        self._index_uuids()
+        return self._items.get(self._uuids.get(uuid))
 
     def _get_keys(self) -> List[str]:
         return list(self._items.keys())
@@ -198,27 +214,126 @@ Acceptable names are {self._get_keys()}. This collection belongs to {self._paren
         self._items = {}
 
     def __delitem__(self, index: Union[int, List[int], str]) -> None:
-        # If index is int, convert _items to a list and remove by index
+        for key in self._keys_to_delete(index):
+            self._remove_item(key)
+
+    def _keys_to_delete(self, index: Union[int, List[int], str]) -> List[str]:
+        """Keys of the items ``__delitem__`` removes, last position first."""
         if isinstance(index, str):
-            self._items.pop(index)
+            if index not in self._items:
+                raise KeyError(index)
+            return [index]
         elif isinstance(index, int):
-            key = list(self._items.keys())[index]
-            self._items.pop(key)
+            return [self._key_at(index)]
         elif isinstance(index, list):
-            keys = list(self._items.keys())
-            for i in sorted(index, reverse=True):
-                key = keys[i]
-                self._items.pop(key)
-        else:
-            raise ValueError(
-                f"Invalid index type for __delitem__: {index}, expected int or str, or list of int."
-            )
+            # resolve all positions before anything is removed
+            return [self._key_at(i) for i in sorted(index, reverse=True)]
+        raise ValueError(
+            f"Invalid index type for __delitem__: {index}, expected int or str, or list of int."
+        )
 
     def _pop(self, index: Union[int, str]) -> object:
         if isinstance(index, int):
-            key = list(self._items.keys())[index]
-            return self._items.pop(key)
-        return self._items.pop(index)
+            return self._remove_item(self._key_at(index))
+        return self._remove_item(index)
+
+    def _add_item(self, key: str, item: object) -> None:
+        self._check_index()
+        self._items[key] = item
+        self._positions[key] = len(self._keys)
+        self._keys.append(key)
+        uuid = getattr(item, "uuid", None)
+        if uuid is not None:
+            self._uuids[uuid] = key
+        if self._changes is not None:
+            self._log_change(True, key, item)
+
+    def _remove_item(self, key: str) -> object:
+        self._check_index()
+        item = self._items.pop(key)
+        position = self._positions.pop(key)
+        uuid = getattr(item, "uuid", None)
+        if self._uuids.get(uuid) == key:
+            del self._uuids[uuid]
+        if position == len(self._keys) - 1:
+            self._keys.pop()
+            while self._keys and self._keys[-1] is None:
+                self._keys.pop()
+            if self._first_hole is not None and self._first_hole >= len(self._keys):
+                self._first_hole = None
+        else:
+            self._keys[position] = None
+            if self._first_hole is None or position < self._first_hole:
+                self._first_hole = position
+        if self._changes is not None:
+            self._log_change(False, key, item)
+        return item
+
+    def _log_change(self, added: bool, key: str, item: object) -> None:
+        self._changes.append((added, key, item))
+        # keep the log bounded; readers that fall behind start over instead
+        if len(self._changes) > 2 * len(self._items) + 64:
+            drop = len(self._changes) // 2
+            del self._changes[:drop]
+            self._changes_start += drop
+
+    def _changes_since(
+        self, position: Optional[int]
+    ) -> Tuple[Optional[List[Tuple[bool, str, object]]], int]:
+        """
+        The ``(added, key, item)`` changes after ``position``, oldest first, and the
+        position to pass next time. The changes are None when they are not known: on
+        the first call, after ``_items`` was replaced, or when the log was trimmed.
+        """
+        self._check_index()
+        if self._changes is None:
+            self._changes = []
+        end = self._changes_start + len(self._changes)
+        if position is None or position < self._changes_start:
+            return None, end
+        return self._changes[position - self._changes_start :], end
+
+    def _key_at(self, index: int) -> str:
+        """Key of the item at position ``index`` (negative counts from the end)."""
+        self._check_index()
+        size = len(self._items)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        if self._first_hole is not None and index >= self._first_hole:
+            self._compact()
+        return self._keys[index]
+
+    def _compact(self) -> None:
+        start = self._first_hole
+        keys = [key for key in self._keys[start:] if key is not None]
+        self._keys[start:] = keys
+        for position, key in enumerate(keys, start):
+            self._positions[key] = position
+        self._first_hole = None
+
+    def _check_index(self) -> None:
+        if self._indexed is not self._items:
+            self._reindex()
+
+    def _reindex(self) -> None:
+        self._keys = list(self._items)
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+        self._first_hole = None
+        self._index_uuids()
+        self._indexed = self._items
+        if self._changes is not None:
+            # nothing before the replacement can be replayed
+            self._changes_start += len(self._changes) + 1
+            self._changes = []
+
+    def _index_uuids(self) -> None:
+        self._uuids = {}
+        for key, item in self._items.items():
+            uuid = getattr(item, "uuid", None)
+            if uuid is not None:
+                self._uuids[uuid] = key
 
     def __len__(self) -> int:
         return len(self._items)
@@ -302,7 +417,7 @@ def decorator_check_identifier_name(func: Callable) -> Callable:
             name = kwargs.get("name")
         if name is not None:
             valid_name_string(name)
-            if name in args[0]._get_keys():
+            if name in args[0]:
                 raise ValueError(f"{name} already exists, please choose another name.")
         item = func(*args, **kwargs)
         return item
@@ -375,6 +490,8 @@ class TaskCollection(Collection):
         if item.graph is not None and item.graph is not self.graph:
             raise Exception(f"This item is already part of a graph: {item.graph}")
         item.graph = self.graph
+        if hasattr(self.graph, "_version"):
+            self.graph._version += 1
 
     def _copy(self, graph: Optional[object] = None) -> object:
         coll = self.__class__(graph=graph)
@@ -422,10 +539,64 @@ class PropertyCollection(Collection):
 
 
 class LinkCollection(Collection):
-    """Link colleciton"""
+    """Link colleciton
+
+    Links are also indexed by the names of the tasks they connect, so the links of
+    one task are found in O(degree) instead of scanning all links.
+    """
 
     def __init__(self, graph: object) -> None:
         super().__init__(graph=graph, parent=graph)
+        # task name -> {link key: link}
+        self._incoming: Dict[str, Dict[str, object]] = {}
+        self._outgoing: Dict[str, Dict[str, object]] = {}
+
+    def _get_input_links(self, task_name: str) -> List[object]:
+        """Links into the task ``task_name``, in the order they were added."""
+        self._check_index()
+        return list(self._incoming.get(task_name, {}).values())
+
+    def _get_output_links(self, task_name: str) -> List[object]:
+        """Links out of the task ``task_name``, in the order they were added."""
+        self._check_index()
+        return list(self._outgoing.get(task_name, {}).values())
+
+    def _delete_task_links(self, task_name: str) -> None:
+        """Remove all links into and out of the task ``task_name``."""
+        self._check_index()
+        keys = dict.fromkeys(self._incoming.get(task_name, {}))
+        keys.update(dict.fromkeys(self._outgoing.get(task_name, {})))
+        for key in keys:
+            self._items[key].unmount()
+            self._remove_item(key)
+        if keys:
+            self._bump_graph_version()
+
+    def _add_item(self, key: str, item: object) -> None:
+        super()._add_item(key, item)
+        self._incoming.setdefault(item.to_task.name, {})[key] = item
+        self._outgoing.setdefault(item.from_task.name, {})[key] = item
+
+    def _remove_item(self, key: str) -> object:
+        item = super()._remove_item(key)
+        for index, task_name in (
+            (self._incoming, item.to_task.name),
+            (self._outgoing, item.from_task.name),
+        ):
+            links = index.get(task_name)
+            if links is not None:
+                links.pop(key, None)
+                if not links:
+                    del index[task_name]
+        return item
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        self._incoming = {}
+        self._outgoing = {}
+        for key, item in self._items.items():
+            self._incoming.setdefault(item.to_task.name, {})[key] = item
+            self._outgoing.setdefault(item.from_task.name, {})[key] = item
 
     def _new(self, input: object, output: object, type: int = 1) -> object:
         from node_graph.link import TaskLink
@@ -437,24 +608,10 @@ class LinkCollection(Collection):
         return item
 
     def __delitem__(self, index: Union[int, List[int], str]) -> None:
-        # If index is int, convert _items to a list and remove by index
-        if isinstance(index, str):
-            self._items[index].unmount()
-            self._items.pop(index)
-        elif isinstance(index, int):
-            key = list(self._items.keys())[index]
+        for key in self._keys_to_delete(index):
             self._items[key].unmount()
-            self._items.pop(key)
-        elif isinstance(index, list):
-            keys = list(self._items.keys())
-            for i in sorted(index, reverse=True):
-                key = keys[i]
-                self._items[key].unmount()
-                self._items.pop(key)
-        else:
-            raise ValueError(
-                f"Invalid index type for __delitem__: {index}, expected int or str, or list of int."
-            )
+            self._remove_item(key)
+        self._bump_graph_version()
 
     def clear(self) -> None:
         """Remove all links from this collection.
@@ -463,6 +620,11 @@ class LinkCollection(Collection):
         for item in self._items.values():
             item.unmount()
         self._items = {}
+        self._bump_graph_version()
+
+    def _bump_graph_version(self) -> None:
+        if hasattr(self.graph, "_version"):
+            self.graph._version += 1
 
     def __repr__(self) -> str:
         s = ""
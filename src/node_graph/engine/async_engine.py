@@ -0,0 +1,324 @@
+from __future__ import annotations
+import asyncio
+import inspect
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from node_graph import Graph
+from .base import GraphRun
+from .cache import TaskCache
+from .checkpoint import CheckpointStore
+from .instrumentation import Instrumentation
+from .provenance import ProvenanceRecorder
+from .retry import RetryPolicy, TaskAttempts
+from .spill import SpillStore
+from .local import LocalEngine
+from .mapping import _gather_map_results, _is_map_task, _map_plan
+
+from .plan import execution_plan
+from .utils import (
+    _has_zones,
+)
+
+
+class AsyncEngine(LocalEngine):
+    """
+    Native asyncio runner: ``results = await AsyncEngine().run(ng)``.
+
+    - Every task whose upstream tasks have finished is scheduled as an asyncio task.
+    - ``async def`` callables are awaited on the event loop; sync callables are
+      offloaded to the loop's default executor so they do not block it.
+    - ``max_concurrency`` bounds the number of tasks of one graph that run at the
+      same time (``None`` means unbounded).
+    - ``@task.graph`` subgraphs are awaited with a nested AsyncEngine.
+    - Graphs with Zone/If/While tasks run on ``LocalEngine``'s sequential zone
+      scheduler in the loop's default executor; coroutines are still awaited on
+      the loop.
+    """
+
+    engine_kind = "async"
+    _stream_in_background = True
+
+    def __init__(
+        self,
+        name: str = "async-flow",
+        recorder: Optional[ProvenanceRecorder] = None,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[TaskCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        tagging: str = "proxy",
+        release_values: bool = False,
+        keep_values: Optional[Iterable[str]] = None,
+        spill: Optional[SpillStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        super().__init__(
+            name,
+            recorder,
+            cache=cache,
+            retry_policy=retry_policy,
+            checkpoint=checkpoint,
+            tagging=tagging,
+            release_values=release_values,
+            keep_values=keep_values,
+            spill=spill,
+            instrumentation=instrumentation,
+        )
+        self.max_concurrency = max_concurrency
+        # loop of the running graph, for sync code on executor threads to await on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Execute ``ng`` and return the graph outputs as plain values."""
+        outputs, _values = await self._run_graph(ng, parent_pid)
+        return outputs
+
+    async def rerun(
+        self, ng: Graph, previous_run: Optional[GraphRun] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``LocalEngine.rerun``."""
+        previous_run = previous_run or self.last_run
+        snapshot = ng.copy(name=ng.name)
+        reuse = previous_run.reusable_values(ng) if previous_run is not None else {}
+        outputs, values = await self._run_graph(ng, None, reuse=reuse)
+        self.last_run = GraphRun(graph=snapshot, values=values)
+        return outputs
+
+    async def resume(
+        self, ng: Graph, checkpoint: Optional[CheckpointStore] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``LocalEngine.resume``."""
+        reuse = self._restore_checkpoint(ng, checkpoint)
+        outputs, _values = await self._run_graph(ng, None, reuse=reuse)
+        return outputs
+
+    async def _run_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+        reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        reuse = reuse or {}
+        loop = asyncio.get_running_loop()
+        previous_loop, self._loop = self._loop, loop
+        try:
+            if _has_zones(ng):
+                # LocalEngine's zone scheduler, without blocking the event loop
+                return await loop.run_in_executor(
+                    None, lambda: self._run_zoned_graph(ng, parent_pid, reuse)
+                )
+            return await self._run_planned_graph(ng, parent_pid, reuse)
+        finally:
+            self._loop = previous_loop
+
+    async def _run_planned_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str],
+        reuse: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        plan = execution_plan(ng)
+        self._stream_tasks = self._streamed_tasks(ng, plan.streaming)
+
+        values: Dict[str, Dict[str, Any]] = self._snapshot_builtins(ng)
+
+        graph_pid = self._start_graph_run(ng, parent_pid)
+        limit = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency is not None
+            else None
+        )
+
+        pending = [len(plan.upstream[tid]) for tid in plan.order]
+        ready: Deque[int] = deque(tid for tid in plan.order if pending[tid] == 0)
+        running: Dict[asyncio.Task, int] = {}
+
+        release = self._value_release(ng, plan)
+
+        def _complete(tid: int) -> None:
+            if release is not None:
+                release.done(tid, values)
+            for child in plan.downstream[tid]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+
+        try:
+            while ready or running:
+                while ready:
+                    tid = ready.popleft()
+                    if plan.builtin[tid]:
+                        _complete(tid)
+                        continue
+                    name = plan.names[tid]
+                    if name in reuse:
+                        values[name] = reuse[name]
+                        _complete(tid)
+                        continue
+                    task = ng.tasks[name]
+                    kw = self._resolve_planned_inputs(task, plan, tid, values)
+                    coro = self._run_task_limited(limit, task, graph_pid, kw)
+                    running[asyncio.ensure_future(coro)] = tid
+
+                if not running:
+                    break
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in finished:
+                    tid = running.pop(future)
+                    name = plan.names[tid]
+                    values[name] = future.result()
+                    self._checkpoint_task(name, values[name])
+                    _complete(tid)
+
+            graph_outputs = self._plan_link_kwargs(
+                plan, plan.ids.get("graph_outputs"), values
+            )
+            return self._finalize_graph_success(ng, graph_pid, graph_outputs), values
+        except BaseException as e:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self._record_graph_failure(graph_pid, e)
+            raise
+        finally:
+            self._flush_checkpoint()
+            self._close_streams()
+
+    def _await_on_loop(self, coro) -> Any:
+        """Wait, from an executor thread, for ``coro`` on the loop of the graph."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _invoke_callable(self, task, fn, kwargs: Dict[str, Any]) -> Any:
+        res = fn(**kwargs)
+        if inspect.iscoroutine(res):
+            res = self._await_on_loop(res)
+        return res
+
+    def _run_map(self, task, fn, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if inspect.iscoroutinefunction(fn):
+            return self._await_on_loop(self._run_map_async(fn, kwargs))
+        return super()._run_map(task, fn, kwargs)
+
+    async def _run_task_limited(
+        self,
+        limit: Optional[asyncio.Semaphore],
+        task,
+        parent_pid: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        if limit is None:
+            return await self._run_task_async(task, parent_pid, kwargs)
+        async with limit:
+            return await self._run_task_async(task, parent_pid, kwargs)
+
+    async def _run_task_async(
+        self, task, parent_pid: Optional[str], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if self._is_graph_task(task):
+            with self._task_metrics(task):
+                return await self._run_graph_task_async(task, parent_pid, kwargs)
+
+        fn = self._unwrap_callable(task)
+        if fn is None or not inspect.iscoroutinefunction(fn):
+            # the sync executor records provenance itself; the recorder is thread-safe
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self._run_task(task, parent_pid, kwargs)
+            )
+
+        with self._task_metrics(task):
+            return await self._run_coroutine_task(task, fn, parent_pid, kwargs)
+
+    async def _run_coroutine_task(
+        self, task, fn, parent_pid: Optional[str], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        attempts = TaskAttempts(task, self.retry_policy)
+        while True:
+            run_kwargs = dict(kwargs)
+            pid = self._start_task_process(task, fn, parent_pid, run_kwargs)
+            if attempts.meta:
+                self.recorder.set_process_meta(pid, **attempts.meta)
+            try:
+                raw_kwargs = self._raw_kwargs(run_kwargs)
+                key, hit, res = self._cache_lookup(task, pid, raw_kwargs)
+                if not hit:
+                    with self._phase("call"):
+                        if _is_map_task(task):
+                            res = await self._run_map_async(fn, raw_kwargs)
+                        else:
+                            res = await fn(**raw_kwargs)
+                    self._cache_store(key, res)
+                return self._finish_task_process(task, pid, res, label_kind="create")
+            except BaseException as exc:
+                self._fail_task_process(pid, exc)
+                retry = attempts.on_failure(exc)
+                if retry is None:
+                    raise
+            delay, overrides = retry
+            kwargs = self._apply_input_overrides(task, kwargs, overrides)
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _run_map_async(self, fn, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Await ``fn`` for every source item concurrently (up to ``max_concurrency``)."""
+        item_input, chunks, fixed = _map_plan(fn, kwargs, lambda n: max(n, 1))
+        limit = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency is not None
+            else None
+        )
+
+        async def _call(key: str, item: Any):
+            if limit is None:
+                return key, await fn(**{item_input: item}, **fixed)
+            async with limit:
+                return key, await fn(**{item_input: item}, **fixed)
+
+        pairs = await asyncio.gather(
+            *(_call(key, item) for chunk in chunks for key, item in chunk)
+        )
+        return _gather_map_results([pairs])
+
+    async def _run_graph_task_async(
+        self, task, parent_pid: Optional[str], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        graph_fn = self._extract_executor_callable(task)
+        if graph_fn is None:
+            res: Dict[str, Any] = {}
+        else:
+            sub_ng = self._build_subgraph(task, graph_fn, dict(kwargs))
+            with self._phase("call"):
+                await self._subgraph_engine(task).run(sub_ng, parent_pid=parent_pid)
+            res = sub_ng.outputs._collect_values(unwrap=False)
+        return self._finish_task_process(task, None, res, label_kind="return")
+
+    def _subgraph_engine(self, task) -> "AsyncEngine":
+        return self.__class__(
+            name=f"{self.name}::{task.name}",
+            recorder=self.recorder,
+            max_concurrency=self.max_concurrency,
+            cache=self.cache,
+            retry_policy=self.retry_policy,
+            tagging=self.tagging,
+            release_values=self.release_values,
+            spill=self.spill,
+            instrumentation=self.instrumentation,
+        )
+
+    def _run_subgraph(self, task, sub_ng: Graph, parent_pid: Optional[str]) -> None:
+        if self._loop is None:
+            raise RuntimeError(
+                "AsyncEngine runs subgraphs asynchronously; use `await engine.run(...)`."
+            )
+        # a subgraph inside a zone: the zone scheduler thread waits for it
+        self._await_on_loop(
+            self._subgraph_engine(task).run(sub_ng, parent_pid=parent_pid)
+        )
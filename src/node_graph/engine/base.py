@@ -1,32 +1,139 @@
 from __future__ import annotations
 
+import inspect
+import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from node_graph import Graph
+from node_graph.analysis import GraphAnalysis
+from node_graph.graph import BUILTIN_TASKS
+from node_graph.socket import TaggedValue
 from node_graph.utils import clean_socket_reference, tag_socket_value
 
+from .cache import TaskCache, task_cache_key
+from .checkpoint import CheckpointStore
+from .instrumentation import Instrumentation
+from .plan import ValueRelease
 from .provenance import ProvenanceRecorder
+from .retry import RetryPolicy
+from .spill import Spilled, SpillStore
+from .streaming import Stream
+from .tagging import TAGGING_MODES, namespace_paths
 from .utils import (
     _build_task_link_kwargs,
+    _clear_socket_value,
+    _collect_literals,
+    _is_zone_task,
     _resolve_tagged_value,
     get_nested_dict,
     parse_outputs,
 )
 
+logger = logging.getLogger(__name__)
+# stands in for an instrumentation phase when no instrumentation is configured
+_NO_PHASE = nullcontext()
+
+
+@dataclass
+class GraphRun:
+    """
+    Record of one graph execution, used for incremental re-runs.
+
+    ``graph`` is a snapshot of the graph as it was executed and ``values`` maps each
+    task name to the (tagged) outputs it produced.
+    """
+
+    graph: Graph
+    values: Dict[str, Dict[str, Any]]
+
+    def dirty_tasks(self, ng: Graph) -> set[str]:
+        """Names of tasks in ``ng`` that were added or modified since this run, plus their descendants."""
+        diff = GraphAnalysis.compare_graphs(self.graph, ng)
+        changed = set(diff["added_tasks"]) | set(diff["modified_tasks"])
+        if self._graph_inputs_changed(ng):
+            changed.add("graph_inputs")
+        dirty = set(changed)
+        if changed:
+            analysis = GraphAnalysis(ng)
+            for name in changed:
+                dirty.update(analysis.get_all_descendants(ng.tasks[name]))
+        return dirty
+
+    def _graph_inputs_changed(self, ng: Graph) -> bool:
+        """Graph inputs are the *outputs* of ``graph_inputs``, which ``compare_graphs`` skips."""
+        if "graph_inputs" not in ng.tasks or "graph_inputs" not in self.graph.tasks:
+            return False
+        old = self.graph.tasks["graph_inputs"].outputs._value
+        new = ng.tasks["graph_inputs"].outputs._value
+        return set(old) != set(new) or any(
+            GraphAnalysis._values_different(old[key], new[key]) for key in old
+        )
+
+    def reusable_values(self, ng: Graph) -> Dict[str, Dict[str, Any]]:
+        """Outputs of this run that are still valid for ``ng``."""
+        dirty = self.dirty_tasks(ng)
+        return {
+            name: outputs
+            for name, outputs in self.values.items()
+            if name not in BUILTIN_TASKS and name not in dirty and name in ng.tasks
+        }
+
 
 class BaseEngine(ABC):
     """Common helpers shared by engine implementations."""
 
     engine_kind = "engine"
+    # depth of the queue between a streaming generator task and its consumer
+    stream_maxsize = 64
+    # produce stream items on a background thread (engines with concurrent tasks)
+    _stream_in_background = False
 
     def __init__(
         self,
         name: str,
         recorder: Optional[ProvenanceRecorder] = None,
+        cache: Optional[TaskCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        tagging: str = "proxy",
+        release_values: bool = False,
+        keep_values: Optional[Iterable[str]] = None,
+        spill: Optional[SpillStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
+        if tagging not in TAGGING_MODES:
+            raise ValueError(
+                f"Unknown tagging mode {tagging!r}; expected one of {TAGGING_MODES}."
+            )
         self.name = name
         self.recorder = recorder or ProvenanceRecorder(name)
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.checkpoint = checkpoint
+        self.tagging = tagging
+        self.release_values = release_values
+        self.keep_values = tuple(keep_values or ())
+        self.spill = spill
+        self.instrumentation = instrumentation
+        self._input_spans: Dict[str, Tuple[float, float, int]] = {}
+        self._stream_tasks: Set[str] = set()
+        self._open_streams: List[Stream] = []
 
     @staticmethod
     def _is_graph_task(task) -> bool:
@@ -60,14 +167,52 @@ class BaseEngine(ABC):
 
         return _graph_runner
 
-    @staticmethod
-    def _snapshot_builtins(ng: Graph) -> Dict[str, Dict[str, Any]]:
+    def _snapshot_builtins(self, ng: Graph) -> Dict[str, Dict[str, Any]]:
+        unwrap = self.tagging == "light"
         return {
-            "graph_ctx": ng.ctx._collect_values(unwrap=False),
-            "graph_inputs": ng.inputs._collect_values(unwrap=False),
-            "graph_outputs": ng.outputs._collect_values(unwrap=False),
+            "graph_ctx": ng.ctx._collect_values(unwrap=unwrap),
+            "graph_inputs": ng.inputs._collect_values(unwrap=unwrap),
+            "graph_outputs": ng.outputs._collect_values(unwrap=unwrap),
         }
 
+    def _phase(self, name: str) -> ContextManager[None]:
+        """Time phase ``name`` of the current task (see ``Instrumentation``)."""
+        if self.instrumentation is None:
+            return _NO_PHASE
+        return self.instrumentation.phase(name)
+
+    def _input_resolution(self, task, start: float) -> None:
+        """Remember when resolving the inputs of ``task`` started and ended."""
+        if self.instrumentation is not None:
+            end = time.perf_counter()
+            self._input_spans[task.name] = (start, end, threading.get_ident())
+
+    def _task_metrics(self, task) -> ContextManager[Any]:
+        """Measure a run of ``task`` (see ``Instrumentation.task``)."""
+        if self.instrumentation is None:
+            return _NO_PHASE
+        inputs = self._input_spans.pop(task.name, None)
+        return self.instrumentation.task(task.name, self.name, inputs)
+
+    def _task_literals(self, task) -> Dict[str, Any]:
+        """Literal inputs of ``task``: tagged proxies, or plain values in light mode."""
+        if self.tagging == "light":
+            return task.inputs._collect_values(unwrap=True)
+        return _collect_literals(task)
+
+    def _payload_namespaces(self, namespace) -> Optional[FrozenSet[str]]:
+        """Flattening boundaries for recording plain (light mode) payloads."""
+        if self.tagging == "light":
+            return namespace_paths(namespace)
+        return None
+
+    def _raw_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """The values a task callable receives."""
+        if self.tagging == "light":
+            return kwargs
+        with self._phase("tagging"):
+            return _resolve_tagged_value(kwargs)
+
     def _graph_flow_run_id(self, ng: Graph) -> str:
         return f"{self.engine_kind}:{self.name}"
 
@@ -88,7 +233,9 @@ class BaseEngine(ABC):
             parent_pid=parent_pid,
         )
         self.recorder.record_inputs_payload(
-            graph_pid, ng.inputs._collect_values(unwrap=False)
+            graph_pid,
+            ng.inputs._collect_values(unwrap=False),
+            namespaces=self._payload_namespaces(ng.inputs),
         )
         return graph_pid
 
@@ -98,6 +245,16 @@ class BaseEngine(ABC):
         graph_pid: str,
         graph_outputs: Dict[str, Any],
     ) -> Dict[str, Any]:
+        if self.tagging == "light":
+            ng.outputs._set_socket_value(graph_outputs)
+            self.recorder.record_outputs_payload(
+                graph_pid,
+                graph_outputs,
+                label_kind="return",
+                namespaces=namespace_paths(ng.outputs),
+            )
+            self.recorder.process_end(graph_pid, state="FINISHED")
+            return graph_outputs
         cleaned = clean_socket_reference(graph_outputs)
         ng.outputs._set_socket_value(cleaned)
         self.recorder.record_outputs_payload(
@@ -118,19 +275,142 @@ class BaseEngine(ABC):
         *,
         strict: bool = True,
     ) -> Dict[str, Any]:
-        if strict:
-            parsed = parse_outputs(result, task.spec.outputs)
-            task.outputs._set_socket_value(parsed)
-        else:
-            try:
+        with self._phase("outputs"):
+            if strict:
                 parsed = parse_outputs(result, task.spec.outputs)
                 task.outputs._set_socket_value(parsed)
-            except Exception as e:
-                raise RuntimeError(
-                    f"Failed to parse outputs for task '{task.name}': {e}"
-                ) from e
-        tag_socket_value(task.outputs, only_uuid=True)
-        return task.outputs._collect_values(unwrap=False)
+            else:
+                try:
+                    parsed = parse_outputs(result, task.spec.outputs)
+                    task.outputs._set_socket_value(parsed)
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Failed to parse outputs for task '{task.name}': {e}"
+                    ) from e
+        with self._phase("tagging"):
+            if self.tagging == "light":
+                return task.outputs._collect_values(unwrap=True)
+            tag_socket_value(task.outputs, only_uuid=True)
+            return task.outputs._collect_values(unwrap=False)
+
+    def _cache_lookup(
+        self, task, pid: Optional[str], kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], bool, Any]:
+        """
+        Look up a previous result of ``task`` called with ``kwargs``.
+
+        Returns ``(key, hit, value)``; ``key`` is None when caching is disabled or the
+        call is not cacheable. Hits are marked with ``cached=True`` in the process meta.
+        """
+        if self.cache is None:
+            return None, False, None
+        key = task_cache_key(task, kwargs)
+        if key is None:
+            return None, False, None
+        hit, value = self.cache.get(key)
+        if hit:
+            value = self._load_spilled(value)
+            if pid is not None:
+                self.recorder.set_process_meta(pid, cached=True)
+        return key, hit, value
+
+    def _cache_store(self, key: Optional[str], value: Any) -> None:
+        if key is None or isinstance(value, Stream):
+            return
+        if self.spill is not None:
+            # the cache keeps the placeholders, not the large values
+            value = self._spill_value(value)
+        try:
+            self.cache.set(key, value)
+        except Exception as e:
+            logger.warning(f"Failed to cache result for key {key}: {e}")
+
+    def _stream_or_materialize(
+        self, task, result: Any, pid: Optional[str] = None
+    ) -> Any:
+        """
+        Wrap a generator result in a ``Stream`` when its task has a single consumer
+        (see ``_streaming_tasks``); otherwise collect the items into a list.
+
+        The process ``pid`` of a streaming task ends with its stream, failed if the
+        generator raised.
+        """
+        if not inspect.isgenerator(result):
+            return result
+        if task.name not in self._stream_tasks:
+            return list(result)
+
+        def _on_end(error: Optional[BaseException]) -> None:
+            if pid is None:
+                return
+            if error is None:
+                self.recorder.process_end(pid, state="FINISHED")
+            else:
+                self.recorder.process_end(pid, state="FAILED", error=str(error))
+
+        stream = Stream(
+            result, maxsize=self.stream_maxsize, name=task.name, on_end=_on_end
+        )
+        if self._stream_in_background:
+            stream.start()
+        self._open_streams.append(stream)
+        return stream
+
+    def _streamed_tasks(self, ng: Graph, streaming: Iterable[str]) -> Set[str]:
+        """
+        The ``streaming`` tasks of ``ng`` whose consumer is never retried: a retried
+        consumer needs the items again, so they are collected into a list instead.
+        """
+        if self.retry_policy is not None and self.retry_policy.max_retries > 0:
+            return set()
+        return {
+            name
+            for name in streaming
+            if not any(
+                lk.to_task.get_error_handlers()
+                for lk in ng.links._get_output_links(name)
+            )
+        }
+
+    def _close_streams(self) -> None:
+        """Stop the producers of streams that were not consumed to the end."""
+        streams, self._open_streams = self._open_streams, []
+        for stream in streams:
+            stream.close()
+
+    def _checkpoint_task(self, name: str, outputs: Dict[str, Any]) -> None:
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save(name, outputs)
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint outputs of task {name}: {e}")
+
+    def _flush_checkpoint(self) -> None:
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.flush()
+        except Exception as e:
+            logger.warning(f"Failed to write checkpoint: {e}")
+
+    def _restore_checkpoint(
+        self, ng: Graph, checkpoint: Optional[CheckpointStore]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load and re-tag the outputs of the tasks of ``ng`` completed in ``checkpoint``."""
+        checkpoint = checkpoint or self.checkpoint
+        if checkpoint is None:
+            raise ValueError("No checkpoint to resume from; pass `checkpoint=...`.")
+        restored: Dict[str, Dict[str, Any]] = {}
+        for name, outputs in checkpoint.load().items():
+            if name not in ng.tasks or name in BUILTIN_TASKS:
+                continue
+            task = ng.tasks[name]
+            # skipped tasks have no outputs, zones hold the ctx values they wrote
+            if outputs and not _is_zone_task(task):
+                outputs = self._normalize_outputs(task, outputs, strict=False)
+            restored[name] = outputs
+        return restored
 
     def _link_socket_value(
         self, from_name: str, from_socket: str, source_map: Dict[str, Any]
@@ -143,13 +423,79 @@ class BaseEngine(ABC):
     def _link_bundle(self, payload: Dict[str, Any]) -> Any:
         return payload
 
+    def _value_release(self, ng: Graph, plan) -> Optional[ValueRelease]:
+        """Per-run tracker that drops consumed outputs (``release_values=True``)."""
+        if not self.release_values:
+            return None
+
+        def _clear_outputs(name: str, keys: List[str]) -> None:
+            # the output sockets hold the values too
+            sockets = ng.tasks[name].outputs._sockets
+            for key in keys:
+                if key in sockets:
+                    _clear_socket_value(sockets[key])
+
+        return ValueRelease(plan, keep=self.keep_values, on_release=_clear_outputs)
+
+    def _plan_link_kwargs(
+        self, plan, tid: Optional[int], values: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        kwargs = plan.link_kwargs(tid, values, bundle_factory=self._link_bundle)
+        return kwargs if self.spill is None else self._unspill(kwargs)
+
+    def _spill_outputs(self, task, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace oversized ``outputs`` of ``task`` by ``Spilled`` placeholders."""
+        spilled: Dict[str, Any] = {}
+        for key, value in outputs.items():
+            if type(value) is dict:
+                value = self._spill_outputs(task, value)
+            elif self.spill.should_spill(value):
+                handle = self.spill.spill(getattr(value, "__wrapped__", value))
+                if isinstance(value, TaggedValue):
+                    handle.uuid, handle.socket = value._uuid, value._socket
+                else:
+                    handle.data_id = self.recorder.value_ids.id_of(value)
+                value = handle
+            spilled[key] = value
+        return spilled
+
+    def _spill_value(self, value: Any) -> Any:
+        """Replace the oversized parts of a raw result by ``Spilled`` placeholders."""
+        if type(value) is dict:
+            return {key: self._spill_value(v) for key, v in value.items()}
+        if self.spill.should_spill(value):
+            return self.spill.spill(value)
+        return value
+
+    def _load_spilled(self, value: Any) -> Any:
+        """Inverse of ``_spill_value``."""
+        if type(value) is dict:
+            return {key: self._load_spilled(v) for key, v in value.items()}
+        if isinstance(value, Spilled):
+            return value.load()
+        return value
+
+    def _unspill(self, value: Any) -> Any:
+        """Load the ``Spilled`` placeholders in ``value``, keeping their provenance id."""
+        if type(value) is dict:
+            return {key: self._unspill(v) for key, v in value.items()}
+        if not isinstance(value, Spilled):
+            return value
+        loaded = value.load()
+        if value.uuid is None:
+            self.recorder.value_ids.assign(loaded, value.data_id)
+            return loaded
+        tagged = TaggedValue(loaded, socket=value.socket)
+        tagged._self_uuid = value.uuid
+        return tagged
+
     def _build_link_kwargs(
         self,
         target_name: str,
         links,
         source_map: Dict[str, Any],
     ) -> Dict[str, Any]:
-        return _build_task_link_kwargs(
+        kwargs = _build_task_link_kwargs(
             target_name,
             links,
             source_map,
@@ -157,6 +503,7 @@ class BaseEngine(ABC):
             resolve_whole=self._link_whole_output,
             bundle_factory=self._link_bundle,
         )
+        return kwargs if self.spill is None else self._unspill(kwargs)
 
     def _build_subgraph(
         self, task, graph_fn: Callable, kwargs: Dict[str, Any]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import copy
+import hashlib
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import cloudpickle
+import numpy as np
+
+from node_graph.executor import ExecutorMode
+
+
+class TaskCache(ABC):
+    """
+    Content-addressed store for task results.
+
+    Keys are produced by :func:`task_cache_key`; values are the raw (untagged)
+    return values of the task callables.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(True, value)`` on a hit and ``(False, None)`` on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+
+
+class MemoryCache(TaskCache):
+    """
+    In-process LRU cache holding at most ``maxsize`` results (``None`` = unbounded).
+
+    Values are deep-copied when stored and when returned, so mutating a result does
+    not change the cached one.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key not in self._data:
+                return False, None
+            self._data.move_to_end(key)
+            value = self._data[key]
+        return True, copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteCache(TaskCache):
+    """On-disk cache in a single SQLite file; values are stored with cloudpickle."""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)"
+            )
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return False, None
+        return True, cloudpickle.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        blob = cloudpickle.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, blob),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _update_digest(h: "hashlib._Hash", value: Any) -> None:
+    """Feed a canonical encoding of ``value`` into ``h`` (order-independent for dicts/sets)."""
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, bytes):
+        h.update(b"bytes:" + value + b";")
+    elif isinstance(value, dict):
+        h.update(b"dict{")
+        for key in sorted(value, key=repr):
+            _update_digest(h, key)
+            _update_digest(h, value[key])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}[".encode())
+        for item in value:
+            _update_digest(h, item)
+        h.update(b"]")
+    elif isinstance(value, (set, frozenset)):
+        h.update(b"set{")
+        for item in sorted(value, key=repr):
+            _update_digest(h, item)
+        h.update(b"}")
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    else:
+        h.update(f"{type(value).__module__}.{type(value).__qualname__}:".encode())
+        h.update(pickle.dumps(value, protocol=4))
+
+
+def stable_hash(value: Any) -> str:
+    """Return a hex digest of ``value`` that is stable across processes and runs."""
+    h = hashlib.sha256()
+    _update_digest(h, value)
+    return h.hexdigest()
+
+
+def executor_identity(executor) -> Optional[str]:
+    """Identify the code behind an executor: import path, or a hash of the pickled bytes."""
+    if executor is None:
+        return None
+    if executor.mode == ExecutorMode.MODULE:
+        return f"{executor.module_path}.{executor.callable_name}"
+    if executor.mode == ExecutorMode.PICKLED_CALLABLE and executor.pickled_callable:
+        digest = hashlib.sha256(executor.pickled_callable.encode("utf-8")).hexdigest()
+        return f"pickled:{digest}"
+    return None
+
+
+def task_cache_key(task, kwargs: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the cache key of one task call from its executor identity,
+    ``TaskSpec.version`` and a stable hash of the resolved (untagged) kwargs.
+
+    Returns ``None`` when the call cannot be cached (no executor or unhashable inputs).
+    """
+    identity = executor_identity(task.spec.executor)
+    if identity is None:
+        return None
+    try:
+        inputs_digest = stable_hash(kwargs)
+    except Exception:
+        return None
+    return f"{identity}@{task.spec.version or ''}:{inputs_digest}"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict
+
+import cloudpickle
+
+from .utils import _resolve_tagged_value
+
+
+class CheckpointStore(ABC):
+    """
+    Persists the outputs of completed tasks so an interrupted graph run can resume.
+
+    ``save`` serializes the (untagged) outputs immediately and buffers them; buffered
+    outputs are written to the backing file at most every ``interval`` seconds and on
+    ``flush``. One store holds the checkpoint of one graph.
+    """
+
+    def __init__(self, interval: float = 0.0):
+        self.interval = interval
+        self._pending: Dict[str, bytes] = {}
+        self._last_write = time.monotonic()
+        self._lock = threading.Lock()
+
+    def save(self, task_name: str, outputs: Dict[str, Any]) -> None:
+        """Record the outputs of a completed task."""
+        blob = cloudpickle.dumps(_resolve_tagged_value(outputs))
+        with self._lock:
+            self._pending[task_name] = blob
+        if time.monotonic() - self._last_write >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered outputs to the backing file."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if pending:
+                self._write(pending)
+            self._last_write = time.monotonic()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Return the outputs of every completed task, keyed by task name."""
+        self.flush()
+        with self._lock:
+            blobs = self._read()
+        return {name: cloudpickle.loads(blob) for name, blob in blobs.items()}
+
+    @abstractmethod
+    def _write(self, blobs: Dict[str, bytes]) -> None:
+        """Persist ``blobs`` (task name -> pickled outputs), replacing older entries."""
+
+    @abstractmethod
+    def _read(self) -> Dict[str, bytes]:
+        """Return all persisted entries."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop the checkpoint."""
+
+
+class PickleCheckpoint(CheckpointStore):
+    """Checkpoint in a single pickle file, rewritten atomically on every write."""
+
+    def __init__(self, path: str | Path, interval: float = 10.0):
+        super().__init__(interval)
+        self.path = Path(path)
+        self._blobs: Dict[str, bytes] = {}
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                self._blobs = cloudpickle.load(f)
+
+    def _write(self, blobs: Dict[str, bytes]) -> None:
+        self._blobs.update(blobs)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            cloudpickle.dump(self._blobs, f)
+        os.replace(tmp, self.path)
+
+    def _read(self) -> Dict[str, bytes]:
+        return dict(self._blobs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._blobs.clear()
+            if self.path.exists():
+                self.path.unlink()
+
+
+class SqliteCheckpoint(CheckpointStore):
+    """Checkpoint in a SQLite file; each write is a single transaction."""
+
+    def __init__(self, path: str | Path, interval: float = 0.0):
+        super().__init__(interval)
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks (name TEXT PRIMARY KEY, outputs BLOB)"
+            )
+
+    def _write(self, blobs: Dict[str, bytes]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tasks (name, outputs) VALUES (?, ?)",
+                list(blobs.items()),
+            )
+
+    def _read(self) -> Dict[str, bytes]:
+        return dict(self._conn.execute("SELECT name, outputs FROM tasks").fetchall())
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._pending.clear()
+            self._conn.execute("DELETE FROM tasks")
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """Reference to a value stored in a data plane file, sent instead of the value."""
+
+    path: str
+    kind: str  # "ndarray", "bytes" or "bytearray"
+
+
+def _default_directory() -> Optional[str]:
+    # RAM-backed on Linux, so "files" never touch the disk
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+
+def _is_large(value: Any, threshold: int) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.dtype != object and 0 < value.nbytes and value.nbytes >= threshold
+    if isinstance(value, (bytes, bytearray)):
+        return 0 < len(value) and len(value) >= threshold
+    return False
+
+
+def _map_leaves(value: Any, fn: Callable[[Any], Any]) -> Any:
+    if isinstance(value, dict):
+        return {k: _map_leaves(v, fn) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_map_leaves(v, fn) for v in value)
+    return fn(value)
+
+
+def _write(value: Any, directory: str) -> SharedHandle:
+    is_array = isinstance(value, np.ndarray)
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".npy" if is_array else ".bin")
+    with os.fdopen(fd, "wb") as f:
+        if is_array:
+            np.save(f, value, allow_pickle=False)
+        else:
+            f.write(value)
+    return SharedHandle(path, "ndarray" if is_array else type(value).__name__)
+
+
+def _read(handle: SharedHandle) -> Any:
+    if handle.kind == "ndarray":
+        # copy-on-write mapping: no copy is made unless the task writes to it
+        return np.load(handle.path, mmap_mode="c").view(np.ndarray)
+    with open(handle.path, "rb") as f:
+        data = f.read()
+    return bytearray(data) if handle.kind == "bytearray" else data
+
+
+def export_values(value: Any, directory: str, threshold: int) -> Any:
+    """Worker side: replace every large array/bytes leaf of ``value`` by a new handle."""
+
+    def _export(leaf: Any) -> Any:
+        return _write(leaf, directory) if _is_large(leaf, threshold) else leaf
+
+    return _map_leaves(value, _export)
+
+
+def import_values(value: Any) -> Any:
+    """Replace every handle in ``value`` by the (memory-mapped) value it refers to."""
+    return _map_leaves(
+        value, lambda leaf: _read(leaf) if isinstance(leaf, SharedHandle) else leaf
+    )
+
+
+class DataPlane:
+    """
+    Moves large NumPy arrays and bytes between ``ProcessPoolEngine`` and its workers
+    through memory-mapped files instead of pickling them over a pipe.
+
+    Values of at least ``threshold`` bytes are written once to a file in ``directory``
+    (``/dev/shm`` when available) and only a ``SharedHandle`` travels with the task.
+    Arrays are opened with ``np.load(mmap_mode="c")`` on both sides, so passing a
+    task's output on to the next worker costs neither a pickle nor a copy.
+
+    Every file is reference counted: the producing task holds its outputs until its
+    last downstream consumer has run, and each call holds its inputs until it returns.
+    A file is unlinked as soon as nobody holds it; values already loaded stay valid
+    because the mapping outlives the file.
+    """
+
+    def __init__(self, threshold: int = 1 << 20, directory: Optional[str] = None):
+        self.threshold = threshold
+        self.directory = directory
+        self._run_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        # path -> [refcount, value, handle]; holding the value keeps its id() unique
+        self._entries: Dict[str, List[Any]] = {}
+        self._by_id: Dict[int, str] = {}
+
+    def open(self) -> None:
+        """Create the directory of a run."""
+        base = self.directory or _default_directory()
+        self._run_dir = tempfile.mkdtemp(prefix="node-graph-", dir=base)
+
+    def close(self) -> None:
+        """Remove every file of the run, including ones still held."""
+        with self._lock:
+            self._entries.clear()
+            self._by_id.clear()
+        if self._run_dir is not None:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+
+    @property
+    def worker_args(self) -> Tuple[str, int]:
+        """What a worker needs to export its results: ``(directory, threshold)``."""
+        return self._run_dir, self.threshold
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def export(self, value: Any) -> Tuple[Any, List[str]]:
+        """
+        Parent side: replace large leaves of ``value`` by handles, holding each file
+        once. Values that were loaded from (or written to) a live file reuse it.
+        """
+        held: List[str] = []
+
+        def _export(leaf: Any) -> Any:
+            if not _is_large(leaf, self.threshold):
+                return leaf
+            with self._lock:
+                path = self._by_id.get(id(leaf))
+                entry = self._entries.get(path) if path else None
+                if entry is not None and entry[1] is leaf:
+                    entry[0] += 1
+                    held.append(path)
+                    return entry[2]
+            handle = _write(leaf, self._run_dir)
+            self._register(handle, leaf)
+            held.append(handle.path)
+            return handle
+
+        return _map_leaves(value, _export), held
+
+    def adopt(self, value: Any) -> Tuple[Any, List[str]]:
+        """Parent side: load the handles a worker returned, holding each file once."""
+        held: List[str] = []
+
+        def _adopt(leaf: Any) -> Any:
+            if not isinstance(leaf, SharedHandle):
+                return leaf
+            loaded = _read(leaf)
+            self._register(leaf, loaded)
+            held.append(leaf.path)
+            return loaded
+
+        return _map_leaves(value, _adopt), held
+
+    def release(self, paths: Iterable[str]) -> None:
+        """Drop one hold of each file in ``paths``; unlink files nobody holds."""
+        for path in paths:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is None:
+                    continue
+                entry[0] -= 1
+                if entry[0] > 0:
+                    continue
+                del self._entries[path]
+                if self._by_id.get(id(entry[1])) == path:
+                    del self._by_id[id(entry[1])]
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _register(self, handle: SharedHandle, value: Any) -> None:
+        with self._lock:
+            self._entries[handle.path] = [1, value, handle]
+            self._by_id[id(value)] = handle.path
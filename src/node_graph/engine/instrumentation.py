@@ -0,0 +1,181 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# where the time of a task run goes; "queue" and "inputs" happen before it starts
+PHASES = ("queue", "inputs", "tagging", "call", "outputs", "provenance")
+
+_current: ContextVar[Optional["TaskMetrics"]] = ContextVar(
+    "node_graph_task_metrics", default=None
+)
+
+
+@dataclass
+class TaskMetrics:
+    """
+    Timing of one task run (all attempts), on the ``time.perf_counter`` clock.
+
+    ``spans`` are the measured ``(phase, start, end)`` intervals. ``inputs`` spans the
+    input resolution on the scheduling thread and ``ready`` is when the task was handed
+    to the worker, so ``start - ready`` is the queue wait.
+    """
+
+    task: str
+    graph: str
+    start: float
+    end: float = 0.0
+    ready: Optional[float] = None
+    state: str = "RUNNING"
+    thread: int = 0
+    scheduler_thread: int = 0
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """Seconds per phase; time not covered by any phase is engine bookkeeping."""
+        totals = dict.fromkeys(PHASES, 0.0)
+        if self.ready is not None:
+            totals["queue"] = max(0.0, self.start - self.ready)
+        for name, start, end in self.spans:
+            totals[name] += end - start
+        return totals
+
+    @property
+    def overhead(self) -> float:
+        """Framework time: input resolution plus everything in the run but the call."""
+        phases = self.phases
+        return phases["inputs"] + self.duration - phases["call"]
+
+
+class Instrumentation:
+    """
+    Collects a ``TaskMetrics`` for every task an engine runs and passes it to
+    ``hooks`` (callables taking the metrics) as soon as the task has finished.
+
+    Pass the same instance to several engines to aggregate their runs. Metrics are
+    kept in ``metrics`` and can be exported as a Chrome trace (``chrome://tracing``,
+    Perfetto) with ``save_chrome_trace``.
+    """
+
+    def __init__(
+        self,
+        hooks: Optional[List[Callable[[TaskMetrics], None]]] = None,
+        keep: bool = True,
+    ):
+        self.hooks = list(hooks or [])
+        self.keep = keep
+        self.metrics: List[TaskMetrics] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def task(
+        self,
+        task_name: str,
+        graph: str,
+        inputs: Optional[Tuple[float, float, int]] = None,
+    ) -> Iterator[TaskMetrics]:
+        """
+        Measure one task run. ``inputs`` is ``(start, end, thread)`` of the input
+        resolution that preceded it, if known.
+        """
+        metrics = TaskMetrics(
+            task=task_name,
+            graph=graph,
+            start=time.perf_counter(),
+            thread=threading.get_ident(),
+        )
+        if inputs is not None:
+            start, end, metrics.scheduler_thread = inputs
+            metrics.ready = end
+            metrics.spans.append(("inputs", start, end))
+        token = _current.set(metrics)
+        try:
+            yield metrics
+            metrics.state = "FINISHED"
+        except BaseException:
+            metrics.state = "FAILED"
+            raise
+        finally:
+            metrics.end = time.perf_counter()
+            _current.reset(token)
+            self._emit(metrics)
+
+    @staticmethod
+    @contextmanager
+    def phase(name: str) -> Iterator[None]:
+        """Add the time spent in the block to phase ``name`` of the current task."""
+        metrics = _current.get()
+        if metrics is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            metrics.spans.append((name, start, time.perf_counter()))
+
+    def _emit(self, metrics: TaskMetrics) -> None:
+        if self.keep:
+            with self._lock:
+                self.metrics.append(metrics)
+        for hook in self.hooks:
+            hook(metrics)
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per phase summed over all recorded tasks, plus ``overhead``."""
+        totals = dict.fromkeys(PHASES, 0.0)
+        totals["overhead"] = 0.0
+        with self._lock:
+            metrics = list(self.metrics)
+        for m in metrics:
+            for name, seconds in m.phases.items():
+                totals[name] += seconds
+            totals["overhead"] += m.overhead
+        return totals
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """The recorded metrics in the Chrome trace event format."""
+        with self._lock:
+            metrics = list(self.metrics)
+        origin = min(
+            (m.spans[0][1] if m.spans else m.start for m in metrics), default=0
+        )
+        pid = os.getpid()
+
+        def _event(name, cat, start, end, tid, args=None) -> Dict[str, Any]:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            return event
+
+        events = []
+        for m in metrics:
+            args = {"graph": m.graph, "state": m.state}
+            args.update({f"{k}_ms": v * 1e3 for k, v in m.phases.items()})
+            events.append(_event(m.task, "task", m.start, m.end, m.thread, args))
+            for name, start, end in m.spans:
+                tid = m.scheduler_thread if name == "inputs" else m.thread
+                events.append(_event(name, "phase", start, end, tid, {"task": m.task}))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
@@ -1,19 +1,58 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from node_graph import Graph
+from node_graph.analysis import GraphAnalysis
 from node_graph.graph import BUILTIN_TASKS
+from node_graph.link import TaskLink
+from .cache import TaskCache
+from .checkpoint import CheckpointStore
+from .instrumentation import Instrumentation
 from .provenance import ProvenanceRecorder
-from .base import BaseEngine
+from .retry import RetryPolicy, TaskAttempts, exit_code_of
+from .spill import SpillStore
+from .streaming import Stream
+from .base import BaseEngine, GraphRun
+from .plan import ExecutionPlan, execution_plan
+from .mapping import (
+    Chunk,
+    _gather_map_results,
+    _is_map_task,
+    _map_plan,
+    _run_map_chunk,
+)
 
 from .utils import (
-    _scan_links_topology,
-    _collect_literals,
+    _condition_is_true,
+    _has_zones,
+    _is_zone_task,
+    _merge_input_overrides,
+    get_nested_dict,
+    update_nested_dict,
     update_nested_dict_with_special_keys,
     _resolve_tagged_value,
+    _set_raw_socket_value,
 )
 
 
+@dataclass
+class _ZonedRun:
+    """Link maps and results shared by the zone-aware scheduler during one graph run."""
+
+    ng: Graph
+    incoming: Dict[str, List[TaskLink]]
+    outgoing: Dict[str, List[TaskLink]]
+    deps: Dict[str, Set[str]]
+    values: Dict[str, Dict[str, Any]]
+    # zone name -> names of all tasks nested in it, at any depth
+    nested: Dict[str, List[str]] = field(default_factory=dict)
+    # outputs from an earlier run (see ``_reuse_scope_task``)
+    reuse: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
 class LocalEngine(BaseEngine):
     """
     Sync, dependency-free runner with provenance:
@@ -22,15 +61,40 @@ class LocalEngine(BaseEngine):
     - @task.graph: builds & runs a sub-Graph, resolves returned socket-handles to values
     - Provenance: records runtime *flattened* inputs & outputs around each task run
     - Link semantics from utils: _wait, _outputs, and multi-fan-in bundling
+    - Zones: children of a false ``If`` are skipped, ``While`` children are repeated
+      (re-evaluating the condition tasks) up to ``max_iterations``, and ``ctx``
+      writes are visible to the tasks that run after them
     """
 
     engine_kind = "local"
 
     def __init__(
-        self, name: str = "local-flow", recorder: Optional[ProvenanceRecorder] = None
+        self,
+        name: str = "local-flow",
+        recorder: Optional[ProvenanceRecorder] = None,
+        cache: Optional[TaskCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        tagging: str = "proxy",
+        release_values: bool = False,
+        keep_values: Optional[Iterable[str]] = None,
+        spill: Optional[SpillStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ):
-        super().__init__(name, recorder)
+        super().__init__(
+            name,
+            recorder,
+            cache=cache,
+            retry_policy=retry_policy,
+            checkpoint=checkpoint,
+            tagging=tagging,
+            release_values=release_values,
+            keep_values=keep_values,
+            spill=spill,
+            instrumentation=instrumentation,
+        )
         self._graph_pid: Optional[str] = None
+        self.last_run: Optional[GraphRun] = None
 
     def run(
         self,
@@ -38,94 +102,488 @@ class LocalEngine(BaseEngine):
         parent_pid: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Execute ``ng`` and return the graph outputs as plain values."""
-        order, incoming, _required = _scan_links_topology(ng)
+        outputs, _values = self._run_graph(ng, parent_pid)
+        return outputs
+
+    def rerun(
+        self, ng: Graph, previous_run: Optional[GraphRun] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute ``ng`` re-running only what changed since ``previous_run``.
+
+        Tasks that were added or modified (input links or input values, see
+        ``GraphAnalysis.compare_graphs``) and all their descendants are executed;
+        every other task reuses its outputs from ``previous_run``. Without a previous
+        run (default: ``self.last_run``) the whole graph is executed.
+
+        The returned outputs are the same as ``run``; ``self.last_run`` is updated so
+        successive edits can be re-run incrementally.
+        """
+        previous_run = previous_run or self.last_run
+        snapshot = ng.copy(name=ng.name)
+        reuse = previous_run.reusable_values(ng) if previous_run is not None else {}
+        outputs, values = self._run_graph(ng, None, reuse=reuse)
+        self.last_run = GraphRun(graph=snapshot, values=values)
+        return outputs
+
+    def resume(
+        self, ng: Graph, checkpoint: Optional[CheckpointStore] = None
+    ) -> Dict[str, Any]:
+        """
+        Continue an interrupted run of ``ng``: tasks whose outputs are stored in
+        ``checkpoint`` (default: ``self.checkpoint``) are not executed again.
+        """
+        reuse = self._restore_checkpoint(ng, checkpoint)
+        outputs, _values = self._run_graph(ng, None, reuse=reuse)
+        return outputs
+
+    def _run_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+        reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Execute ``ng``; tasks listed in ``reuse`` take their outputs from it instead."""
+        reuse = reuse or {}
+        if _has_zones(ng):
+            return self._run_zoned_graph(ng, parent_pid, reuse)
+        plan = execution_plan(ng)
+        self._stream_tasks = self._streamed_tasks(ng, plan.streaming)
 
         # Built-ins: treat as already "available" values
         values: Dict[str, Dict[str, Any]] = self._snapshot_builtins(ng)
 
+        release = self._value_release(ng, plan)
+
         graph_pid = self._start_graph_run(ng, parent_pid)
         previous_pid = self._graph_pid
         self._graph_pid = graph_pid
 
         try:
-            for name in order:
-                if name in BUILTIN_TASKS:
+            for tid in plan.order:
+                if plan.builtin[tid]:
                     continue
+                name = plan.names[tid]
+                if name in reuse:
+                    values[name] = reuse[name]
+                else:
+                    task = ng.tasks[name]
+                    kw = self._resolve_planned_inputs(task, plan, tid, values)
+                    values[name] = self._run_task(task, graph_pid, kw)
+                    self._checkpoint_task(name, values[name])
+                if release is not None:
+                    release.done(tid, values)
 
-                task = ng.tasks[name]
+            graph_outputs = self._plan_link_kwargs(
+                plan, plan.ids.get("graph_outputs"), values
+            )
+            return self._finalize_graph_success(ng, graph_pid, graph_outputs), values
+        except Exception as e:
+            self._record_graph_failure(graph_pid, e)
+            raise
+        finally:
+            self._flush_checkpoint()
+            self._close_streams()
+            self._graph_pid = previous_pid
 
-                kw = dict(_collect_literals(task))
-                link_kwargs = self._build_link_kwargs(
-                    target_name=name,
-                    links=incoming.get(name, []),
-                    source_map=values,
-                )
-                kw.update(link_kwargs)
-                kw = update_nested_dict_with_special_keys(kw)
+    def _run_zoned_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+        reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Execute a graph containing Zone/If/While tasks.
 
-                label_kind = "return" if self._is_graph_task(task) else "create"
-                executor = self._build_task_executor(task, label_kind=label_kind)
-                tagged_out = executor(graph_pid, **kw)
-                values[name] = tagged_out
+        Tasks are ordered per zone level by the ``input_tasks`` of
+        ``GraphAnalysis.build_zone``; built-in tasks are always available, so ``ctx``
+        reads see the latest value written by a task that already finished.
+
+        Top-level tasks are checkpointed and reused as a whole, with everything
+        nested in them: a task inside a ``While`` runs once per iteration, so only
+        the final outputs of a finished zone are kept. The value of a zone is the
+        ``ctx`` it wrote, so a reused zone restores those writes.
+        """
+        # zone graphs are not planned, so no generator output is streamed
+        self._stream_tasks = set()
+        incoming: Dict[str, List[TaskLink]] = defaultdict(list)
+        outgoing: Dict[str, List[TaskLink]] = defaultdict(list)
+        for lk in ng.links:
+            incoming[lk.to_task.name].append(lk)
+            outgoing[lk.from_task.name].append(lk)
+        nested: Dict[str, List[str]] = defaultdict(list)
+        for task in ng.tasks:
+            parent = task.parent
+            while parent is not None:
+                nested[parent.name].append(task.name)
+                parent = parent.parent
+        zones = GraphAnalysis(ng).build_zone()
+        run = _ZonedRun(
+            ng=ng,
+            incoming=incoming,
+            outgoing=outgoing,
+            deps={
+                name: {n for n in info["input_tasks"] if n not in BUILTIN_TASKS}
+                for name, info in zones.items()
+            },
+            values=self._snapshot_builtins(ng),
+            nested=nested,
+            reuse=reuse or {},
+        )
+
+        graph_pid = self._start_graph_run(ng, parent_pid)
+        previous_pid = self._graph_pid
+        self._graph_pid = graph_pid
+
+        try:
+            self._write_ctx(run, "graph_inputs")
+            top_level = [
+                task.name
+                for task in ng.tasks
+                if task.name not in BUILTIN_TASKS and task.parent is None
+            ]
+            self._run_scope(run, top_level, graph_pid)
 
             graph_outputs = self._build_link_kwargs(
                 target_name="graph_outputs",
                 links=incoming.get("graph_outputs", []),
-                source_map=values,
+                source_map=run.values,
+            )
+            return (
+                self._finalize_graph_success(ng, graph_pid, graph_outputs),
+                run.values,
             )
-            return self._finalize_graph_success(ng, graph_pid, graph_outputs)
         except Exception as e:
             self._record_graph_failure(graph_pid, e)
             raise
         finally:
+            self._flush_checkpoint()
             self._graph_pid = previous_pid
 
+    def _run_scope(
+        self, run: _ZonedRun, names: List[str], parent_pid: Optional[str]
+    ) -> None:
+        """Run one zone level in dependency order; tasks outside it are already done."""
+        scope = set(names)
+        done: Set[str] = set()
+        pending = list(names)
+        while pending:
+            ready = [name for name in pending if not (run.deps[name] & scope) - done]
+            if not ready:
+                raise RuntimeError(
+                    f"Cannot schedule tasks {pending}: they depend on each other."
+                )
+            for name in ready:
+                self._run_scope_task(run, name, parent_pid)
+                done.add(name)
+            pending = [name for name in pending if name not in done]
+
+    def _run_scope_task(
+        self, run: _ZonedRun, name: str, parent_pid: Optional[str]
+    ) -> None:
+        task = run.ng.tasks[name]
+        top_level = task.parent is None
+        if top_level and self._reuse_scope_task(run, task):
+            return
+        if _is_zone_task(task):
+            self._run_zone(run, task, parent_pid)
+            run.values[name] = self._zone_ctx_writes(run, task)
+        else:
+            kw = self._resolve_task_inputs(task, run.incoming.get(name, []), run.values)
+            run.values[name] = self._run_task(task, parent_pid, kw)
+        self._write_ctx(run, name)
+        if top_level:
+            # the zone last: a checkpoint holding it holds its nested tasks too
+            for nested in run.nested.get(name, []):
+                if nested in run.values:
+                    self._checkpoint_task(nested, run.values[nested])
+            self._checkpoint_task(name, run.values[name])
+
+    def _reuse_scope_task(self, run: _ZonedRun, task) -> bool:
+        """Take a top-level task and everything nested in it from ``run.reuse``."""
+        names = [task.name] + run.nested.get(task.name, [])
+        if any(name not in run.reuse for name in names):
+            return False
+        for name in names:
+            run.values[name] = run.reuse[name]
+        if _is_zone_task(task):
+            for key, value in run.values[task.name].items():
+                update_nested_dict(run.values["graph_ctx"], key, value)
+        else:
+            self._write_ctx(run, task.name)
+        return True
+
+    def _zone_ctx_writes(self, run: _ZonedRun, zone) -> Dict[str, Any]:
+        """The ``ctx`` values written by the tasks nested in ``zone``, by ctx path."""
+        ctx = run.values["graph_ctx"]
+        return {
+            lk.to_socket._scoped_name: get_nested_dict(
+                ctx, lk.to_socket._scoped_name, default=None
+            )
+            for name in run.nested.get(zone.name, [])
+            for lk in run.outgoing.get(name, [])
+            if lk.to_task.name == "graph_ctx"
+        }
+
+    def _run_zone(self, run: _ZonedRun, zone, parent_pid: Optional[str]) -> None:
+        """Run the children of a Zone, If or While task under a ``zone`` process."""
+        kind = zone.spec.task_type.upper()
+        children = [task.name for task in run.ng.tasks if task.parent is zone]
+        pid = self.recorder.process_start(
+            task_name=zone.name,
+            callable_obj=None,
+            flow_run_id=f"{self.engine_kind}:{self.name}",
+            task_run_id=f"{self.engine_kind}:{zone.name}",
+            kind="zone",
+            parent_pid=parent_pid,
+        )
+        try:
+            inputs = self._resolve_task_inputs(
+                zone, run.incoming.get(zone.name, []), run.values
+            )
+            if kind == "IF":
+                taken = _condition_is_true(inputs.get("conditions")) != bool(
+                    _resolve_tagged_value(inputs.get("invert_condition", False))
+                )
+                if taken:
+                    self._run_scope(run, children, pid)
+                else:
+                    self._skip_zone(run, zone)
+                self.recorder.set_process_meta(pid, taken=taken)
+            elif kind == "WHILE":
+                condition_tasks = self._while_condition_tasks(run, zone)
+                max_iterations = _resolve_tagged_value(inputs["max_iterations"])
+                iterations = 0
+                while iterations < max_iterations and _condition_is_true(
+                    inputs.get("conditions")
+                ):
+                    self._run_scope(run, children, pid)
+                    iterations += 1
+                    self._run_scope(run, condition_tasks, parent_pid)
+                    inputs = self._resolve_task_inputs(
+                        zone, run.incoming.get(zone.name, []), run.values
+                    )
+                self.recorder.set_process_meta(pid, iterations=iterations)
+            else:
+                self._run_scope(run, children, pid)
+        except Exception as exc:
+            self.recorder.process_end(pid, state="FAILED", error=str(exc))
+            raise
+        self.recorder.process_end(pid, state="FINISHED")
+
+    def _skip_zone(self, run: _ZonedRun, zone) -> None:
+        """Mark every task nested in ``zone`` as skipped: it produces no outputs."""
+        for name in run.nested.get(zone.name, []):
+            run.values[name] = {}
+
+    def _while_condition_tasks(self, run: _ZonedRun, zone) -> List[str]:
+        """Tasks beside ``zone`` that compute its condition and must re-run each iteration."""
+        todo = [
+            lk.from_task.name
+            for lk in run.incoming.get(zone.name, [])
+            if lk.to_socket._scoped_name == "conditions"
+        ]
+        found: List[str] = []
+        while todo:
+            name = todo.pop()
+            if name in BUILTIN_TASKS or name in found:
+                continue
+            if run.ng.tasks[name].parent is not zone.parent:
+                continue
+            found.append(name)
+            todo.extend(run.deps[name])
+        return found
+
+    def _write_ctx(self, run: _ZonedRun, name: str) -> None:
+        """Apply the ``ctx`` writes (links into ``graph_ctx``) of a finished task."""
+        links = [
+            lk for lk in run.outgoing.get(name, []) if lk.to_task.name == "graph_ctx"
+        ]
+        if not links:
+            return
+        updates = self._build_link_kwargs("graph_ctx", links, run.values)
+        for key, value in updates.items():
+            update_nested_dict(run.values["graph_ctx"], key, value)
+
+    def _resolve_task_inputs(
+        self, task, links, values: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Merge literal inputs with the upstream values delivered by ``links``."""
+        start = time.perf_counter()
+        kw = dict(self._task_literals(task))
+        link_kwargs = self._build_link_kwargs(
+            target_name=task.name,
+            links=links,
+            source_map=values,
+        )
+        kw.update(link_kwargs)
+        kw = update_nested_dict_with_special_keys(kw)
+        self._input_resolution(task, start)
+        return kw
+
+    def _resolve_planned_inputs(
+        self, task, plan: ExecutionPlan, tid: int, values: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Like ``_resolve_task_inputs``, with the links precompiled in ``plan``."""
+        start = time.perf_counter()
+        kw = dict(self._task_literals(task))
+        kw.update(self._plan_link_kwargs(plan, tid, values))
+        kw = update_nested_dict_with_special_keys(kw)
+        self._input_resolution(task, start)
+        return kw
+
+    def _run_task(self, task, parent_pid: Optional[str], kwargs: Dict[str, Any]):
+        """
+        Execute one task with resolved ``kwargs`` and return its tagged outputs.
+
+        Failed attempts are retried according to the task's error handlers and the
+        engine's ``retry_policy``; every attempt is a separate provenance process.
+        """
+        with self._task_metrics(task):
+            label_kind = "return" if self._is_graph_task(task) else "create"
+            executor = self._build_task_executor(task, label_kind=label_kind)
+            attempts = TaskAttempts(task, self.retry_policy)
+            while True:
+                try:
+                    return executor(parent_pid, attempts.meta, **kwargs)
+                except Exception as exc:
+                    retry = attempts.on_failure(exc)
+                    if retry is None:
+                        raise
+                    delay, overrides = retry
+                    kwargs = self._apply_input_overrides(task, kwargs, overrides)
+                    if delay:
+                        time.sleep(delay)
+
+    def _apply_input_overrides(
+        self, task, kwargs: Dict[str, Any], overrides: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Merge inputs returned by an error handler, tagged, into ``kwargs``.
+
+        Only the following attempts see them; the inputs of ``task`` are unchanged.
+        """
+        if not overrides:
+            return kwargs
+        return _merge_input_overrides(
+            task.inputs, kwargs, overrides, tag=self.tagging != "light"
+        )
+
     def _build_task_executor(self, task, label_kind: str):
         fn = self._unwrap_callable(task)
         is_graph = self._is_graph_task(task)
 
-        def _executor(parent_pid: Optional[str], **kwargs: Any) -> Dict[str, Any]:
-            pid: Optional[str] = None
+        def _executor(
+            parent_pid: Optional[str], meta: Dict[str, Any], **kwargs: Any
+        ) -> Dict[str, Any]:
             run_kwargs = dict(kwargs)
+            pid: Optional[str] = None
             if not is_graph:
-                pid = self.recorder.process_start(
-                    task_name=task.name,
-                    callable_obj=fn,
-                    flow_run_id=f"{self.engine_kind}:{self.name}",
-                    task_run_id=f"{self.engine_kind}:{task.name}",
-                    parent_pid=parent_pid,
-                )
-                self.recorder.record_inputs_payload(pid, run_kwargs)
+                pid = self._start_task_process(task, fn, parent_pid, run_kwargs)
+                if meta:
+                    self.recorder.set_process_meta(pid, **meta)
 
             try:
-                raw_kwargs = _resolve_tagged_value(run_kwargs)
+                raw_kwargs = self._raw_kwargs(run_kwargs)
                 if is_graph and fn is not None:
-                    res = fn(**run_kwargs)
+                    with self._phase("call"):
+                        res = fn(**run_kwargs)
                 elif fn is None:
                     res = dict(raw_kwargs)
                 else:
-                    res = fn(**raw_kwargs)
+                    key, hit, res = self._cache_lookup(task, pid, raw_kwargs)
+                    if not hit:
+                        with self._phase("call"):
+                            if _is_map_task(task):
+                                res = self._run_map(task, fn, raw_kwargs)
+                            else:
+                                res = self._invoke_callable(task, fn, raw_kwargs)
+                                res = self._stream_or_materialize(task, res, pid)
+                        self._cache_store(key, res)
 
-                tagged_out = self._normalize_outputs(task, res, strict=False)
-
-                if pid is not None:
-                    self.recorder.record_outputs_payload(
-                        pid, tagged_out, label_kind=label_kind
-                    )
-                    self.recorder.process_end(pid, state="FINISHED")
-
-                return tagged_out
+                return self._finish_task_process(task, pid, res, label_kind)
             except Exception as exc:
-                if pid is not None:
-                    self.recorder.process_end(pid, state="FAILED", error=str(exc))
+                self._fail_task_process(pid, exc)
                 raise
 
         return _executor
 
-    def _run_subgraph(self, task, sub_ng: Graph, parent_pid: Optional[str]) -> None:
-        LocalEngine(name=f"{self.name}::{task.name}", recorder=self.recorder).run(
-            sub_ng, parent_pid=parent_pid
+    def _start_task_process(
+        self, task, fn, parent_pid: Optional[str], kwargs: Dict[str, Any]
+    ) -> str:
+        """Open the provenance process of a task run and record its inputs."""
+        with self._phase("provenance"):
+            pid = self.recorder.process_start(
+                task_name=task.name,
+                callable_obj=fn,
+                flow_run_id=f"{self.engine_kind}:{self.name}",
+                task_run_id=f"{self.engine_kind}:{task.name}",
+                parent_pid=parent_pid,
+            )
+            self.recorder.record_inputs_payload(
+                pid, kwargs, namespaces=self._payload_namespaces(task.inputs)
+            )
+        return pid
+
+    def _finish_task_process(
+        self, task, pid: Optional[str], result: Any, label_kind: str
+    ) -> Dict[str, Any]:
+        """Parse and tag ``result`` and close the provenance process (if any)."""
+        tagged_out = self._normalize_outputs(task, result, strict=False)
+        if pid is not None:
+            with self._phase("provenance"):
+                self.recorder.record_outputs_payload(
+                    pid,
+                    tagged_out,
+                    label_kind=label_kind,
+                    namespaces=self._payload_namespaces(task.outputs),
+                )
+                # a streaming task ends with its stream (see ``_stream_or_materialize``)
+                if not isinstance(result, Stream):
+                    self.recorder.process_end(pid, state="FINISHED")
+        if self.spill is not None:
+            tagged_out = self._spill_outputs(task, tagged_out)
+            # the output sockets keep the placeholders instead of the values
+            _set_raw_socket_value(task.outputs, tagged_out)
+        return tagged_out
+
+    def _fail_task_process(self, pid: Optional[str], error: BaseException) -> None:
+        if pid is not None:
+            code = exit_code_of(error)
+            if code is not None:
+                self.recorder.set_process_meta(pid, exit_code=code)
+            self.recorder.process_end(pid, state="FAILED", error=str(error))
+
+    def _invoke_callable(self, task, fn, kwargs: Dict[str, Any]) -> Any:
+        """Call the task's python callable with plain (untagged) ``kwargs``."""
+        return fn(**kwargs)
+
+    def _run_map(self, task, fn, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a Map task: call ``fn`` once per source item, chunk by chunk."""
+        item_input, chunks, fixed = _map_plan(fn, kwargs, self._map_chunk_size)
+        return _gather_map_results(
+            self._map_chunks(task, fn, item_input, chunks, fixed)
         )
 
+    def _map_chunk_size(self, n_items: int) -> int:
+        return max(n_items, 1)
+
+    def _map_chunks(
+        self, task, fn, item_input: str, chunks: List[Chunk], kwargs: Dict[str, Any]
+    ) -> List[Chunk]:
+        return [_run_map_chunk(fn, item_input, chunk, kwargs) for chunk in chunks]
+
+    def _run_subgraph(self, task, sub_ng: Graph, parent_pid: Optional[str]) -> None:
+        LocalEngine(
+            name=f"{self.name}::{task.name}",
+            recorder=self.recorder,
+            cache=self.cache,
+            retry_policy=self.retry_policy,
+            tagging=self.tagging,
+            release_values=self.release_values,
+            spill=self.spill,
+            instrumentation=self.instrumentation,
+        ).run(sub_ng, parent_pid=parent_pid)
+
     def _get_active_graph_pid(self) -> Optional[str]:
         return self._graph_pid
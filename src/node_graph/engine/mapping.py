@@ -0,0 +1,56 @@
+from __future__ import annotations
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from node_graph.executor import RuntimeExecutor
+
+Chunk = List[Tuple[str, Any]]
+
+
+def _is_map_task(task) -> bool:
+    return str(getattr(task.spec, "task_type", "")).upper() == "MAP"
+
+
+def _map_plan(
+    fn: Callable, kwargs: Dict[str, Any], default_chunk_size: Callable[[int], int]
+) -> Tuple[str, List[Chunk], Dict[str, Any]]:
+    """
+    Split the resolved inputs of a Map task into ``(item_input, chunks, fixed_kwargs)``.
+
+    ``chunks`` are lists of ``(key, item)`` pairs in source order; when the task does
+    not set ``chunk_size``, ``default_chunk_size(n_items)`` decides.
+    """
+    items = list((kwargs.get("source") or {}).items())
+    item_input = kwargs.get("item_input") or next(
+        iter(inspect.signature(fn).parameters)
+    )
+    chunk_size = kwargs.get("chunk_size") or default_chunk_size(len(items))
+    chunk_size = max(1, int(chunk_size))
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    return item_input, chunks, dict(kwargs.get("kwargs") or {})
+
+
+def _run_map_chunk(
+    fn: Callable, item_input: str, chunk: Chunk, kwargs: Dict[str, Any]
+) -> Chunk:
+    return [(key, fn(**{item_input: item}, **kwargs)) for key, item in chunk]
+
+
+def _run_map_chunk_payload(
+    executor_data: Dict[str, Any],
+    item_input: str,
+    chunk: Chunk,
+    kwargs: Dict[str, Any],
+) -> Chunk:
+    """Worker-side entry point: rebuild the mapped callable and run one chunk."""
+    fn = RuntimeExecutor(**executor_data).callable
+    if hasattr(fn, "_callable"):
+        fn = getattr(fn, "_callable")
+    return _run_map_chunk(fn, item_input, chunk, kwargs)
+
+
+def _gather_map_results(chunks: List[Optional[Chunk]]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for chunk in chunks:
+        results.update(chunk)
+    return {"result": results}
@@ -0,0 +1,239 @@
+from __future__ import annotations
+import threading
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from node_graph import Graph
+from node_graph.config import BUILTIN_TASKS
+
+from .utils import _scan_links_topology, _streaming_tasks, _task_dependencies
+
+# how a LinkStep fills its input socket
+SOCKET, WHOLE, BUNDLE = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class LinkSource:
+    """One upstream output feeding a LinkStep."""
+
+    task: int
+    path: Tuple[str, ...]  # nested keys of the output socket, e.g. ("a", "b")
+    key: str  # name inside a fan-in bundle
+
+
+@dataclass(frozen=True)
+class LinkStep:
+    """Fill input socket ``to_socket`` of a task from one or more upstream outputs."""
+
+    to_socket: str
+    mode: int
+    sources: Tuple[LinkSource, ...]
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    Flattened, reusable schedule of a graph (without zones).
+
+    Tasks are addressed by integer ids (indexes into ``names``). ``steps[i]`` are the
+    link-resolution instructions of task ``i``, with ``_wait`` edges and property
+    inputs already dropped and socket names split into key paths; ``reads[i]`` are the
+    ``(task, top-level output socket)`` pairs they read, with ``None`` for a whole
+    output dict. A plan is only
+    valid for the ``version`` of the graph it was built from; use
+    :func:`execution_plan` to get the cached plan of a graph.
+    """
+
+    version: int
+    names: Tuple[str, ...]
+    ids: Dict[str, int]
+    order: Tuple[int, ...]
+    builtin: Tuple[bool, ...]
+    upstream: Tuple[Tuple[int, ...], ...]
+    downstream: Tuple[Tuple[int, ...], ...]
+    steps: Tuple[Tuple[LinkStep, ...], ...]
+    reads: Tuple[Tuple[Tuple[int, Optional[str]], ...], ...]
+    streaming: FrozenSet[str]
+
+    @classmethod
+    def build(cls, ng: Graph) -> "ExecutionPlan":
+        order, incoming, _required = _scan_links_topology(ng)
+        upstream, downstream = _task_dependencies(order, incoming)
+        names = tuple(order)
+        ids = {name: i for i, name in enumerate(names)}
+        steps = tuple(_link_steps(incoming.get(name, []), ids) for name in names)
+        return cls(
+            version=ng._version,
+            names=names,
+            ids=ids,
+            order=tuple(range(len(names))),
+            builtin=tuple(name in BUILTIN_TASKS for name in names),
+            upstream=tuple(
+                tuple(sorted(ids[n] for n in upstream[name])) for name in names
+            ),
+            downstream=tuple(
+                tuple(sorted(ids[n] for n in downstream[name])) for name in names
+            ),
+            steps=steps,
+            reads=tuple(_step_reads(task_steps) for task_steps in steps),
+            streaming=frozenset(_streaming_tasks(ng)),
+        )
+
+    def link_kwargs(
+        self,
+        task: Optional[int],
+        values: Dict[str, Dict[str, Any]],
+        bundle_factory: Callable[[Dict[str, Any]], Any],
+    ) -> Dict[str, Any]:
+        """Resolve the linked inputs of ``task`` from the upstream ``values``."""
+        if task is None:
+            return {}
+        names = self.names
+        kwargs: Dict[str, Any] = {}
+        for step in self.steps[task]:
+            if step.mode == WHOLE:
+                kwargs[step.to_socket] = values[names[step.sources[0].task]]
+            elif step.mode == SOCKET:
+                source = step.sources[0]
+                kwargs[step.to_socket] = _get_path(
+                    values[names[source.task]], source.path
+                )
+            else:
+                kwargs[step.to_socket] = bundle_factory(
+                    {
+                        source.key: _get_path(values[names[source.task]], source.path)
+                        for source in step.sources
+                    }
+                )
+        return kwargs
+
+
+def _link_steps(links, ids: Dict[str, int]) -> Tuple[LinkStep, ...]:
+    """Same semantics as ``_build_task_link_kwargs``, compiled once."""
+    grouped: Dict[str, List] = {}
+    for lk in links:
+        grouped.setdefault(lk.to_socket._scoped_name, []).append(lk)
+    steps: List[LinkStep] = []
+    for to_sock, lks in grouped.items():
+        if any(
+            lk.to_socket._metadata.extras.get("value_source") == "property"
+            for lk in lks
+        ):
+            continue
+        active = [lk for lk in lks if lk.from_socket._scoped_name != "_wait"]
+        if not active:
+            continue
+        if len(active) == 1:
+            lk = active[0]
+            from_sock = lk.from_socket._scoped_name
+            mode = WHOLE if from_sock == "_outputs" else SOCKET
+            source = LinkSource(
+                ids[lk.from_task.name], tuple(from_sock.split(".")), from_sock
+            )
+            steps.append(LinkStep(to_sock, mode, (source,)))
+            continue
+        sources = tuple(
+            LinkSource(
+                ids[lk.from_task.name],
+                tuple(lk.from_socket._scoped_name.split(".")),
+                f"{lk.from_task.name}_{lk.from_socket._scoped_name}",
+            )
+            for lk in active
+            if lk.from_socket._scoped_name != "_outputs"
+        )
+        if sources:
+            steps.append(LinkStep(to_sock, BUNDLE, sources))
+    return tuple(steps)
+
+
+def _step_reads(steps: Tuple[LinkStep, ...]) -> Tuple[Tuple[int, Optional[str]], ...]:
+    reads = (
+        (source.task, None if step.mode == WHOLE else source.path[0])
+        for step in steps
+        for source in step.sources
+    )
+    return tuple(dict.fromkeys(reads))
+
+
+def _get_path(value: Any, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+class ValueRelease:
+    """
+    Drops task outputs from the ``values`` of one run once no task still has to read
+    them, so peak memory follows the live outputs instead of all of them.
+
+    Reads are counted per ``(task, top-level output socket)``. Sockets nobody reads
+    are dropped when their task finishes; a read of the whole output dict keeps every
+    socket. Built-in tasks read at the end of the run, so outputs feeding
+    ``graph_outputs`` are always kept, as are the outputs of the tasks in ``keep``.
+    ``on_release(task_name, keys)`` is called with the output keys that were dropped.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        keep: Iterable[str] = (),
+        on_release: Optional[Callable[[str, List[str]], None]] = None,
+    ):
+        self._plan = plan
+        self._on_release = on_release
+        self._open: Dict[int, Counter] = {}
+        for tid in plan.order:
+            for producer, socket in plan.reads[tid]:
+                self._open.setdefault(producer, Counter())[socket] += 1
+        self._keep = {plan.ids[name] for name in keep if name in plan.ids}
+        self._keep.update(tid for tid in plan.order if plan.builtin[tid])
+
+    def done(self, tid: int, values: Dict[str, Dict[str, Any]]) -> None:
+        """Task ``tid`` has finished (or was skipped): release what it read."""
+        plan = self._plan
+        if plan.builtin[tid]:
+            return
+        for producer, socket in plan.reads[tid]:
+            self._open[producer][socket] -= 1
+        self._trim(tid, values)
+        for producer, _socket in plan.reads[tid]:
+            self._trim(producer, values)
+
+    def _trim(self, tid: int, values: Dict[str, Dict[str, Any]]) -> None:
+        if tid in self._keep:
+            return
+        name = self._plan.names[tid]
+        outputs = values.get(name)
+        if not isinstance(outputs, dict):
+            return
+        counts = self._open.get(tid)
+        if not counts or not any(counts.values()):
+            del values[name]
+            dropped = list(outputs)
+        elif not counts[None]:
+            dropped = [key for key in outputs if not counts[key]]
+            if dropped:
+                # a new dict: the old one may be shared with a cache or a previous run
+                values[name] = {k: v for k, v in outputs.items() if counts[k]}
+        else:
+            dropped = []
+        if dropped and self._on_release is not None:
+            self._on_release(name, dropped)
+
+
+_plans: "weakref.WeakKeyDictionary[Graph, ExecutionPlan]" = weakref.WeakKeyDictionary()
+_plans_lock = threading.Lock()
+
+
+def execution_plan(ng: Graph) -> ExecutionPlan:
+    """Return the plan of ``ng``, rebuilding it only when the graph has changed."""
+    with _plans_lock:
+        plan = _plans.get(ng)
+        if plan is None or plan.version != ng._version:
+            plan = ExecutionPlan.build(ng)
+            _plans[ng] = plan
+        return plan
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import inspect
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from node_graph import Graph
+from node_graph.executor import RuntimeExecutor
+from .cache import TaskCache
+from .checkpoint import CheckpointStore
+from .instrumentation import Instrumentation
+from .dataplane import DataPlane, export_values, import_values
+from .provenance import ProvenanceRecorder
+from .retry import RetryPolicy
+from .spill import SpillStore
+from .mapping import Chunk, _run_map_chunk_payload
+from .plan import ExecutionPlan
+from .thread_pool import ThreadPoolEngine
+
+
+def _run_executor_payload(
+    executor_data: Dict[str, Any],
+    kwargs: Dict[str, Any],
+    shared: Optional[Tuple[str, int]] = None,
+) -> Any:
+    """
+    Worker-side entry point: rebuild the callable from an executor dict
+    (module path or cloudpickle payload) and call it with plain kwargs.
+
+    With ``shared=(directory, threshold)`` (see ``DataPlane``), handles in ``kwargs``
+    are loaded and large results are written to ``directory`` and returned as handles.
+    """
+    fn = RuntimeExecutor(**executor_data).callable
+    if hasattr(fn, "_callable"):
+        fn = getattr(fn, "_callable")
+    if shared is not None:
+        kwargs = import_values(kwargs)
+    result = fn(**kwargs)
+    if inspect.isgenerator(result):
+        # generators cannot be sent back to the parent process
+        result = list(result)
+    if shared is not None:
+        result = export_values(result, *shared)
+    return result
+
+
+class ProcessPoolEngine(ThreadPoolEngine):
+    """
+    Runs CPU-bound tasks in parallel across cores.
+
+    Scheduling, input resolution, tagging and provenance stay in the parent process
+    (inherited from ``ThreadPoolEngine``). Only the call itself is shipped to a worker
+    process as ``(executor.to_dict(), untagged kwargs)``; the returned value is parsed
+    and re-tagged with ``TaggedValue`` in the parent so provenance edges are preserved.
+
+    Tasks without an executor and ``@task.graph`` tasks run in the parent process.
+    Arguments and return values must be picklable. Pass a ``DataPlane`` to send large
+    NumPy arrays and bytes through memory-mapped files instead of pickling them.
+    """
+
+    engine_kind = "process"
+
+    def __init__(
+        self,
+        name: str = "process-flow",
+        recorder: Optional[ProvenanceRecorder] = None,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+        cache: Optional[TaskCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        tagging: str = "proxy",
+        release_values: bool = False,
+        keep_values: Optional[Iterable[str]] = None,
+        spill: Optional[SpillStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        data_plane: Optional[DataPlane] = None,
+    ):
+        super().__init__(
+            name,
+            recorder,
+            max_workers=max_workers,
+            cache=cache,
+            retry_policy=retry_policy,
+            checkpoint=checkpoint,
+            tagging=tagging,
+            release_values=release_values,
+            keep_values=keep_values,
+            spill=spill,
+            instrumentation=instrumentation,
+        )
+        self.mp_context = mp_context
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.data_plane = data_plane
+        # data plane files held by each task's outputs, and its consumers still to run
+        self._shared_holds: Dict[str, List[str]] = {}
+        self._shared_consumers: Dict[int, int] = {}
+        self._shared_lock = threading.Lock()
+
+    def _run_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+        reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        if self._process_pool is not None:
+            # nested run sharing the pool (and data plane) of the outer engine
+            return self._run_pooled_graph(ng, parent_pid, reuse)
+        self._process_pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=self.mp_context
+        )
+        if self.data_plane is not None:
+            self.data_plane.open()
+        try:
+            return self._run_pooled_graph(ng, parent_pid, reuse)
+        finally:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+            if self.data_plane is not None:
+                self.data_plane.close()
+
+    def _run_pooled_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str],
+        reuse: Optional[Dict[str, Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        self._shared_holds = {}
+        self._shared_consumers = {}
+        try:
+            return super()._run_graph(ng, parent_pid=parent_pid, reuse=reuse)
+        finally:
+            # zone graphs and failed runs do not report every completed task
+            if self.data_plane is not None:
+                for paths in self._shared_holds.values():
+                    self.data_plane.release(paths)
+            self._shared_holds = {}
+
+    def _invoke_callable(self, task, fn, kwargs: Dict[str, Any]) -> Any:
+        executor = task.spec.executor
+        if executor is None:
+            return fn(**kwargs)
+        plane = self.data_plane
+        if plane is None:
+            future = self._process_pool.submit(
+                _run_executor_payload, executor.to_dict(), kwargs
+            )
+            return future.result()
+        kwargs, inputs = plane.export(kwargs)
+        try:
+            future = self._process_pool.submit(
+                _run_executor_payload, executor.to_dict(), kwargs, plane.worker_args
+            )
+            result, outputs = plane.adopt(future.result())
+        finally:
+            plane.release(inputs)
+        with self._shared_lock:
+            self._shared_holds.setdefault(task.name, []).extend(outputs)
+        return result
+
+    def _task_completed(self, plan: ExecutionPlan, tid: int) -> None:
+        if self.data_plane is None:
+            return
+        # outputs are released once the last task that consumes them has run
+        done = [] if plan.downstream[tid] else [tid]
+        for producer in plan.upstream[tid]:
+            left = self._shared_consumers.get(producer, len(plan.downstream[producer]))
+            self._shared_consumers[producer] = left - 1
+            if left == 1:
+                done.append(producer)
+        for producer in done:
+            with self._shared_lock:
+                paths = self._shared_holds.pop(plan.names[producer], [])
+            self.data_plane.release(paths)
+
+    def _map_chunk_size(self, n_items: int) -> int:
+        workers = self.max_workers or os.cpu_count() or 1
+        return max(1, math.ceil(n_items / (4 * workers)))
+
+    def _map_chunks(
+        self, task, fn, item_input: str, chunks: List[Chunk], kwargs: Dict[str, Any]
+    ) -> List[Chunk]:
+        executor = task.spec.executor
+        if executor is None:
+            return super()._map_chunks(task, fn, item_input, chunks, kwargs)
+        payload = executor.to_dict()
+        futures = [
+            self._process_pool.submit(
+                _run_map_chunk_payload, payload, item_input, chunk, kwargs
+            )
+            for chunk in chunks
+        ]
+        return [future.result() for future in futures]
+
+    def _run_subgraph(self, task, sub_ng: Graph, parent_pid: Optional[str]) -> None:
+        engine = self.__class__(
+            name=f"{self.name}::{task.name}",
+            recorder=self.recorder,
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            cache=self.cache,
+            retry_policy=self.retry_policy,
+            tagging=self.tagging,
+            release_values=self.release_values,
+            spill=self.spill,
+            instrumentation=self.instrumentation,
+            data_plane=self.data_plane,
+        )
+        engine._process_pool = self._process_pool
+        engine.run(sub_ng, parent_pid=parent_pid)
@@ -1,19 +1,55 @@
 from __future__ import annotations
 import json
+import queue
+import reprlib
+import threading
 import time
-from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Set, Tuple
 
 from node_graph.socket import TaggedValue
 from uuid import uuid4
 
-
-def _flatten_dict(payload: Any, prefix: str = "") -> Dict[str, Any]:
+from .provenance_store import (
+    DataNode,
+    Edge,
+    MemoryProvenanceStore,
+    ProcessNode,
+    ProvenanceStore,
+)
+from .spill import nbytes_of
+from .tagging import ValueIds
+
+DETAIL_LEVELS = ("off", "processes-only", "leaf-data", "full")
+# values stored as their own preview; anything else is previewed as text
+_PREVIEW_TYPES = (type(None), bool, int, float, complex, str, bytes)
+# a shallow repr: previews are recorded for every value, so they must stay cheap
+_repr = reprlib.Repr()
+_repr.maxlevel = 1
+_repr.maxdict = _repr.maxlist = _repr.maxtuple = _repr.maxset = 4
+
+
+def _safe_repr(value: Any) -> str:
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple):
+        # arrays and frames: printing the values is slow and says little
+        dtype = getattr(value, "dtype", None)
+        dtype = "" if dtype is None else f", dtype={dtype}"
+        return f"{type(value).__name__}(shape={shape}{dtype})"
+    try:
+        return _repr.repr(value)
+    except Exception:
+        return f"<{type(value).__name__}>"
+
+
+def _flatten_dict(
+    payload: Any, prefix: str = "", namespaces: Optional[AbstractSet[str]] = None
+) -> Dict[str, Any]:
     """
     Recursively flatten dict-like payloads into dotted keys.
     - If payload isn't a dict, returns {prefix or 'result': payload}.
     - For dicts, recurses depth-first; lists/tuples are recorded as whole values by default.
+    - If ``namespaces`` is given, only dicts at those dotted paths are flattened.
     """
     out: Dict[str, Any] = {}
     if isinstance(payload, TaggedValue):
@@ -26,56 +62,169 @@ def _flatten_dict(payload: Any, prefix: str = "") -> Dict[str, Any]:
         return out
     for k, v in payload.items():
         dotted = f"{prefix}.{k}" if prefix else str(k)
-        if isinstance(v, dict):
-            out.update(_flatten_dict(v, dotted))
+        if isinstance(v, dict) and (namespaces is None or dotted in namespaces):
+            out.update(_flatten_dict(v, dotted, namespaces))
         else:
             out[dotted] = v
     return out
 
 
-@dataclass
-class DataNode:
-    id: str
-    kind: str
-    preview: Optional[Any]
-    label: Optional[str] = None
-    size_hint: Optional[int] = None
-
+class ProvenanceRecorder:
+    """
+    Provenance of a workflow run, kept in a :class:`ProvenanceStore` (in memory by
+    default; pass e.g. a ``SqliteProvenanceStore`` to keep memory flat).
+    Records *runtime* flattened inputs/outputs (dotted keys), which supports dynamic namespaces.
 
-@dataclass
-class ProcessNode:
-    id: str
-    name: str
-    callable_path: Optional[str]
-    flow_run_id: Optional[str] = None
-    task_run_id: Optional[str] = None
-    start_time: Optional[float] = None
-    end_time: Optional[float] = None
-    state: Optional[str] = None
-    error: Optional[str] = None
-    meta: Dict[str, Any] = field(default_factory=dict)
-    kind: str = "task"
+    All recording methods are guarded by a re-entrant lock, so a single recorder can be
+    shared by engines that run tasks concurrently.
 
+    With ``background=True`` the recording methods only queue the raw event; a writer
+    thread flattens payloads, builds previews and writes to the store in batches of up
+    to ``batch_size`` events, off the task's critical path. Reading methods and
+    ``flush()`` wait for the queue to drain, and the end of a top-level graph process
+    is a flush barrier, so a finished run is fully recorded.
 
-@dataclass
-class Edge:
-    src: str
-    dst: str
-    label: Optional[str] = None
+    ``detail`` sets how much is recorded:
 
+    - ``"off"``: nothing;
+    - ``"processes-only"``: processes and their call edges, no data nodes;
+    - ``"leaf-data"`` (default): plus one data node per payload leaf, with ``str`` and
+      ``bytes`` previews truncated to ``preview_chars`` (``None`` = no limit) and the
+      byte size of arrays and bytes as ``size_hint``;
+    - ``"full"``: plus untruncated previews and a ``size_hint`` on every data node.
 
-class ProvenanceRecorder:
-    """
-    In-memory provenance store for one workflow run.
-    Records *runtime* flattened inputs/outputs (dotted keys), which supports dynamic namespaces.
+    ``sample_every=N`` records only one in N runs of the same flow (top-level graphs
+    with the same name); everything started inside a skipped run is skipped as well.
     """
 
-    def __init__(self, workflow_name: str):
+    def __init__(
+        self,
+        workflow_name: str,
+        store: Optional[ProvenanceStore] = None,
+        *,
+        background: bool = False,
+        batch_size: int = 256,
+        linger: float = 0.01,
+        detail: str = "leaf-data",
+        sample_every: int = 1,
+        preview_chars: Optional[int] = 256,
+    ):
+        if detail not in DETAIL_LEVELS:
+            raise ValueError(
+                f"Unknown provenance detail {detail!r}; expected one of {DETAIL_LEVELS}."
+            )
         self.workflow_name = workflow_name
-        self.process_nodes: Dict[str, ProcessNode] = {}
-        self.data_nodes: Dict[str, DataNode] = {}
-        self.edges: List[Edge] = []
-        self._latest_outputs_by_task: Dict[str, Dict[str, Any]] = {}
+        self.detail = detail
+        self.sample_every = max(1, int(sample_every))
+        self.preview_chars = preview_chars
+        self.store = store if store is not None else MemoryProvenanceStore()
+        self.background = background
+        self.batch_size = batch_size
+        self.linger = linger
+        self._lock = threading.RLock()
+        self._events: "queue.Queue[Tuple[Callable, tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._writer_error: Optional[BaseException] = None
+        self._root_graphs: Set[str] = set()
+        # processes of skipped (off / unsampled) runs, until they end
+        self._skipped: Set[str] = set()
+        self._run_counts: Dict[str, int] = {}
+        self._sample_lock = threading.Lock()
+        # data ids of untagged values (engines running with ``tagging="light"``)
+        self.value_ids = ValueIds()
+
+    @property
+    def process_nodes(self) -> Dict[str, ProcessNode]:
+        self._drain()
+        with self._lock:
+            return {p.id: p for p in self.store.iter_processes()}
+
+    @property
+    def data_nodes(self) -> Dict[str, DataNode]:
+        self._drain()
+        with self._lock:
+            return {d.id: d for d in self.store.iter_data()}
+
+    @property
+    def edges(self) -> List[Edge]:
+        self._drain()
+        with self._lock:
+            return list(self.store.iter_edges())
+
+    def ancestors(self, node_id: str) -> set:
+        """Ids of the processes and data nodes ``node_id`` was derived from."""
+        self._drain()
+        with self._lock:
+            return self.store.ancestors(node_id)
+
+    def processes_by_state(self, state: Optional[str]) -> List[ProcessNode]:
+        self._drain()
+        with self._lock:
+            return self.store.processes_by_state(state)
+
+    def processes_by_name(self, name: str) -> List[ProcessNode]:
+        self._drain()
+        with self._lock:
+            return self.store.processes_by_name(name)
+
+    def flush(self) -> None:
+        """Wait for queued events, then write buffered records to the store's backend."""
+        self._drain()
+        with self._lock:
+            self.store.flush()
+
+    def _submit(self, apply: Callable, *args: Any) -> None:
+        if not self.background:
+            with self._lock:
+                apply(*args)
+            return
+        with self._writer_lock:
+            self._events.put((apply, args))
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    name=f"provenance-{self.workflow_name}",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                batch = [self._events.get(timeout=1.0)]
+            except queue.Empty:
+                with self._writer_lock:
+                    if self._events.empty():
+                        # idle: exit, the next event starts a new writer
+                        self._writer = None
+                        return
+                continue
+            if self._events.qsize() < self.batch_size:
+                # let a batch build up instead of competing for the GIL per event
+                time.sleep(self.linger)
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                for apply, args in batch:
+                    try:
+                        apply(*args)
+                    except BaseException as exc:
+                        self._writer_error = self._writer_error or exc
+            for _ in batch:
+                self._events.task_done()
+
+    def _drain(self) -> None:
+        """Wait until the writer has applied every queued event."""
+        if not self.background:
+            return
+        self._events.join()
+        error, self._writer_error = self._writer_error, None
+        if error is not None:
+            raise RuntimeError("Recording provenance failed.") from error
 
     def process_start(
         self,
@@ -88,6 +237,9 @@ class ProvenanceRecorder:
         parent_pid: Optional[str] = None,
     ) -> str:
         pid = f"proc:{uuid4().hex}"
+        if not self._should_record(task_name, kind, parent_pid):
+            self._skipped.add(pid)
+            return pid
         callable_path = None
         if callable_obj is not None:
             mod = getattr(callable_obj, "__module__", None)
@@ -96,7 +248,7 @@ class ProvenanceRecorder:
             )
             if mod and name:
                 callable_path = f"{mod}.{name}"
-        self.process_nodes[pid] = ProcessNode(
+        node = ProcessNode(
             id=pid,
             name=task_name,
             callable_path=callable_path,
@@ -105,87 +257,146 @@ class ProvenanceRecorder:
             start_time=time.time(),
             kind=kind,
         )
-        if parent_pid is not None and parent_pid in self.process_nodes:
-            self.edges.append(Edge(src=parent_pid, dst=pid, label="call"))
+        if kind == "graph" and parent_pid is None:
+            self._root_graphs.add(pid)
+        self._submit(self._apply_start, node, parent_pid)
         return pid
 
+    def _should_record(
+        self, task_name: str, kind: str, parent_pid: Optional[str]
+    ) -> bool:
+        if self.detail == "off":
+            return False
+        if parent_pid is not None:
+            return parent_pid not in self._skipped
+        if kind != "graph" or self.sample_every == 1:
+            return True
+        with self._sample_lock:
+            count = self._run_counts.get(task_name, 0)
+            self._run_counts[task_name] = count + 1
+        return count % self.sample_every == 0
+
+    def _apply_start(self, node: ProcessNode, parent_pid: Optional[str]) -> None:
+        self.store.add_process(node)
+        if parent_pid is not None and self.store.get_process(parent_pid):
+            self.store.add_edge(Edge(src=parent_pid, dst=node.id, label="call"))
+
     def process_end(self, pid: str, state: str, error: Optional[str] = None):
-        pn = self.process_nodes[pid]
-        pn.end_time = time.time()
-        pn.state = state
-        pn.error = error
+        if pid in self._skipped:
+            self._skipped.discard(pid)
+            return
+        self._submit(self.store.end_process, pid, time.time(), state, error)
+        if pid in self._root_graphs:
+            self._root_graphs.discard(pid)
+            self.flush()
+            if not self._root_graphs:
+                self.value_ids.clear()
+
+    def set_process_meta(self, pid: str, **meta: Any) -> None:
+        """Attach extra runtime information (e.g. ``cached=True``) to a process node."""
+        if pid in self._skipped:
+            return
+        self._submit(self.store.update_meta, pid, dict(meta))
 
     def record_inputs_payload(
         self,
         pid: str,
         kwargs: Dict[str, Any],
+        namespaces: Optional[AbstractSet[str]] = None,
     ):
         """
         Flatten kwargs to dotted keys at runtime (supports dynamic namespaces),
         then record one DataNode per leaf and an edge data->process per key.
+        ``namespaces`` limits flattening to those paths (see ``_flatten_dict``).
         """
-        flat = _flatten_dict(kwargs)
-        self._record_inputs_flat(pid, flat)
+        if pid in self._skipped or self.detail == "processes-only":
+            return
+        self._submit(self._apply_inputs, pid, kwargs, namespaces)
+
+    def _apply_inputs(
+        self,
+        pid: str,
+        kwargs: Dict[str, Any],
+        namespaces: Optional[AbstractSet[str]] = None,
+    ) -> None:
+        self._record_inputs_flat(pid, _flatten_dict(kwargs, namespaces=namespaces))
 
     def _record_inputs_flat(self, pid: str, kwargs_flat: Dict[str, Any]):
         for k, v in kwargs_flat.items():
-            uuid = v._uuid
-            did = f"data:{uuid}"
-            if did not in self.data_nodes:
-                preview = v
-                try:
-                    if isinstance(v, (str, bytes)) and len(v) > 256:
-                        preview = f"{v[:256]}... (+{len(v)-256} chars)"
-                except Exception:
-                    pass
-                self.data_nodes[did] = DataNode(
-                    id=did,
-                    kind="input",
-                    label=type(v.__wrapped__).__name__,
-                    preview=preview,
-                )
-            self.edges.append(Edge(src=did, dst=pid, label=f"input:{k}"))
+            did = f"data:{self._data_id(v)}"
+            if not self.store.has_data(did):
+                self.store.add_data(self._data_node(did, "input", v))
+            self.store.add_edge(Edge(src=did, dst=pid, label=f"input:{k}"))
 
     def record_outputs_payload(
         self,
         pid: str,
         outputs: Dict[str, Any],
         label_kind: str = "output",
+        namespaces: Optional[AbstractSet[str]] = None,
     ):
-        flat = _flatten_dict(outputs)
-        proc = self.process_nodes.get(pid)
-        if proc is not None:
-            self._latest_outputs_by_task[proc.name] = outputs
+        if pid in self._skipped or self.detail == "processes-only":
+            return
+        self._submit(self._apply_outputs, pid, outputs, label_kind, namespaces)
+
+    def _apply_outputs(
+        self,
+        pid: str,
+        outputs: Dict[str, Any],
+        label_kind: str = "output",
+        namespaces: Optional[AbstractSet[str]] = None,
+    ) -> None:
+        flat = _flatten_dict(outputs, namespaces=namespaces)
         self._record_outputs_flat(pid, flat, label_kind)
 
     def _record_outputs_flat(
         self, pid: str, outputs_flat: Dict[str, Any], label_kind: str = "output"
     ):
         for k, v in outputs_flat.items():
-            uuid = v._uuid
-            did = f"data:{uuid}"
-            if did not in self.data_nodes:
-                preview = v
-                try:
-                    if isinstance(v, (str, bytes)) and len(v) > 256:
-                        preview = f"{v[:256]}... (+{len(v)-256} chars)"
-                except Exception:
-                    pass
-                self.data_nodes[did] = DataNode(
-                    id=did,
-                    kind="output",
-                    label=type(v.__wrapped__).__name__,
-                    preview=preview,
-                )
-            self.edges.append(Edge(src=pid, dst=did, label=f"{label_kind}:{k}"))
+            did = f"data:{self._data_id(v)}"
+            if not self.store.has_data(did):
+                self.store.add_data(self._data_node(did, "output", v))
+            self.store.add_edge(Edge(src=pid, dst=did, label=f"{label_kind}:{k}"))
+
+    def _data_id(self, value: Any) -> str:
+        if isinstance(value, TaggedValue):
+            return value._uuid
+        return self.value_ids.id_of(value)
+
+    def _data_node(self, did: str, kind: str, value: Any) -> DataNode:
+        raw = getattr(value, "__wrapped__", value)
+        # previews never hold on to the value itself, so it can be freed after the run
+        size_hint = nbytes_of(raw)
+        limit = None if self.detail == "full" else self.preview_chars
+        if isinstance(raw, _PREVIEW_TYPES):
+            preview = raw
+        else:
+            preview = str(raw) if limit is None else _safe_repr(raw)
+        try:
+            if limit is not None and isinstance(preview, (str, bytes)):
+                if len(preview) > limit:
+                    preview = f"{preview[:limit]}... (+{len(preview)-limit} chars)"
+            if self.detail == "full" and size_hint is None:
+                size_hint = len(value) if hasattr(value, "__len__") else None
+        except Exception:
+            pass
+        return DataNode(
+            id=did,
+            kind=kind,
+            label=type(raw).__name__,
+            preview=preview,
+            size_hint=size_hint,
+        )
 
     def to_json(self) -> dict:
-        return {
-            "workflow": self.workflow_name,
-            "process_nodes": {k: vars(v) for k, v in self.process_nodes.items()},
-            "data_nodes": {k: vars(v) for k, v in self.data_nodes.items()},
-            "edges": [vars(e) for e in self.edges],
-        }
+        self._drain()
+        with self._lock:
+            return {
+                "workflow": self.workflow_name,
+                "process_nodes": {p.id: vars(p) for p in self.store.iter_processes()},
+                "data_nodes": {d.id: vars(d) for d in self.store.iter_data()},
+                "edges": [vars(e) for e in self.store.iter_edges()],
+            }
 
     def save_json(self, path: str):
         with open(path, "w") as f:
@@ -0,0 +1,392 @@
+from __future__ import annotations
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+
+@dataclass
+class DataNode:
+    id: str
+    kind: str
+    preview: Optional[Any]
+    label: Optional[str] = None
+    size_hint: Optional[int] = None
+
+
+@dataclass
+class ProcessNode:
+    id: str
+    name: str
+    callable_path: Optional[str]
+    flow_run_id: Optional[str] = None
+    task_run_id: Optional[str] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    state: Optional[str] = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    kind: str = "task"
+
+
+@dataclass
+class Edge:
+    src: str
+    dst: str
+    label: Optional[str] = None
+
+
+class ProvenanceStore(ABC):
+    """
+    Storage backend of a :class:`ProvenanceRecorder`.
+
+    The recorder serializes access with its own lock, so implementations need not be
+    thread-safe. Processes are added when they start and updated while they run
+    (``end_process``, ``update_meta``); data nodes and edges are append-only.
+    """
+
+    @abstractmethod
+    def add_process(self, node: ProcessNode) -> None:
+        """Store a newly started process."""
+
+    @abstractmethod
+    def get_process(self, pid: str) -> Optional[ProcessNode]:
+        """Return the process ``pid``, or ``None``."""
+
+    @abstractmethod
+    def end_process(
+        self, pid: str, end_time: float, state: str, error: Optional[str]
+    ) -> None:
+        """Mark process ``pid`` as finished."""
+
+    @abstractmethod
+    def update_meta(self, pid: str, meta: Dict[str, Any]) -> None:
+        """Merge ``meta`` into the meta of process ``pid``."""
+
+    @abstractmethod
+    def has_data(self, did: str) -> bool:
+        """True if the data node ``did`` is already stored."""
+
+    @abstractmethod
+    def add_data(self, node: DataNode) -> None:
+        """Store a data node."""
+
+    @abstractmethod
+    def add_edge(self, edge: Edge) -> None:
+        """Store an edge."""
+
+    @abstractmethod
+    def iter_processes(self) -> Iterator[ProcessNode]:
+        """All processes, in start order."""
+
+    @abstractmethod
+    def iter_data(self) -> Iterator[DataNode]:
+        """All data nodes."""
+
+    @abstractmethod
+    def iter_edges(self) -> Iterator[Edge]:
+        """All edges, in insertion order."""
+
+    def processes_by_state(self, state: Optional[str]) -> List[ProcessNode]:
+        """Processes currently in ``state`` (``None`` for processes still running)."""
+        return [p for p in self.iter_processes() if p.state == state]
+
+    def processes_by_name(self, name: str) -> List[ProcessNode]:
+        """Processes of the task ``name``."""
+        return [p for p in self.iter_processes() if p.name == name]
+
+    def ancestors(self, node_id: str) -> Set[str]:
+        """
+        Ids of all processes and data nodes that ``node_id`` was derived from, following
+        input/output edges backwards (``call`` edges are not lineage).
+        """
+        incoming: Dict[str, List[str]] = {}
+        for edge in self.iter_edges():
+            if edge.label != "call":
+                incoming.setdefault(edge.dst, []).append(edge.src)
+        found: Set[str] = set()
+        stack = [node_id]
+        while stack:
+            for src in incoming.get(stack.pop(), []):
+                if src not in found:
+                    found.add(src)
+                    stack.append(src)
+        return found
+
+    def flush(self) -> None:
+        """Write buffered records to the backend."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
+
+
+class MemoryProvenanceStore(ProvenanceStore):
+    """Keeps all records in dicts and lists for the life of the store (the default)."""
+
+    def __init__(self):
+        self.process_nodes: Dict[str, ProcessNode] = {}
+        self.data_nodes: Dict[str, DataNode] = {}
+        self.edges: List[Edge] = []
+
+    def add_process(self, node: ProcessNode) -> None:
+        self.process_nodes[node.id] = node
+
+    def get_process(self, pid: str) -> Optional[ProcessNode]:
+        return self.process_nodes.get(pid)
+
+    def end_process(
+        self, pid: str, end_time: float, state: str, error: Optional[str]
+    ) -> None:
+        pn = self.process_nodes[pid]
+        pn.end_time = end_time
+        pn.state = state
+        pn.error = error
+
+    def update_meta(self, pid: str, meta: Dict[str, Any]) -> None:
+        self.process_nodes[pid].meta.update(meta)
+
+    def has_data(self, did: str) -> bool:
+        return did in self.data_nodes
+
+    def add_data(self, node: DataNode) -> None:
+        self.data_nodes[node.id] = node
+
+    def add_edge(self, edge: Edge) -> None:
+        self.edges.append(edge)
+
+    def iter_processes(self) -> Iterator[ProcessNode]:
+        return iter(self.process_nodes.values())
+
+    def iter_data(self) -> Iterator[DataNode]:
+        return iter(self.data_nodes.values())
+
+    def iter_edges(self) -> Iterator[Edge]:
+        return iter(self.edges)
+
+
+_PROCESS_COLUMNS = [f.name for f in fields(ProcessNode)]
+_DATA_COLUMNS = [f.name for f in fields(DataNode)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL, name TEXT, callable_path TEXT, flow_run_id TEXT,
+    task_run_id TEXT, start_time REAL, end_time REAL, state TEXT, error TEXT,
+    meta TEXT, kind TEXT
+);
+CREATE INDEX IF NOT EXISTS processes_name ON processes (name);
+CREATE INDEX IF NOT EXISTS processes_state ON processes (state);
+CREATE TABLE IF NOT EXISTS data (
+    id TEXT PRIMARY KEY, kind TEXT, preview TEXT, label TEXT, size_hint INTEGER
+);
+CREATE TABLE IF NOT EXISTS edges (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT, src TEXT, dst TEXT, label TEXT
+);
+CREATE INDEX IF NOT EXISTS edges_src ON edges (src);
+CREATE INDEX IF NOT EXISTS edges_dst ON edges (dst);
+"""
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """JSON for plain values, ``str()`` for anything else (previews are for humans)."""
+    if value is None:
+        return None
+    value = getattr(value, "__wrapped__", value)
+    try:
+        return json.dumps(value)
+    except (TypeError, ValueError):
+        return json.dumps(str(value))
+
+
+class SqliteProvenanceStore(ProvenanceStore):
+    """
+    Provenance in a SQLite file, so lineage of long-lived services does not grow in
+    memory.
+
+    Running processes stay in memory until they end; finished processes, data nodes
+    and edges are buffered and written in one transaction every ``batch_size``
+    records, and whenever a graph process ends. Processes are indexed by id, task
+    name and state, data nodes by id, and edges by both endpoints. Previews are
+    stored as text.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 1000):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._running: Dict[str, ProcessNode] = {}
+        self._processes: List[ProcessNode] = []
+        self._data: Dict[str, DataNode] = {}
+        self._edges: List[Edge] = []
+
+    def _pending(self) -> int:
+        return len(self._processes) + len(self._data) + len(self._edges)
+
+    def _maybe_flush(self) -> None:
+        if self._pending() >= self.batch_size:
+            self.flush()
+
+    def add_process(self, node: ProcessNode) -> None:
+        self._running[node.id] = node
+
+    def get_process(self, pid: str) -> Optional[ProcessNode]:
+        if pid in self._running:
+            return self._running[pid]
+        for node in self._processes:
+            if node.id == pid:
+                return node
+        row = self._conn.execute(
+            f"SELECT {', '.join(_PROCESS_COLUMNS)} FROM processes WHERE id = ?", (pid,)
+        ).fetchone()
+        return None if row is None else self._process_from_row(row)
+
+    def end_process(
+        self, pid: str, end_time: float, state: str, error: Optional[str]
+    ) -> None:
+        node = self._running.pop(pid, None)
+        if node is None:
+            # ended again (e.g. a retried zone); update in place
+            self.flush()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE processes SET end_time = ?, state = ?, error = ? WHERE id = ?",
+                    (end_time, state, error, pid),
+                )
+            return
+        node.end_time, node.state, node.error = end_time, state, error
+        self._processes.append(node)
+        if node.kind == "graph":
+            self.flush()
+        else:
+            self._maybe_flush()
+
+    def update_meta(self, pid: str, meta: Dict[str, Any]) -> None:
+        buffered = pid in self._running or any(p.id == pid for p in self._processes)
+        node = self.get_process(pid)
+        node.meta.update(meta)
+        if not buffered:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE processes SET meta = ? WHERE id = ?",
+                    (json.dumps(node.meta, default=str), pid),
+                )
+
+    def has_data(self, did: str) -> bool:
+        if did in self._data:
+            return True
+        row = self._conn.execute("SELECT 1 FROM data WHERE id = ?", (did,)).fetchone()
+        return row is not None
+
+    def add_data(self, node: DataNode) -> None:
+        self._data[node.id] = node
+        self._maybe_flush()
+
+    def add_edge(self, edge: Edge) -> None:
+        self._edges.append(edge)
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        if not self._pending():
+            return
+        processes, self._processes = self._processes, []
+        data, self._data = self._data, {}
+        edges, self._edges = self._edges, []
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO processes ({', '.join(_PROCESS_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_PROCESS_COLUMNS))})",
+                [self._process_to_row(p) for p in processes],
+            )
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO data ({', '.join(_DATA_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_DATA_COLUMNS))})",
+                [
+                    (d.id, d.kind, _to_text(d.preview), d.label, d.size_hint)
+                    for d in data.values()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO edges (src, dst, label) VALUES (?, ?, ?)",
+                [(e.src, e.dst, e.label) for e in edges],
+            )
+
+    def iter_processes(self) -> Iterator[ProcessNode]:
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_PROCESS_COLUMNS)} FROM processes ORDER BY seq"
+        ).fetchall()
+        yield from (self._process_from_row(row) for row in rows)
+        yield from list(self._running.values())
+
+    def iter_data(self) -> Iterator[DataNode]:
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_DATA_COLUMNS)} FROM data"
+        ).fetchall()
+        for did, kind, preview, label, size_hint in rows:
+            preview = None if preview is None else json.loads(preview)
+            yield DataNode(did, kind, preview, label, size_hint)
+
+    def iter_edges(self) -> Iterator[Edge]:
+        self.flush()
+        rows = self._conn.execute(
+            "SELECT src, dst, label FROM edges ORDER BY seq"
+        ).fetchall()
+        yield from (Edge(*row) for row in rows)
+
+    def processes_by_state(self, state: Optional[str]) -> List[ProcessNode]:
+        if state is None:
+            return list(self._running.values())
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_PROCESS_COLUMNS)} FROM processes "
+            "WHERE state = ? ORDER BY seq",
+            (state,),
+        ).fetchall()
+        return [self._process_from_row(row) for row in rows]
+
+    def processes_by_name(self, name: str) -> List[ProcessNode]:
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_PROCESS_COLUMNS)} FROM processes "
+            "WHERE name = ? ORDER BY seq",
+            (name,),
+        ).fetchall()
+        running = [p for p in self._running.values() if p.name == name]
+        return [self._process_from_row(row) for row in rows] + running
+
+    def ancestors(self, node_id: str) -> Set[str]:
+        self.flush()
+        rows = self._conn.execute(
+            """
+            WITH RECURSIVE lineage(id) AS (
+                SELECT src FROM edges WHERE dst = ? AND IFNULL(label, '') != 'call'
+                UNION
+                SELECT edges.src FROM edges JOIN lineage ON edges.dst = lineage.id
+                WHERE IFNULL(edges.label, '') != 'call'
+            )
+            SELECT id FROM lineage
+            """,
+            (node_id,),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    @staticmethod
+    def _process_to_row(node: ProcessNode) -> tuple:
+        values = dict(vars(node), meta=json.dumps(node.meta, default=str))
+        return tuple(values[name] for name in _PROCESS_COLUMNS)
+
+    @staticmethod
+    def _process_from_row(row) -> ProcessNode:
+        values = dict(zip(_PROCESS_COLUMNS, row))
+        values["meta"] = json.loads(values["meta"]) if values["meta"] else {}
+        return ProcessNode(**values)
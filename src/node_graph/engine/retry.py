@@ -0,0 +1,111 @@
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Type
+
+from node_graph.error_handler import ErrorHandlerSpec
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Engine-wide retry of failed tasks with exponential backoff.
+
+    A task that raises one of ``retry_on`` is retried up to ``max_retries`` times; the
+    n-th retry waits ``min(delay * backoff ** (n - 1), max_delay)`` seconds, stretched
+    by a random factor of up to ``jitter`` so that many failing tasks do not retry in
+    lock-step.
+    """
+
+    max_retries: int = 0
+    delay: float = 1.0
+    backoff: float = 2.0
+    max_delay: float = 60.0
+    jitter: float = 0.1
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def delay_for(self, retry: int) -> float:
+        """Seconds to wait before the ``retry``-th retry (1-based)."""
+        delay = min(self.delay * self.backoff ** (retry - 1), self.max_delay)
+        return delay * (1 + random.uniform(0, self.jitter))
+
+
+def exit_code_of(error: BaseException) -> Optional[int]:
+    """Integer exit code carried by ``error`` (``exit_code`` or ``returncode``), if any."""
+    for attr in ("exit_code", "returncode"):
+        code = getattr(error, attr, None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def _call_error_handler(handler: ErrorHandlerSpec, task) -> Any:
+    fn = handler.executor.callable
+    if hasattr(fn, "_callable"):
+        fn = getattr(fn, "_callable")
+    return fn(task, **(handler.kwargs or {}))
+
+
+class TaskAttempts:
+    """
+    Attempt bookkeeping for one task run.
+
+    On a failure, the first error handler of the task whose ``exit_codes`` match the
+    error (an empty list matches any error) and that has retries left is called with
+    ``handler(task, **handler.kwargs)``; it may return a dict of input overrides for the
+    following attempts. The handler's ``retry`` counts applications that already
+    happened against its ``max_retries``. Without a matching handler, the engine's
+    ``RetryPolicy`` decides whether to retry.
+
+    Both kinds of retry wait the backoff delay of the engine's ``RetryPolicy``; without
+    a policy, handler retries start immediately.
+    """
+
+    def __init__(self, task, policy: Optional[RetryPolicy] = None):
+        self.task = task
+        self._handler_policy = policy
+        self.policy = policy or RetryPolicy()
+        self.number = 1
+        self.reason: Optional[str] = None
+        self._handler_retries: Dict[str, int] = {}
+        self._policy_retries = 0
+
+    def on_failure(
+        self, error: BaseException
+    ) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return ``(delay, input_overrides)`` for the next attempt, or ``None`` to give up."""
+        if not isinstance(error, Exception):
+            return None
+        code = exit_code_of(error)
+        for name, handler in self.task.get_error_handlers().items():
+            if handler.exit_codes and code not in handler.exit_codes:
+                continue
+            used = self._handler_retries.get(name, handler.retry)
+            if used >= handler.max_retries:
+                continue
+            self._handler_retries[name] = used + 1
+            overrides = _call_error_handler(handler, self.task)
+            self._advance(name)
+            delay = 0.0
+            if self._handler_policy is not None:
+                delay = self._handler_policy.delay_for(used + 1)
+            return delay, dict(overrides or {})
+
+        if isinstance(error, self.policy.retry_on) and (
+            self._policy_retries < self.policy.max_retries
+        ):
+            self._policy_retries += 1
+            self._advance("retry")
+            return self.policy.delay_for(self._policy_retries), {}
+        return None
+
+    def _advance(self, reason: str) -> None:
+        self.number += 1
+        self.reason = reason
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Provenance metadata of the current attempt (empty for the first one)."""
+        if self.number == 1:
+            return {}
+        return {"attempt": self.number, "retry_reason": self.reason}
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+# out-of-band buffers are aligned so that mapped arrays keep their natural alignment
+_ALIGN = 64
+
+
+def nbytes_of(value: Any) -> Optional[int]:
+    """Size of the data held by ``value``, when it is cheap to know (else None)."""
+    value = getattr(value, "__wrapped__", value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    size = getattr(value, "nbytes", None)
+    return size if isinstance(size, int) else None
+
+
+class Spilled:
+    """
+    Placeholder for a task output that a ``SpillStore`` wrote to disk.
+
+    ``load()`` reads it back: arrays as a copy-on-write memory map, other objects by
+    unpickling with their out-of-band buffers mapped from the file. The file is
+    removed when the placeholder is garbage collected.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        nbytes: int,
+        buffers: Optional[List[Tuple[int, int]]] = None,
+        payload: int = 0,
+    ):
+        self.path = path
+        self.nbytes = nbytes
+        # pickled objects: (offset, length) of each out-of-band buffer, then the pickle
+        self.buffers = buffers
+        self.payload = payload
+        # tag of the original value, so a reloaded value keeps its provenance id
+        self.uuid: Optional[str] = None
+        self.socket: Any = None
+        self.data_id: Optional[str] = None
+        weakref.finalize(self, _remove, path)
+
+    def load(self) -> Any:
+        if self.buffers is None:
+            return np.load(self.path, mmap_mode="c").view(np.ndarray)
+        with open(self.path, "rb") as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        buffers = [view[offset : offset + size] for offset, size in self.buffers]
+        return pickle.loads(view[self.payload :], buffers=buffers)
+
+    def __reduce__(self):
+        # pickling (e.g. for a checkpoint) stores the value, not the placeholder
+        return _identity, (self.load(),)
+
+    def __deepcopy__(self, memo) -> "Spilled":
+        # the file is never written again, so copies can share it
+        return self
+
+    def __repr__(self) -> str:
+        return f"Spilled({self.path!r}, nbytes={self.nbytes})"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpillStore:
+    """
+    Writes task outputs of at least ``threshold`` bytes to a spill directory.
+
+    Only values whose size is known without serializing them are considered: NumPy
+    arrays, bytes, and objects with an integer ``nbytes``. Arrays are written with
+    ``np.save``; other objects with pickle protocol 5, their out-of-band buffers
+    stored unpickled in the same file so they can be memory-mapped on load. The files
+    live in a temporary directory below ``directory`` that is removed with the store.
+    """
+
+    def __init__(self, threshold: int = 256 << 20, directory: Optional[str] = None):
+        self.threshold = threshold
+        self.directory = directory
+        self._dir: Optional[str] = None
+
+    def should_spill(self, value: Any) -> bool:
+        size = nbytes_of(value)
+        return size is not None and size >= self.threshold
+
+    def spill(self, value: Any) -> Spilled:
+        """Write ``value`` (untagged) to a new file and return its placeholder."""
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix="node-graph-spill-", dir=self.directory)
+            weakref.finalize(self, shutil.rmtree, self._dir, True)
+        nbytes = nbytes_of(value) or 0
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            fd, path = tempfile.mkstemp(dir=self._dir, suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value, allow_pickle=False)
+            return Spilled(path, nbytes)
+        fd, path = tempfile.mkstemp(dir=self._dir, suffix=".pkl")
+        with os.fdopen(fd, "wb") as f:
+            buffers, payload = _write_pickle(f, value)
+        return Spilled(path, nbytes, buffers=buffers, payload=payload)
+
+
+def _write_pickle(f, value: Any) -> Tuple[List[Tuple[int, int]], int]:
+    raw_buffers: List[memoryview] = []
+    try:
+        data = pickle.dumps(
+            value, protocol=5, buffer_callback=lambda b: raw_buffers.append(b.raw())
+        )
+    except BufferError:
+        # a non-contiguous buffer: fall back to an in-band pickle
+        raw_buffers = []
+        data = pickle.dumps(value, protocol=5)
+    offsets: List[Tuple[int, int]] = []
+    position = 0
+    for buf in raw_buffers:
+        position += -position % _ALIGN
+        f.seek(position)
+        f.write(buf)
+        offsets.append((position, buf.nbytes))
+        position += buf.nbytes
+    f.seek(position)
+    f.write(data)
+    return offsets, position
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Stream:
+    """
+    Iterable over the items yielded by a generator task.
+
+    The engine passes a Stream instead of the materialized list when the producing
+    task has exactly one consumer, so the consumer starts on the first item while the
+    producer is still yielding. By default items are pulled lazily on the consumer's
+    thread; after ``start()`` they are produced on a background thread into a queue
+    holding at most ``maxsize`` items, which blocks the producer when the consumer
+    falls behind. A Stream can be iterated only once.
+
+    ``on_end`` is called once when the stream ends: with ``None`` when the generator
+    was exhausted or the stream closed, or with the error the generator raised.
+    """
+
+    def __init__(
+        self,
+        generator: Iterator[Any],
+        maxsize: int = 64,
+        name: str = "",
+        on_end: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ):
+        self._generator = generator
+        self.maxsize = maxsize
+        self.name = name
+        self._on_end = on_end
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._consumed = False
+        self._closed = threading.Event()
+
+    def start(self) -> "Stream":
+        """Produce items on a background thread into the bounded queue."""
+        if self._thread is None:
+            self._queue = queue.Queue(self.maxsize)
+            self._thread = threading.Thread(
+                target=self._pump, name=f"stream-{self.name}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _pump(self) -> None:
+        try:
+            for item in self._generator:
+                if not self._put(item):
+                    return
+            self._put(_DONE)
+        except BaseException as exc:
+            self._put(_Failure(exc))
+
+    def _put(self, item: Any) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._consumed:
+            raise RuntimeError(f"Stream of task {self.name!r} was already consumed.")
+        self._consumed = True
+        return self._iter_items()
+
+    def _iter_items(self) -> Iterator[Any]:
+        error: Optional[BaseException] = None
+        try:
+            if self._thread is None:
+                yield from self._generator
+                return
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        except GeneratorExit:
+            # the consumer stopped early
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self.close(error)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Stop producing; a producer blocked on the full queue exits."""
+        self._closed.set()
+        if self._thread is None and hasattr(self._generator, "close"):
+            self._generator.close()
+        on_end, self._on_end = self._on_end, None
+        if on_end is not None:
+            on_end(error)
+
+    def __repr__(self) -> str:
+        return f"Stream(task={self.name!r}, maxsize={self.maxsize})"
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import itertools
+import weakref
+from typing import Any, Dict, FrozenSet, Tuple
+from uuid import uuid4
+
+from node_graph.socket import TaskSocketNamespace
+
+# how engines track the identity of the values flowing through a graph
+TAGGING_MODES = ("proxy", "light")
+
+
+class ValueIds:
+    """
+    Identity side table used by ``tagging="light"``: values stay unwrapped and get a
+    data id the first time they are seen, keyed by ``id(value)``.
+
+    Ids are a random per-table prefix plus a counter, so they are unique across
+    tables without a ``uuid4()`` per value. An entry lives as long as its value: it is
+    dropped by a weak reference callback, or, for types without weak references, the
+    table keeps the value alive until it is cleared, so an ``id()`` is never reused
+    while numbered. Because identity is by object, the same object (e.g. a small int
+    interned by Python) passed to several tasks is one data node.
+    """
+
+    def __init__(self):
+        self._prefix = uuid4().hex[:12]
+        self._counter = itertools.count()
+        self._ids: Dict[int, Tuple[str, Any]] = {}
+
+    def id_of(self, value: Any) -> str:
+        key = id(value)
+        entry = self._ids.get(key)
+        if entry is None:
+            try:
+                ref = weakref.ref(value, lambda _ref: self._ids.pop(key, None))
+            except TypeError:
+                ref = value
+            new = (f"{self._prefix}-{next(self._counter)}", ref)
+            entry = self._ids.setdefault(key, new)
+        return entry[0]
+
+    def assign(self, value: Any, value_id: str) -> None:
+        """Give ``value`` an existing id, e.g. a copy reloaded from disk."""
+        key = id(value)
+        try:
+            ref = weakref.ref(value, lambda _ref: self._ids.pop(key, None))
+        except TypeError:
+            ref = value
+        self._ids[key] = (value_id, ref)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def namespace_paths(namespace) -> FrozenSet[str]:
+    """
+    Dotted paths of the namespaces nested in socket ``namespace``. When recording plain
+    values, only dicts at these paths are flattened; other dicts are leaf values, as a
+    ``TaggedValue`` would be.
+    """
+    paths = set()
+    stack = [(namespace, "")]
+    while stack:
+        current, prefix = stack.pop()
+        for name, item in current._sockets.items():
+            if isinstance(item, TaskSocketNamespace):
+                path = f"{prefix}{name}"
+                paths.add(path)
+                stack.append((item, f"{path}."))
+    return frozenset(paths)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import math
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from node_graph import Graph
+from .cache import TaskCache
+from .checkpoint import CheckpointStore
+from .instrumentation import Instrumentation
+from .provenance import ProvenanceRecorder
+from .retry import RetryPolicy
+from .spill import SpillStore
+from .local import LocalEngine
+from .mapping import Chunk, _run_map_chunk
+
+from .plan import ExecutionPlan, execution_plan
+from .utils import _has_zones
+
+
+class ThreadPoolEngine(LocalEngine):
+    """
+    Runs independent branches of a graph concurrently on a thread pool.
+
+    - Ready-queue driven by in-degree counters: a task is submitted as soon as every
+      task it depends on has finished, so I/O-bound tasks (HTTP, DB, subprocess) overlap.
+    - Inputs are resolved and results are stored on the scheduling thread; only the task
+      call itself (including provenance recording) runs on the worker threads.
+    - Nested ``@task.graph`` subgraphs are executed by a ThreadPoolEngine of the same size.
+    - Graphs with Zone/If/While tasks use the sequential zone scheduler of LocalEngine.
+    """
+
+    engine_kind = "thread"
+    _stream_in_background = True
+
+    def __init__(
+        self,
+        name: str = "thread-flow",
+        recorder: Optional[ProvenanceRecorder] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[TaskCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        tagging: str = "proxy",
+        release_values: bool = False,
+        keep_values: Optional[Iterable[str]] = None,
+        spill: Optional[SpillStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        super().__init__(
+            name,
+            recorder,
+            cache=cache,
+            retry_policy=retry_policy,
+            checkpoint=checkpoint,
+            tagging=tagging,
+            release_values=release_values,
+            keep_values=keep_values,
+            spill=spill,
+            instrumentation=instrumentation,
+        )
+        self.max_workers = max_workers
+
+    def _run_graph(
+        self,
+        ng: Graph,
+        parent_pid: Optional[str] = None,
+        reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        if _has_zones(ng):
+            # zones are scheduled level by level on the calling thread
+            return super()._run_graph(ng, parent_pid, reuse=reuse)
+        reuse = reuse or {}
+        plan = execution_plan(ng)
+        self._stream_tasks = self._streamed_tasks(ng, plan.streaming)
+
+        values: Dict[str, Dict[str, Any]] = self._snapshot_builtins(ng)
+
+        graph_pid = self._start_graph_run(ng, parent_pid)
+        previous_pid = self._graph_pid
+        self._graph_pid = graph_pid
+
+        pending = [len(plan.upstream[tid]) for tid in plan.order]
+        ready: Deque[int] = deque(tid for tid in plan.order if pending[tid] == 0)
+        running: Dict[Future, int] = {}
+
+        release = self._value_release(ng, plan)
+
+        def _complete(tid: int) -> None:
+            if release is not None:
+                release.done(tid, values)
+            self._task_completed(plan, tid)
+            for child in plan.downstream[tid]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker"
+        )
+        try:
+            while ready or running:
+                while ready:
+                    tid = ready.popleft()
+                    if plan.builtin[tid]:
+                        _complete(tid)
+                        continue
+                    name = plan.names[tid]
+                    if name in reuse:
+                        values[name] = reuse[name]
+                        _complete(tid)
+                        continue
+                    task = ng.tasks[name]
+                    kw = self._resolve_planned_inputs(task, plan, tid, values)
+                    running[pool.submit(self._run_task, task, graph_pid, kw)] = tid
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    tid = running.pop(future)
+                    name = plan.names[tid]
+                    values[name] = future.result()
+                    self._checkpoint_task(name, values[name])
+                    _complete(tid)
+
+            graph_outputs = self._plan_link_kwargs(
+                plan, plan.ids.get("graph_outputs"), values
+            )
+            return self._finalize_graph_success(ng, graph_pid, graph_outputs), values
+        except Exception as e:
+            # stop scheduling; let tasks that already started finish before reporting
+            for future in running:
+                future.cancel()
+            self._record_graph_failure(graph_pid, e)
+            raise
+        finally:
+            self._close_streams()
+            pool.shutdown(wait=True)
+            self._flush_checkpoint()
+            self._graph_pid = previous_pid
+
+    def _task_completed(self, plan: ExecutionPlan, tid: int) -> None:
+        """Called on the scheduling thread once task ``tid`` no longer runs."""
+
+    def _map_chunk_size(self, n_items: int) -> int:
+        # a few chunks per worker keeps the pool busy without per-item overhead
+        workers = self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+        return max(1, math.ceil(n_items / (4 * workers)))
+
+    def _map_chunks(
+        self, task, fn, item_input: str, chunks: List[Chunk], kwargs: Dict[str, Any]
+    ) -> List[Chunk]:
+        # a separate pool: the Map task itself occupies a worker of the graph pool
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"{self.name}-map"
+        ) as pool:
+            return list(
+                pool.map(
+                    lambda chunk: _run_map_chunk(fn, item_input, chunk, kwargs), chunks
+                )
+            )
+
+    def _run_subgraph(self, task, sub_ng: Graph, parent_pid: Optional[str]) -> None:
+        self.__class__(
+            name=f"{self.name}::{task.name}",
+            recorder=self.recorder,
+            max_workers=self.max_workers,
+            cache=self.cache,
+            retry_policy=self.retry_policy,
+            tagging=self.tagging,
+            release_values=self.release_values,
+            spill=self.spill,
+            instrumentation=self.instrumentation,
+        ).run(sub_ng, parent_pid=parent_pid)
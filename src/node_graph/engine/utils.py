@@ -4,6 +4,7 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Set
 from collections import defaultdict, deque
 from node_graph.link import TaskLink
 from node_graph import Graph
+from node_graph.config import BUILTIN_TASKS
 from node_graph.socket_spec import SocketSpec
 
 
@@ -138,6 +139,56 @@ def _resolve_tagged_value(value: Any) -> Any:
     return value
 
 
+def _clear_socket_value(socket) -> None:
+    """Drop the value held by ``socket`` (and its children) without validation."""
+    children = getattr(socket, "_sockets", None)
+    if children is not None:
+        for child in children.values():
+            _clear_socket_value(child)
+    elif socket.property is not None:
+        socket.property._value = socket.property.default
+
+
+def _set_raw_socket_value(socket, value: Any) -> None:
+    """Store ``value`` in ``socket`` (and its children) without validation."""
+    children = getattr(socket, "_sockets", None)
+    if children is None:
+        if socket.property is not None:
+            socket.property._value = value
+        return
+    if not isinstance(value, dict):
+        return
+    for key, item in value.items():
+        if key in children:
+            _set_raw_socket_value(children[key], item)
+
+
+def _merge_input_overrides(
+    socket, kwargs: Dict[str, Any], overrides: Dict[str, Any], tag: bool
+) -> Dict[str, Any]:
+    """
+    Copy of ``kwargs`` with the input ``overrides`` of an error handler merged in.
+
+    Namespace values are merged key by key; with ``tag`` the new values are wrapped in
+    ``TaggedValue`` like the literal inputs.
+    """
+    from node_graph.socket import TaggedValue
+
+    merged = dict(kwargs)
+    children = getattr(socket, "_sockets", None) or {}
+    for key, value in overrides.items():
+        child = children.get(key)
+        if getattr(child, "_sockets", None) is not None and isinstance(value, dict):
+            merged[key] = _merge_input_overrides(
+                child, merged.get(key) or {}, value, tag
+            )
+        elif tag and not isinstance(value, TaggedValue):
+            merged[key] = TaggedValue(value)
+        else:
+            merged[key] = value
+    return merged
+
+
 def _scan_links_topology(
     ng: Graph,
 ) -> Tuple[List[str], Dict[str, List[TaskLink]], Dict[str, Set[str]]]:
@@ -187,6 +238,66 @@ def _scan_links_topology(
     return order, incoming, required_out_sockets
 
 
+def _task_dependencies(
+    order: Iterable[str],
+    incoming: Dict[str, List[TaskLink]],
+) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """
+    Collapse the per-link ``incoming`` map into task-level dependency sets.
+
+    Returns ``(upstream, downstream)`` where ``upstream[name]`` holds the distinct tasks
+    that must finish before ``name`` can start, and ``downstream[name]`` the tasks that
+    wait on ``name``. ``len(upstream[name])`` is the in-degree counter used by the
+    ready-queue schedulers.
+    """
+    upstream: Dict[str, Set[str]] = {name: set() for name in order}
+    downstream: Dict[str, Set[str]] = {name: set() for name in order}
+    for dst, links in incoming.items():
+        for lk in links:
+            src = lk.from_task.name
+            upstream.setdefault(dst, set()).add(src)
+            downstream.setdefault(src, set()).add(dst)
+    return upstream, downstream
+
+
+ZONE_TASK_TYPES = ("ZONE", "IF", "WHILE")
+
+
+def _is_zone_task(task) -> bool:
+    return str(getattr(task.spec, "task_type", "")).upper() in ZONE_TASK_TYPES
+
+
+def _has_zones(ng: Graph) -> bool:
+    """True if ``ng`` contains Zone/If/While tasks that need zone-aware scheduling."""
+    return any(_is_zone_task(task) for task in ng.tasks)
+
+
+def _condition_is_true(value: Any) -> bool:
+    """Truthiness of a zone condition; several linked conditions must all be true."""
+    value = _resolve_tagged_value(value)
+    if isinstance(value, dict):
+        return all(_condition_is_true(v) for v in value.values())
+    return bool(value)
+
+
+def _streaming_tasks(ng: Graph) -> Set[str]:
+    """
+    Tasks whose generator results can be streamed: a single output field, consumed by
+    exactly one link into a regular (non built-in) task.
+    """
+    consumers: Dict[str, List[TaskLink]] = defaultdict(list)
+    for lk in ng.links:
+        consumers[lk.from_task.name].append(lk)
+    streaming = set()
+    for name, links in consumers.items():
+        if len(links) != 1 or links[0].to_task.name in BUILTIN_TASKS:
+            continue
+        outputs = ng.tasks[name].spec.outputs
+        if outputs is not None and len(outputs.fields or {}) == 1:
+            streaming.add(name)
+    return streaming
+
+
 def _build_task_link_kwargs(
     target_name: str,
     links_into_task: Iterable[TaskLink],
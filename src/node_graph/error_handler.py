@@ -4,6 +4,14 @@ from typing import Any, Dict, List, Union, Callable
 from node_graph.executor import RuntimeExecutor, SafeExecutor, BaseExecutor
 
 
+class ExitCodeError(Exception):
+    """Raised by a task to fail with an integer exit code that error handlers can match."""
+
+    def __init__(self, exit_code: int, message: str = ""):
+        super().__init__(message or f"Task failed with exit code {exit_code}")
+        self.exit_code = int(exit_code)
+
+
 @dataclass()
 class ErrorHandlerSpec:
     """Container for a handler executor and its integer exit codes."""
@@ -594,10 +594,26 @@ class Graph(IOOwnerMixin, WidgetRenderableMixin):
         name = f"{self.name}_copy" if name is None else name
         ng = self.__class__(name=name, uuid=None)
         ng.tasks = self.tasks._copy(graph=ng)
+        for task in self.tasks:
+            if task.name in BUILTIN_TASKS:
+                # e.g. the inputs of graph_outputs are named "outputs"
+                ng.tasks[task.name].inputs._name = task.inputs._name
+            children = getattr(task, "children", None)
+            if children:
+                ng.tasks[task.name].children.add([child.name for child in children])
+
+        def _socket(namespace, socket):
+            name = socket._scoped_name
+            # dynamic sockets that only hold a link (e.g. ctx entries) have no value
+            # to copy, so they are created here
+            if name not in namespace:
+                namespace._new(socket._identifier, name)
+            return namespace[name]
+
         for link in self.links:
             ng.add_link(
-                ng.tasks[link.from_task.name].outputs[link.from_socket._scoped_name],
-                ng.tasks[link.to_task.name].inputs[link.to_socket._scoped_name],
+                _socket(ng.tasks[link.from_task.name].outputs, link.from_socket),
+                _socket(ng.tasks[link.to_task.name].inputs, link.to_socket),
             )
         ng.knowledge_graph = self.knowledge_graph.copy(graph_uuid=ng.uuid)
         ng.knowledge_graph._graph = ng
@@ -702,16 +718,11 @@ class Graph(IOOwnerMixin, WidgetRenderableMixin):
         if isinstance(task_list, str):
             task_list = [task_list]
         for name in task_list:
-            if name not in self.get_task_names():
+            if name not in self.tasks:
                 raise ValueError(f"Task '{name}' not found in the task graph.")
-            link_indices: List[int] = []
-            for index, link in enumerate(self.links):
-                if link.from_task.name == name or link.to_task.name == name:
-                    link_indices.append(index)
-            # Delete links in reverse order to avoid index shift
-            for index in sorted(link_indices, reverse=True):
-                del self.links[index]
+            self.links._delete_task_links(name)
             del self.tasks[name]
+            self._version += 1
 
     def to_widget_value(self) -> dict:
         from node_graph.utils import gaph_to_short_json
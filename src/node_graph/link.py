@@ -308,29 +308,25 @@ class TaskLink:
 
     def unmount(self) -> None:
         """unmount link from task"""
-        i = 0
-        for link in self.from_socket._links:
-            if (
-                link.from_task.name == self.from_task.name
-                and link.from_socket._name == self.from_socket._name
-                and link.to_task.name == self.to_task.name
-                and link.to_socket._name == self.to_socket._name
-            ):
-                break
-            i += 1
-        del self.from_socket._links[i]
-        #
-        i = 0
-        for link in self.to_socket._links:
+        self._remove_from(self.from_socket._links)
+        self._remove_from(self.to_socket._links)
+
+    def _remove_from(self, links: list) -> None:
+        # a link is mounted as itself; fall back to an equivalent link by name
+        for i, link in enumerate(links):
+            if link is self:
+                del links[i]
+                return
+        for i, link in enumerate(links):
             if (
                 link.from_task.name == self.from_task.name
                 and link.from_socket._name == self.from_socket._name
                 and link.to_task.name == self.to_task.name
                 and link.to_socket._name == self.to_socket._name
             ):
-                break
-            i += 1
-        del self.to_socket._links[i]
+                del links[i]
+                return
+        raise ValueError(f"{self!r} is not mounted on the socket.")
 
     def to_dict(self) -> dict:
         """Data to be saved to database"""
@@ -8,6 +8,7 @@ Note pitfalls:
 """
 from contextlib import contextmanager
 from contextvars import ContextVar
+from typing import Optional
 from node_graph.tasks.task_pool import TaskPool
 from node_graph.socket import TaskSocket
 
@@ -160,3 +161,48 @@ def While(condition_socket: TaskSocket, max_iterations: int = 10000):
         yield zone_task
     finally:
         graph._active_zone = old_zone
+
+
+def Map(
+    fn,
+    source,
+    *,
+    item_input: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    **kwargs,
+):
+    """
+    Add a task to the current graph that calls ``fn`` once per item of ``source``.
+
+    :param fn: A ``@task`` handle or plain callable.
+    :param source: A dict or a dynamic-namespace socket holding the items.
+    :param item_input: Name of the ``fn`` argument receiving the item (default: first).
+    :param chunk_size: Items handed to a worker at once (default: chosen by the engine).
+    :param kwargs: Fixed inputs passed to every call.
+    :return: The outputs of the Map task; ``.result`` gathers the per-item results.
+    """
+    from dataclasses import replace
+    from node_graph.executor import RuntimeExecutor
+    from node_graph.task_spec import BaseHandle
+    from node_graph.tasks.builtins import Map as MapTask
+
+    if isinstance(fn, BaseHandle):
+        executor = fn._spec.executor
+    else:
+        executor = RuntimeExecutor.from_callable(fn)
+    spec = replace(MapTask._default_spec, executor=executor)
+
+    graph = get_current_graph()
+    task = graph.add_task(spec)
+    zone = getattr(graph, "_active_zone", None)
+    if zone:
+        zone.children.add(task)
+    task.set_inputs(
+        {
+            "source": source,
+            "kwargs": kwargs,
+            "item_input": item_input,
+            "chunk_size": chunk_size,
+        }
+    )
+    return task.outputs
@@ -1180,7 +1180,7 @@ def remove_spec_field(ns: SocketSpec, names: Union[str, Iterable[str]]) -> Socke
 
 def _function_returns_value(func) -> bool:
     """
-    True iff the *top-level* function body contains `return <non-None>`.
+    True iff the *top-level* function body contains `return <non-None>` or `yield`.
 
     Conservative defaults:
     - If source is unavailable, or AST parse fails, or the function task can't be found,
@@ -1232,6 +1232,13 @@ def _function_returns_value(func) -> bool:
                 return
             self.returns_value = True
 
+        def visit_Yield(self, node: ast.Yield):
+            # generator functions produce their items as the output value
+            self.returns_value = True
+
+        def visit_YieldFrom(self, node: ast.YieldFrom):
+            self.returns_value = True
+
     v = _TopLevelReturnVisitor()
     for stmt in target_fn.body:
         v.visit(stmt)
@@ -4,7 +4,7 @@ from typing import Any, Dict, Optional, Annotated
 from node_graph.task import BuiltinPolicy, Task, ChildTaskSet
 from node_graph.task_spec import TaskSpec
 from node_graph.socket_spec import SocketSpec
-from node_graph import namespace
+from node_graph import namespace, dynamic
 
 
 class _GraphIOSharedMixin:
@@ -121,3 +121,32 @@ class If(Zone):
         ),
         base_class_path="node_graph.tasks.builtins.If",
     )
+
+
+class Map(Task):
+    """
+    Apply one callable to every item of the ``source`` namespace.
+
+    Each item is passed as the ``item_input`` argument of the callable (default: its
+    first parameter) together with the fixed ``kwargs``; return values are gathered
+    into the ``result`` namespace under the item keys. Items are processed in chunks of
+    ``chunk_size`` without creating a task per item.
+    """
+
+    _default_spec = TaskSpec(
+        identifier="node_graph.map",
+        task_type="MAP",
+        catalog="Control",
+        inputs=namespace(
+            source=dynamic(Any),
+            kwargs=dynamic(Any),
+            item_input=Annotated[
+                Optional[str], SocketSpec("node_graph.string", default=None)
+            ],
+            chunk_size=Annotated[
+                Optional[int], SocketSpec("node_graph.int", default=None)
+            ],
+        ),
+        outputs=namespace(result=dynamic(Any)),
+        base_class_path="node_graph.tasks.builtins.Map",
+    )
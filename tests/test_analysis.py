@@ -1,4 +1,14 @@
-from node_graph.analysis import GraphAnalysis
+from node_graph import Graph
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from node_graph.analysis import (
+    GraphAnalysis,
+    _longest_paths_scalar,
+    longest_paths,
+    topological_levels,
+)
+from node_graph.engine.provenance_store import ProcessNode
 
 
 def test_get_input_output_links(ng_complex):
@@ -59,6 +69,65 @@ def test_get_all_descendants(ng_complex):
     assert desc_n5 == []
 
 
+def test_descendants_follow_graph_edits(ng_complex, func_with_namespace_socket):
+    ng = ng_complex
+    analysis = GraphAnalysis(ng)
+    assert set(analysis.get_all_descendants(ng.tasks.n3)) == {"n4", "n5"}
+    assert analysis.has_path("n1", "n5")
+    assert not analysis.has_path("n5", "n1")
+
+    # a new link extends the descendants computed before
+    n6 = ng.add_task(func_with_namespace_socket, name="n6")
+    ng.add_link(ng.tasks.n5.outputs.sum, n6.inputs.a)
+    assert set(analysis.get_all_descendants(ng.tasks.n3)) == {"n4", "n5", "n6"}
+    assert analysis.has_path(ng.tasks.n1, n6)
+    assert analysis.get_input_links(n6) == ["n5"]
+
+    # removing a task drops its links and the descendants through it
+    ng.delete_tasks(["n5"])
+    assert set(analysis.get_all_descendants(ng.tasks.n3)) == {"n4"}
+    assert not analysis.has_path("n1", "n6")
+    assert analysis.get_output_links(ng.tasks.n4) == []
+    connectivity = analysis.build_connectivity()
+    rebuilt = GraphAnalysis(ng).build_connectivity()
+    assert connectivity["input_node"] == rebuilt["input_node"]
+    assert connectivity["child_node"] == rebuilt["child_node"]
+
+
+def test_descendants_are_in_graph_order(func_with_namespace_socket):
+    ng = Graph()
+    first, second, third = (
+        ng.add_task(func_with_namespace_socket, name=name)
+        for name in ("first", "second", "third")
+    )
+    ng.add_link(first.outputs.sum, third.inputs.a)
+    ng.add_link(third.outputs.sum, second.inputs.a)
+    analysis = GraphAnalysis(ng)
+    # found by a search first, or all at once from the bit sets: the same order
+    assert analysis.get_all_descendants(first) == ["second", "third"]
+    assert GraphAnalysis(ng).build_connectivity()["child_node"]["first"] == [
+        "second",
+        "third",
+    ]
+    fourth = ng.add_task(func_with_namespace_socket, name="fourth")
+    ng.add_link(first.outputs.sum, fourth.inputs.a)
+    assert analysis.get_all_descendants(first) == ["second", "third", "fourth"]
+
+
+def test_reachability(ng_complex):
+    analysis = GraphAnalysis(ng_complex)
+    reach = analysis.reachability()
+    assert reach.descendants("n1") == ["n2", "n3", "n4", "n5"]
+    assert reach.descendants("n2", "n4") == ["n5"]
+    assert reach.has_path("n3", "n5")
+    assert not reach.has_path("n5", "n3")
+    assert reach.mask("n3").tolist() == [name in ("n4", "n5") for name in reach.names]
+    assert reach.counts()["n1"] == 4
+    child_node = analysis.build_connectivity()["child_node"]
+    assert set(child_node["n3"]) == {"n4", "n5"}
+    assert child_node["n5"] == []
+
+
 def test_compare_graphs_no_diff(ng_complex):
     """
     Two identical graphs => no added/removed/changed nodes
@@ -118,3 +187,47 @@ def test_zone(ng_with_zone):
     assert zones["zone2"]["input_tasks"] == ["zone1"]
     assert zones["n3"]["input_tasks"] == ["zone1"]
     assert zones["n5"]["input_tasks"] == ["zone2"]
+
+
+def test_levels_and_critical_path(ng_complex):
+    analysis = GraphAnalysis(ng_complex)
+    assert analysis.levels() == {"n1": 0, "n2": 1, "n3": 1, "n4": 2, "n5": 3}
+    assert analysis.max_parallelism() == 2
+    # unit weights: the longest chain
+    assert analysis.critical_path() == (["n1", "n3", "n4", "n5"], 4.0)
+    weights = {"n1": 1.0, "n2": 10.0, "n3": 1.0, "n4": 1.0, "n5": 1.0}
+    assert analysis.critical_path(weights) == (["n1", "n2"], 11.0)
+
+
+def test_estimated_makespan(ng_complex):
+    analysis = GraphAnalysis(ng_complex)
+    weights = {"n1": 1.0, "n2": 3.0, "n3": 1.0, "n4": 1.0, "n5": 1.0}
+    assert analysis.estimated_makespan(weights=weights) == 4.0
+    assert analysis.estimated_makespan(1, weights) == 7.0
+    assert analysis.estimated_makespan(2, weights) == 4.0
+    # recorded runs are averaged per task
+    records = [
+        ProcessNode("p1", "n2", None, start_time=0.0, end_time=2.0, state="FINISHED"),
+        ProcessNode("p2", "n2", None, start_time=5.0, end_time=9.0, state="FINISHED"),
+        ProcessNode("p3", "n3", None, start_time=0.0, end_time=9.0, state="FAILED"),
+    ]
+    assert GraphAnalysis.task_durations(records) == {"n2": 3.0}
+    assert analysis.estimated_makespan(1, records, default=1.0) == 7.0
+
+
+def test_longest_paths_scalar_pass_matches_level_steps():
+    rng = np.random.default_rng(0)
+    n = 200
+    # edges only go forward, so the graph is a DAG
+    rows, cols = np.triu_indices(n, k=1)
+    keep = rng.random(rows.size) < 0.05
+    adjacency = csr_matrix(
+        (np.ones(keep.sum()), (rows[keep], cols[keep])), shape=(n, n)
+    )
+    levels = topological_levels(adjacency)
+    weights = rng.random(n)
+    for downstream in (False, True):
+        np.testing.assert_allclose(
+            longest_paths(adjacency, levels, weights, downstream),
+            _longest_paths_scalar(adjacency, levels, weights, downstream),
+        )
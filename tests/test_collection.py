@@ -45,3 +45,35 @@ def test_delete_items():
         del coll[sum]
     coll._pop(0)
     assert coll._items == {}
+
+
+def test_positional_access_after_deletions():
+    coll = Collection()
+    tasks = [Task(name=f"task{i}") for i in range(6)]
+    for task in tasks:
+        coll._append(task)
+    # deleting from the back keeps positions in front of it
+    del coll[[4, 5]]
+    assert coll[3] is tasks[3]
+    assert coll[-1] is tasks[3]
+    # a hole in the middle is compacted on the next access behind it
+    del coll["task1"]
+    assert coll[0] is tasks[0]
+    assert [coll[i].name for i in range(len(coll))] == ["task0", "task2", "task3"]
+    assert coll._pop(-1) is tasks[3]
+    with pytest.raises(IndexError):
+        coll[2]
+    assert coll._get_by_uuid(tasks[2].uuid) is tasks[2]
+    assert coll._get_by_uuid(tasks[1].uuid) is None
+    coll._append(tasks[1])
+    assert coll[2] is tasks[1]
+    assert coll._get_by_uuid(tasks[1].uuid) is tasks[1]
+
+
+def test_get_by_uuid_after_the_uuid_was_reassigned():
+    coll = Collection()
+    task = Task(name="task")
+    coll._append(task)
+    old_uuid, task.uuid = task.uuid, "restored-uuid"
+    assert coll._get_by_uuid("restored-uuid") is task
+    assert coll._get_by_uuid(old_uuid) is None
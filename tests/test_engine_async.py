@@ -0,0 +1,155 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+
+import pytest
+
+from node_graph import Graph, get_current_graph, task
+from node_graph.socket_spec import namespace as ns
+from node_graph.tasks.tests import test_add
+
+from node_graph.engine.async_engine import AsyncEngine
+from node_graph.manager import If, While
+
+
+@task()
+async def async_double(x: float) -> float:
+    await asyncio.sleep(0.01)
+    return x * 2
+
+
+_concurrency = {"running": 0, "peak": 0}
+
+
+@task()
+async def track_concurrency(x: int) -> int:
+    _concurrency["running"] += 1
+    _concurrency["peak"] = max(_concurrency["peak"], _concurrency["running"])
+    await asyncio.sleep(0.02)
+    _concurrency["running"] -= 1
+    return x
+
+
+@task.graph(outputs=ns(final=float))
+def async_chain(x: float):
+    first = async_double(x=x)
+    second = async_double(x=first.result)
+    return {"final": second.result}
+
+
+@pytest.mark.asyncio
+async def test_async_engine_awaits_coroutines_and_offloads_sync_tasks():
+    ng = Graph(name="async-basic", outputs=ns(total=Any))
+    double = ng.add_task(async_double, "double", x=3)
+    add = ng.add_task(test_add, "add", x=double.outputs.result, y=1)
+    ng.add_link(add.outputs.result, ng.outputs.total)
+
+    engine = AsyncEngine()
+    results = await engine.run(ng)
+
+    assert results["total"] == 7
+    prov = engine.recorder.to_json()
+    states = {info["name"]: info["state"] for info in prov["process_nodes"].values()}
+    assert states["double"] == "FINISHED"
+    assert states["add"] == "FINISHED"
+    pids = {info["name"]: pid for pid, info in prov["process_nodes"].items()}
+    created = {e["dst"] for e in prov["edges"] if e["src"] == pids["double"]}
+    consumed = {e["src"] for e in prov["edges"] if e["dst"] == pids["add"]}
+    assert created & consumed
+
+
+async def _increment(x: int) -> int:
+    await asyncio.sleep(0)
+    return x + 1
+
+
+@task()
+def returns_coroutine(x: int) -> int:
+    return _increment(x)
+
+
+@pytest.mark.asyncio
+async def test_async_engine_awaits_coroutines_returned_by_sync_tasks():
+    ng = Graph(name="sync-returns-coroutine", outputs=ns(total=Any))
+    first = ng.add_task(returns_coroutine, "first", x=1)
+    ng.add_link(first.outputs.result, ng.outputs.total)
+    assert (await AsyncEngine().run(ng))["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_engine_respects_concurrency_limit():
+    _concurrency["peak"] = 0
+    ng = Graph(name="async-limit")
+    for i in range(6):
+        ng.add_task(track_concurrency, f"t{i}", x=i)
+
+    await AsyncEngine(max_concurrency=2).run(ng)
+    assert _concurrency["peak"] == 2
+
+    _concurrency["peak"] = 0
+    await AsyncEngine().run(ng)
+    assert _concurrency["peak"] == 6
+
+
+@pytest.mark.asyncio
+async def test_async_engine_runs_subgraphs():
+    ng = Graph(name="async-subgraph", outputs=ns(result=Any))
+    chain = ng.add_task(async_chain, "chain", x=2)
+    ng.add_link(chain.outputs.final, ng.outputs.result)
+
+    engine = AsyncEngine()
+    assert (await engine.run(ng))["result"] == 8
+    names = {p["name"] for p in engine.recorder.to_json()["process_nodes"].values()}
+    assert "chain__subgraph" in names
+
+
+_timeouts = {"left": 0}
+
+
+@task()
+async def times_out(x: int) -> int:
+    if _timeouts["left"]:
+        _timeouts["left"] -= 1
+        raise TimeoutError("upstream too slow")
+    return x
+
+
+@pytest.mark.asyncio
+async def test_async_engine_retries_coroutine_tasks():
+    from node_graph.engine.retry import RetryPolicy
+
+    _timeouts["left"] = 2
+    ng = Graph()
+    ng.add_task(times_out, "times_out", x=3)
+    engine = AsyncEngine(retry_policy=RetryPolicy(max_retries=2, delay=0.001))
+    await engine.run(ng)
+    assert ng.tasks.times_out.outputs.result.value == 3
+    attempts = [
+        p["meta"].get("attempt", 1)
+        for p in engine.recorder.to_json()["process_nodes"].values()
+        if p["kind"] == "task"
+    ]
+    assert sorted(attempts) == [1, 2, 3]
+
+
+@task()
+def below(x, y):
+    return x < y
+
+
+@task.graph()
+def doubling_loop(limit: float = 10):
+    graph = get_current_graph()
+    graph.ctx.value = 1
+    with While(below(graph.ctx.value, limit).result):
+        graph.ctx.value = async_double(graph.ctx.value).result
+    with If(below(graph.ctx.value, 100).result):
+        graph.ctx.value = async_chain(graph.ctx.value).final
+    return graph.ctx.value
+
+
+@pytest.mark.asyncio
+async def test_async_engine_runs_zone_graphs():
+    # 1 -> 2 -> 4 -> 8 -> 16 in the loop, then the If body doubles twice more
+    outputs = await AsyncEngine().run(doubling_loop.build(limit=10))
+    assert outputs["result"] == 64
@@ -0,0 +1,118 @@
+from __future__ import annotations
+from typing import Any
+
+import numpy as np
+
+from node_graph import Graph, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.cache import MemoryCache, SqliteCache, stable_hash
+from node_graph.engine.local import LocalEngine
+
+_calls = {"count": 0}
+
+
+@task()
+def counted_add(x: int, y: int) -> int:
+    _calls["count"] += 1
+    return x + y
+
+
+def _build_graph(x: int = 1) -> Graph:
+    ng = Graph(name="cached", outputs=ns(total=Any))
+    first = ng.add_task(counted_add, "first", x=x, y=2)
+    second = ng.add_task(counted_add, "second", x=first.outputs.result, y=3)
+    ng.add_link(second.outputs.result, ng.outputs.total)
+    return ng
+
+
+def _cached_flags(engine):
+    return {
+        info["name"]: info["meta"].get("cached", False)
+        for info in engine.recorder.to_json()["process_nodes"].values()
+        if info["kind"] == "task"
+    }
+
+
+def test_memory_cache_skips_calls_but_records_provenance():
+    cache = MemoryCache()
+    _calls["count"] = 0
+
+    first_run = LocalEngine(cache=cache)
+    assert first_run.run(_build_graph())["total"] == 6
+    assert _calls["count"] == 2
+    assert _cached_flags(first_run) == {"first": False, "second": False}
+
+    second_run = LocalEngine(cache=cache)
+    assert second_run.run(_build_graph())["total"] == 6
+    assert _calls["count"] == 2
+    assert _cached_flags(second_run) == {"first": True, "second": True}
+    prov = second_run.recorder.to_json()
+    assert all(p["state"] == "FINISHED" for p in prov["process_nodes"].values())
+    assert any(edge["label"] == "input:x" for edge in prov["edges"])
+
+    # a changed input only misses for the tasks whose inputs actually changed
+    third_run = LocalEngine(cache=cache)
+    assert third_run.run(_build_graph(x=10))["total"] == 15
+    assert _calls["count"] == 4
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert len(cache) == 2
+
+
+def test_memory_cache_hits_are_copies():
+    cache = MemoryCache()
+    value = {"items": [1, 2]}
+    cache.set("a", value)
+    value["items"].append(3)
+    _hit, cached = cache.get("a")
+    cached["items"].append(4)
+    assert cache.get("a") == (True, {"items": [1, 2]})
+
+
+@task()
+def make_array(n: int) -> Any:
+    return np.arange(n, dtype=float)
+
+
+def test_cache_keeps_spilled_placeholders(tmp_path):
+    from node_graph.engine.spill import Spilled, SpillStore
+
+    cache = MemoryCache()
+    ng = Graph(name="spill")
+    ng.add_task(make_array, "array", n=1000)
+    store = SpillStore(threshold=1000, directory=str(tmp_path))
+    LocalEngine(cache=cache, spill=store).run(ng)
+    (cached,) = cache._data.values()
+    assert isinstance(cached, Spilled)
+
+    engine = LocalEngine(cache=cache, spill=store)
+    engine.run(ng)
+    assert _cached_flags(engine) == {"array": True}
+    assert ng.tasks.array.outputs.result.value.load().sum() == 499500.0
+
+
+def test_sqlite_cache_persists_between_instances(tmp_path):
+    path = tmp_path / "results.sqlite"
+    _calls["count"] = 0
+    LocalEngine(cache=SqliteCache(path)).run(_build_graph())
+    assert _calls["count"] == 2
+
+    engine = LocalEngine(cache=SqliteCache(path))
+    assert engine.run(_build_graph())["total"] == 6
+    assert _calls["count"] == 2
+    assert _cached_flags(engine) == {"first": True, "second": True}
+
+
+def test_stable_hash_is_order_independent_and_type_aware():
+    assert stable_hash({"a": 1, "b": [1, 2]}) == stable_hash({"b": [1, 2], "a": 1})
+    assert stable_hash({"a": 1}) != stable_hash({"a": 1.0})
+    assert stable_hash(np.arange(3)) == stable_hash(np.arange(3))
+    assert stable_hash(np.arange(3)) != stable_hash(np.arange(3.0))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import Any
+
+import pytest
+
+from node_graph import Graph, get_current_graph, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.checkpoint import PickleCheckpoint, SqliteCheckpoint
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.thread_pool import ThreadPoolEngine
+from node_graph.manager import While
+
+_state = {"calls": [], "crash": True}
+
+
+@task()
+def step(x: int) -> int:
+    _state["calls"].append(x)
+    return x + 1
+
+
+@task()
+def unstable(x: int) -> int:
+    if _state["crash"]:
+        raise RuntimeError("worker died")
+    _state["calls"].append(x)
+    return x * 10
+
+
+def _build_graph() -> Graph:
+    ng = Graph(name="long_run", outputs=ns(total=Any))
+    first = ng.add_task(step, "first", x=1)
+    second = ng.add_task(step, "second", x=first.outputs.result)
+    crash = ng.add_task(unstable, "crash", x=second.outputs.result)
+    last = ng.add_task(step, "last", x=crash.outputs.result)
+    ng.add_link(last.outputs.result, ng.outputs.total)
+    return ng
+
+
+@pytest.mark.parametrize(
+    "store_cls, engine_cls",
+    [
+        (SqliteCheckpoint, LocalEngine),
+        (PickleCheckpoint, LocalEngine),
+        (SqliteCheckpoint, ThreadPoolEngine),
+    ],
+)
+def test_resume_skips_tasks_completed_before_the_failure(
+    tmp_path, store_cls, engine_cls
+):
+    path = tmp_path / "run.ckpt"
+    _state.update(calls=[], crash=True)
+    with pytest.raises(RuntimeError):
+        engine_cls(checkpoint=store_cls(path)).run(_build_graph())
+    assert _state["calls"] == [1, 2]
+
+    # a new process: fresh graph, fresh store on the same file
+    _state.update(calls=[], crash=False)
+    engine = engine_cls(checkpoint=store_cls(path))
+    assert engine.resume(_build_graph())["total"] == 31
+    assert _state["calls"] == [3, 30]
+
+    # resumed outputs are tagged, so provenance links them to the new processes
+    prov = engine.recorder.to_json()
+    names = {p["name"] for p in prov["process_nodes"].values() if p["kind"] == "task"}
+    assert names == {"crash", "last"}
+
+
+@task()
+def below(x: int, y: int) -> bool:
+    return x < y
+
+
+@task.graph()
+def loop_then_crash(limit: int = 3):
+    graph = get_current_graph()
+    graph.ctx.index = 0
+    with While(below(graph.ctx.index, limit).result) as loop:
+        graph.ctx.index = step(graph.ctx.index).result
+    result = unstable(graph.ctx.index).result
+    loop >> result
+    return result
+
+
+@pytest.mark.parametrize("engine_cls", [LocalEngine, ThreadPoolEngine])
+def test_resume_reuses_finished_zones(tmp_path, engine_cls):
+    path = tmp_path / "run.ckpt"
+    _state.update(calls=[], crash=True)
+    with pytest.raises(RuntimeError):
+        engine_cls(checkpoint=SqliteCheckpoint(path)).run(loop_then_crash.build())
+    assert _state["calls"] == [0, 1, 2]
+
+    # the While loop is restored with the ctx it wrote, only the crashed task runs
+    _state.update(calls=[], crash=False)
+    engine = engine_cls(checkpoint=SqliteCheckpoint(path))
+    assert engine.resume(loop_then_crash.build())["result"] == 30
+    assert _state["calls"] == [3]
+
+
+def test_pickle_checkpoint_buffers_writes_until_flush(tmp_path):
+    path = tmp_path / "run.pkl"
+    store = PickleCheckpoint(path, interval=3600)
+    store.save("a", {"result": 1})
+    assert not path.exists()
+    store.flush()
+    assert PickleCheckpoint(path).load() == {"a": {"result": 1}}
+    store.clear()
+    assert not path.exists()
+
+
+def test_resume_requires_a_checkpoint():
+    with pytest.raises(ValueError, match="No checkpoint"):
+        LocalEngine().resume(_build_graph())
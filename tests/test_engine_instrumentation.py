@@ -0,0 +1,90 @@
+from __future__ import annotations
+import json
+import time
+
+import pytest
+
+from node_graph import Graph, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.instrumentation import PHASES, Instrumentation
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.thread_pool import ThreadPoolEngine
+
+
+@task()
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+@task()
+def slow_add(x: int, y: int) -> int:
+    time.sleep(0.05)
+    return x + y
+
+
+@task()
+def fail(x: int) -> int:
+    raise ValueError("boom")
+
+
+def _diamond(fn) -> Graph:
+    ng = Graph(name="diamond", outputs=ns(total=int))
+    a = ng.add_task(fn, "a", x=1, y=2)
+    b = ng.add_task(fn, "b", x=a.outputs.result, y=1)
+    c = ng.add_task(fn, "c", x=a.outputs.result, y=2)
+    d = ng.add_task(fn, "d", x=b.outputs.result, y=c.outputs.result)
+    ng.add_link(d.outputs.result, ng.outputs.total)
+    return ng
+
+
+def test_instrumentation_hooks_receive_phase_timings():
+    seen = []
+    instrumentation = Instrumentation(hooks=[seen.append])
+    engine = LocalEngine(instrumentation=instrumentation)
+    out = engine.run(_diamond(slow_add))
+
+    assert out["total"] == 9
+    assert [m.task for m in seen] == ["a", "b", "c", "d"]
+    assert instrumentation.metrics == seen
+    for metrics in seen:
+        assert metrics.graph == engine.name
+        assert metrics.state == "FINISHED"
+        assert set(metrics.phases) == set(PHASES)
+        assert metrics.phases["call"] >= 0.05
+        assert metrics.phases["outputs"] > 0
+        assert metrics.phases["provenance"] > 0
+        assert metrics.phases["inputs"] > 0
+        assert 0 <= metrics.overhead < metrics.duration
+    totals = instrumentation.totals()
+    assert totals["call"] == pytest.approx(sum(m.phases["call"] for m in seen))
+
+
+def test_instrumentation_chrome_trace_thread_pool(tmp_path):
+    instrumentation = Instrumentation()
+    engine = ThreadPoolEngine(max_workers=2, instrumentation=instrumentation)
+    assert engine.run(_diamond(add))["total"] == 9
+
+    assert {m.task for m in instrumentation.metrics} == {"a", "b", "c", "d"}
+    path = tmp_path / "trace.json"
+    instrumentation.save_chrome_trace(path)
+    trace = json.loads(path.read_text())
+    tasks = [e for e in trace["traceEvents"] if e["cat"] == "task"]
+    phases = [e for e in trace["traceEvents"] if e["cat"] == "phase"]
+    assert sorted(e["name"] for e in tasks) == ["a", "b", "c", "d"]
+    assert {e["name"] for e in phases} >= {"inputs", "call", "outputs", "provenance"}
+    assert all(e["ph"] == "X" and e["ts"] >= 0 and e["dur"] >= 0 for e in tasks)
+    assert all("call_ms" in e["args"] for e in tasks)
+
+
+def test_instrumentation_records_failed_tasks():
+    instrumentation = Instrumentation(keep=False)
+    states = []
+    instrumentation.hooks.append(lambda m: states.append((m.task, m.state)))
+    ng = Graph(name="failing")
+    ng.add_task(fail, "bad", x=1)
+    with pytest.raises(ValueError, match="boom"):
+        LocalEngine(instrumentation=instrumentation).run(ng)
+
+    assert states == [("bad", "FAILED")]
+    assert instrumentation.metrics == []
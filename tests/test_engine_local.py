@@ -154,3 +154,106 @@ def test_local_engine_records_call_edges():
     )
     edges = {(edge["src"], edge["dst"], edge["label"]) for edge in prov["edges"]}
     assert (graph_proc, nested_proc, "call") in edges
+
+
+def test_execution_plan_is_reused_until_the_graph_changes():
+    from node_graph.engine.plan import execution_plan
+
+    ng = Graph(name="local-plan", outputs=ns(total=Any))
+    add1 = ng.add_task(test_add, "add1", x=1, y=2)
+    add2 = ng.add_task(test_add, "add2", x=3, y=add1.outputs.result)
+    ng.add_link(add2.outputs.result, ng.outputs.total)
+
+    plan = execution_plan(ng)
+    assert LocalEngine().run(ng)["total"] == 6
+    assert LocalEngine().run(ng)["total"] == 6
+    assert execution_plan(ng) is plan
+
+    # deleting a task (and its links) invalidates the plan
+    ng.delete_tasks("add1")
+    add2.set_inputs({"y": 10})
+    assert execution_plan(ng) is not plan
+    assert LocalEngine().run(ng)["total"] == 13
+
+
+@task()
+def passthrough(value: Any, options: Any = None) -> Any:
+    return value
+
+
+def test_light_tagging_passes_plain_values_and_keeps_provenance():
+    import pytest
+
+    payload = object()
+    ng = Graph(name="local-light", outputs=ns(total=Any))
+    first = ng.add_task(passthrough, "first", value=payload, options={"a": [1, 2]})
+    second = ng.add_task(passthrough, "second", value=first.outputs.result)
+    ng.add_link(second.outputs.result, ng.outputs.total)
+
+    recorder = ProvenanceRecorder("local-light")
+    engine = LocalEngine(recorder=recorder, tagging="light")
+    assert engine.run(ng)["total"] is payload
+
+    pids = {p.name: p.id for p in recorder.process_nodes.values()}
+    produced = {e.dst for e in recorder.edges if e.src == pids["first"]}
+    consumed = {e.src for e in recorder.edges if e.dst == pids["second"]}
+    assert produced & consumed
+    # a dict passed to a plain socket is one data node, not flattened per key
+    options = [e for e in recorder.edges if e.label == "input:options"]
+    assert len(options) == 1
+
+    with pytest.raises(ValueError, match="Unknown tagging mode"):
+        LocalEngine(tagging="weak")
+
+
+class Blob:
+    pass
+
+
+_blobs: list = []
+
+
+@task()
+def make_blob() -> Any:
+    import weakref
+
+    blob = Blob()
+    _blobs.append(weakref.ref(blob))
+    return blob
+
+
+@task()
+def blob_size(blob: Any) -> int:
+    return 1
+
+
+@task()
+def alive_blobs(x: int) -> int:
+    import gc
+
+    gc.collect()
+    return sum(ref() is not None for ref in _blobs)
+
+
+def test_release_values_frees_outputs_once_consumers_finish():
+    from node_graph.engine.thread_pool import ThreadPoolEngine
+
+    for engine_cls in (LocalEngine, ThreadPoolEngine):
+        _blobs.clear()
+        ng = Graph(name="local-release", outputs=ns(alive=Any, kept=Any))
+        kept = ng.add_task(make_blob, "kept")
+        blob = ng.add_task(make_blob, "blob")
+        size = ng.add_task(blob_size, "size", blob=blob.outputs.result)
+        size.set_inputs({"_wait": kept.outputs._wait})
+        alive = ng.add_task(alive_blobs, "alive", x=size.outputs.result)
+        ng.add_link(alive.outputs.result, ng.outputs.alive)
+        ng.add_link(kept.outputs.result, ng.outputs.kept)
+
+        engine = engine_cls(release_values=True, keep_values=["size"])
+        results = engine.rerun(ng)
+        # "blob" was freed after "size" ran; "kept" feeds the graph outputs
+        assert results["alive"] == 1
+        assert isinstance(results["kept"], Blob)
+        assert set(engine.last_run.values) >= {"kept", "size", "alive"}
+        assert "blob" not in engine.last_run.values
+        assert ng.tasks.blob.outputs.result.value is None
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+
+import pytest
+
+from node_graph import Graph, Map, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.async_engine import AsyncEngine
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.process_pool import ProcessPoolEngine
+from node_graph.engine.thread_pool import ThreadPoolEngine
+
+
+@task()
+def square(x: int, offset: int = 0) -> int:
+    return x * x + offset
+
+
+@task()
+def make_items(n: int) -> dict:
+    return {f"item_{i}": i for i in range(n)}
+
+
+@task()
+def scale(factor: int, value: int) -> int:
+    return factor * value
+
+
+_concurrency = {"running": 0, "peak": 0}
+
+
+@task()
+async def slow_square(x: int) -> int:
+    _concurrency["running"] += 1
+    _concurrency["peak"] = max(_concurrency["peak"], _concurrency["running"])
+    await asyncio.sleep(0.01)
+    _concurrency["running"] -= 1
+    return x * x
+
+
+def _map_graph(n: int, **map_kwargs) -> Graph:
+    with Graph(name="map", outputs=ns(result=Any)) as ng:
+        out = Map(square, {f"item_{i}": i for i in range(n)}, offset=1, **map_kwargs)
+        ng.outputs.result = out.result
+    return ng
+
+
+@pytest.mark.parametrize(
+    "engine_cls", [LocalEngine, ThreadPoolEngine, ProcessPoolEngine]
+)
+def test_map_applies_the_task_to_every_item(engine_cls):
+    ng = _map_graph(200)
+    # one task for the whole collection, not one per item
+    assert [t.name for t in ng.tasks if t.spec.task_type == "MAP"] == ["map"]
+    result = engine_cls().run(ng)["result"]
+    assert result == {f"item_{i}": i * i + 1 for i in range(200)}
+
+
+def test_map_chunks_items_per_worker(monkeypatch):
+    engine = ThreadPoolEngine(max_workers=2)
+    sizes = []
+    original = ThreadPoolEngine._map_chunks
+
+    def record(self, task, fn, item_input, chunks, kwargs):
+        sizes.extend(len(chunk) for chunk in chunks)
+        return original(self, task, fn, item_input, chunks, kwargs)
+
+    monkeypatch.setattr(ThreadPoolEngine, "_map_chunks", record)
+    engine.run(_map_graph(80))
+    assert sizes == [10] * 8
+
+    sizes.clear()
+    engine.run(_map_graph(80, chunk_size=25))
+    assert sizes == [25, 25, 25, 5]
+
+
+def test_map_over_upstream_output_with_named_item_input():
+    with Graph(name="map_upstream", outputs=ns(result=Any)) as ng:
+        items = make_items(n=5)
+        out = Map(scale, items.result, item_input="value", factor=3)
+        ng.outputs.result = out.result
+    result = LocalEngine().run(ng)["result"]
+    assert result == {f"item_{i}": 3 * i for i in range(5)}
+
+
+@pytest.mark.asyncio
+async def test_async_map_awaits_items_concurrently():
+    _concurrency.update(running=0, peak=0)
+    with Graph(name="async_map", outputs=ns(result=Any)) as ng:
+        out = Map(slow_square, {f"item_{i}": i for i in range(10)})
+        ng.outputs.result = out.result
+    result = (await AsyncEngine(max_concurrency=4).run(ng))["result"]
+    assert result == {f"item_{i}": i * i for i in range(10)}
+    assert _concurrency["peak"] == 4
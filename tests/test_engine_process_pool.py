@@ -0,0 +1,131 @@
+from __future__ import annotations
+import os
+from typing import Annotated, Any
+
+from node_graph import Graph, task
+from node_graph.socket_spec import namespace as ns
+from node_graph.tasks.tests import test_add
+
+from node_graph.engine.process_pool import ProcessPoolEngine
+
+
+@task()
+def worker_pid(x: int) -> int:
+    return os.getpid()
+
+
+@task()
+def sum_and_product(x: int, y: int) -> Annotated[dict, ns(sum=int, product=int)]:
+    return {"sum": x + y, "product": x * y}
+
+
+@task.graph(outputs=ns(total=float))
+def nested(x: int, y: int):
+    out = sum_and_product(x=x, y=y)
+    return {"total": test_add(x=out.sum, y=out.product).result}
+
+
+def test_process_pool_engine_runs_tasks_in_worker_processes():
+    ng = Graph(name="process-pids", outputs=ns(left=Any, right=Any))
+    left = ng.add_task(worker_pid, "left", x=1)
+    right = ng.add_task(worker_pid, "right", x=2)
+    ng.add_link(left.outputs.result, ng.outputs.left)
+    ng.add_link(right.outputs.result, ng.outputs.right)
+
+    results = ProcessPoolEngine(max_workers=2).run(ng)
+
+    assert results["left"] != os.getpid()
+    assert results["right"] != os.getpid()
+
+
+def test_process_pool_engine_retags_outputs_for_provenance():
+    ng = Graph(name="process-prov", outputs=ns(total=Any))
+    sp = ng.add_task(sum_and_product, "sp", x=2, y=3)
+    add = ng.add_task(test_add, "add", x=sp.outputs.sum, y=sp.outputs.product)
+    ng.add_link(add.outputs.result, ng.outputs.total)
+
+    engine = ProcessPoolEngine(max_workers=2)
+    assert engine.run(ng)["total"] == 11
+
+    prov = engine.recorder.to_json()
+    pids = {info["name"]: pid for pid, info in prov["process_nodes"].items()}
+    created = {
+        edge["label"]: edge["dst"]
+        for edge in prov["edges"]
+        if edge["src"] == pids["sp"]
+    }
+    consumed = {
+        edge["label"]: edge["src"]
+        for edge in prov["edges"]
+        if edge["dst"] == pids["add"]
+    }
+    assert created["create:sum"] == consumed["input:x"]
+    assert created["create:product"] == consumed["input:y"]
+
+
+def test_process_pool_engine_runs_nested_graphs():
+    ng = Graph(name="process-nested", outputs=ns(result=Any))
+    sub = ng.add_task(nested, "sub", x=2, y=4)
+    ng.add_link(sub.outputs.total, ng.outputs.result)
+
+    engine = ProcessPoolEngine(max_workers=2)
+    assert engine.run(ng)["result"] == 14
+    names = {p["name"] for p in engine.recorder.to_json()["process_nodes"].values()}
+    assert "sub__subgraph" in names
+
+
+@task()
+def make_array(n: int) -> Any:
+    import numpy as np
+
+    return np.arange(n, dtype=float)
+
+
+@task()
+def mapped_sum(arr: Any) -> Annotated[dict, ns(total=float, mapped=bool)]:
+    import numpy as np
+
+    return {"total": float(arr.sum()), "mapped": isinstance(arr.base, np.memmap)}
+
+
+def test_process_pool_engine_passes_large_arrays_through_the_data_plane(tmp_path):
+    from node_graph.engine.dataplane import DataPlane
+
+    ng = Graph(name="process-shared", outputs=ns(arr=Any, total=Any, mapped=Any))
+    arr = ng.add_task(make_array, "arr", n=1 << 18)
+    first = ng.add_task(mapped_sum, "first", arr=arr.outputs.result)
+    ng.add_task(mapped_sum, "second", arr=arr.outputs.result)
+    ng.add_link(arr.outputs.result, ng.outputs.arr)
+    ng.add_link(first.outputs.total, ng.outputs.total)
+    ng.add_link(first.outputs.mapped, ng.outputs.mapped)
+
+    plane = DataPlane(threshold=1 << 20, directory=str(tmp_path))
+    results = ProcessPoolEngine(max_workers=2, data_plane=plane).run(ng)
+
+    assert results["total"] == sum(range(1 << 18))
+    assert results["mapped"] is True
+    # the output outlives its file, which was removed with the run directory
+    assert results["arr"][-1] == (1 << 18) - 1
+    assert len(plane) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_data_plane_unlinks_a_file_once_nobody_holds_it(tmp_path):
+    import numpy as np
+    from node_graph.engine.dataplane import DataPlane, SharedHandle
+
+    plane = DataPlane(threshold=16, directory=str(tmp_path))
+    plane.open()
+    value = np.ones(8)
+    exported, first = plane.export({"x": value, "small": np.ones(1)})
+    assert isinstance(exported["x"], SharedHandle)
+    assert not isinstance(exported["small"], SharedHandle)
+    # the same object is not written twice while it is held
+    again, second = plane.export([value])
+    assert again[0] == exported["x"] and first == second
+    plane.release(first)
+    assert len(plane) == 1
+    plane.release(second)
+    assert len(plane) == 0
+    assert not any(tmp_path.rglob("*.npy"))
+    plane.close()
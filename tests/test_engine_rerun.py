@@ -0,0 +1,118 @@
+from __future__ import annotations
+from typing import Any
+
+import pytest
+
+from node_graph import Graph, get_current_graph, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.async_engine import AsyncEngine
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.thread_pool import ThreadPoolEngine
+from node_graph.manager import While
+
+_calls: list = []
+
+
+@task()
+def traced_add(x: int, y: int) -> int:
+    _calls.append((x, y))
+    return x + y
+
+
+def _build_graph() -> Graph:
+    """left and right are independent; total depends on both."""
+    ng = Graph(name="rerun", outputs=ns(total=Any))
+    left = ng.add_task(traced_add, "left", x=1, y=2)
+    right = ng.add_task(traced_add, "right", x=10, y=20)
+    total = ng.add_task(
+        traced_add, "total", x=left.outputs.result, y=right.outputs.result
+    )
+    ng.add_link(total.outputs.result, ng.outputs.total)
+    return ng
+
+
+@pytest.mark.parametrize("engine_cls", [LocalEngine, ThreadPoolEngine])
+def test_rerun_executes_only_modified_tasks_and_descendants(engine_cls):
+    ng = _build_graph()
+    engine = engine_cls()
+    _calls.clear()
+    assert engine.rerun(ng)["total"] == 33
+    assert len(_calls) == 3
+
+    # nothing changed: everything is reused
+    _calls.clear()
+    assert engine.rerun(ng)["total"] == 33
+    assert _calls == []
+
+    # edit the graph in place: only `left` and its descendant `total` run again
+    ng.tasks["left"].inputs.x.value = 5
+    _calls.clear()
+    assert engine.rerun(ng)["total"] == 37
+    assert sorted(_calls) == [(5, 2), (7, 30)]
+
+
+def test_rerun_against_explicit_previous_run_and_new_task():
+    engine = LocalEngine()
+    engine.rerun(_build_graph())
+    previous = engine.last_run
+
+    ng = _build_graph()
+    ng.add_task(traced_add, "extra", x=ng.tasks["total"].outputs.result, y=1)
+    _calls.clear()
+    engine = LocalEngine()
+    assert engine.rerun(ng, previous_run=previous)["total"] == 33
+    assert _calls == [(33, 1)]
+    assert engine.last_run.values["extra"]["result"] == 34
+
+
+@task()
+def below(x: int, y: int) -> bool:
+    return x < y
+
+
+@task.graph()
+def count_up(limit: int = 3, step: int = 1):
+    graph = get_current_graph()
+    graph.ctx.index = 0
+    with While(below(graph.ctx.index, limit).result):
+        graph.ctx.index = traced_add(graph.ctx.index, step).result
+    return graph.ctx.index
+
+
+@pytest.mark.parametrize("engine_cls", [LocalEngine, ThreadPoolEngine])
+def test_rerun_zone_graph_with_ctx(engine_cls):
+    ng = count_up.build(limit=3, step=1)
+    engine = engine_cls()
+    _calls.clear()
+    assert engine.rerun(ng)["result"] == 3
+    assert _calls == [(0, 1), (1, 1), (2, 1)]
+
+    # nothing changed: the While zone and everything in it are reused
+    _calls.clear()
+    assert engine.rerun(ng)["result"] == 3
+    assert _calls == []
+
+    # a new graph input value re-runs the loop that reads it
+    ng.inputs.step.value = 2
+    _calls.clear()
+    assert engine.rerun(ng)["result"] == 4
+    assert _calls == [(0, 2), (2, 2)]
+
+    # an explicit previous run is honored for a freshly built graph
+    previous = engine.last_run
+    _calls.clear()
+    assert LocalEngine().rerun(count_up.build(limit=3, step=2), previous)["result"] == 4
+    assert _calls == []
+
+
+@pytest.mark.asyncio
+async def test_async_rerun_reuses_previous_outputs():
+    engine = AsyncEngine()
+    ng = _build_graph()
+    assert (await engine.rerun(ng))["total"] == 33
+
+    ng.tasks["right"].inputs.y.value = 0
+    _calls.clear()
+    assert (await engine.rerun(ng))["total"] == 13
+    assert sorted(_calls) == [(3, 10), (10, 0)]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Iterator
+
+import pytest
+
+from node_graph import Graph, task
+from node_graph.socket_spec import namespace as ns
+
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.streaming import Stream
+from node_graph.engine.thread_pool import ThreadPoolEngine
+
+_events: list = []
+_lock = threading.Lock()
+
+
+def _log(kind: str, i: int) -> None:
+    with _lock:
+        _events.append((kind, i))
+
+
+@task()
+def produce(n: int) -> Iterator[int]:
+    for i in range(n):
+        _log("produced", i)
+        yield i
+
+
+@task()
+def consume(items) -> int:
+    total = 0
+    for item in items:
+        _log("consumed", item)
+        time.sleep(0.001)
+        total += item
+    return total
+
+
+def _max_lead(events) -> int:
+    """Largest number of items produced but not yet consumed."""
+    produced = consumed = lead = 0
+    for kind, _i in events:
+        if kind == "produced":
+            produced += 1
+        else:
+            consumed += 1
+        lead = max(lead, produced - consumed)
+    return lead
+
+
+def _pipeline(n: int) -> Graph:
+    ng = Graph(name="stream", outputs=ns(total=Any))
+    source = ng.add_task(produce, "produce", n=n)
+    sink = ng.add_task(consume, "consume", items=source.outputs.result)
+    ng.add_link(sink.outputs.result, ng.outputs.total)
+    return ng
+
+
+def test_local_engine_pulls_generator_items_lazily():
+    _events.clear()
+    assert LocalEngine().run(_pipeline(5))["total"] == 10
+    assert _events[:4] == [
+        ("produced", 0),
+        ("consumed", 0),
+        ("produced", 1),
+        ("consumed", 1),
+    ]
+
+
+def test_thread_pool_streams_through_a_bounded_queue():
+    _events.clear()
+    engine = ThreadPoolEngine(max_workers=2)
+    engine.stream_maxsize = 4
+    assert engine.run(_pipeline(200))["total"] == sum(range(200))
+    # consumption started long before the producer was done ...
+    first_consumed = _events.index(("consumed", 0))
+    assert ("produced", 199) in _events[first_consumed:]
+    # ... and the producer never ran far ahead of the consumer
+    assert _max_lead(_events) <= engine.stream_maxsize + 2
+
+
+def test_generator_with_several_consumers_is_materialized():
+    ng = Graph(name="fan_out", outputs=ns(a=Any, b=Any, items=Any))
+    source = ng.add_task(produce, "produce", n=4)
+    a = ng.add_task(consume, "a", items=source.outputs.result)
+    b = ng.add_task(consume, "b", items=source.outputs.result)
+    ng.add_link(a.outputs.result, ng.outputs.a)
+    ng.add_link(b.outputs.result, ng.outputs.b)
+    ng.add_link(source.outputs.result, ng.outputs["items"])
+    assert LocalEngine().run(ng) == {"a": 6, "b": 6, "items": [0, 1, 2, 3]}
+
+
+def test_stream_is_single_use_and_forwards_producer_errors():
+    def broken():
+        yield 1
+        raise ValueError("disk full")
+
+    stream = Stream(broken(), maxsize=1, name="broken").start()
+    with pytest.raises(ValueError, match="disk full"):
+        list(stream)
+    with pytest.raises(RuntimeError, match="already consumed"):
+        list(stream)
+
+
+@task()
+def produce_then_fail(n: int) -> Iterator[int]:
+    yield from range(n)
+    raise ValueError("disk full")
+
+
+def _states(engine) -> dict:
+    processes = engine.recorder.to_json()["process_nodes"].values()
+    return {p["name"]: p["state"] for p in processes if p["kind"] == "task"}
+
+
+@pytest.mark.parametrize("engine_cls", [LocalEngine, ThreadPoolEngine])
+def test_streaming_producer_ends_with_its_stream(engine_cls):
+    engine = engine_cls()
+    engine.run(_pipeline(3))
+    assert _states(engine) == {"produce": "FINISHED", "consume": "FINISHED"}
+
+    ng = Graph(name="broken_stream")
+    source = ng.add_task(produce_then_fail, "produce", n=3)
+    ng.add_task(consume, "consume", items=source.outputs.result)
+    engine = engine_cls()
+    with pytest.raises(ValueError, match="disk full"):
+        engine.run(ng)
+    assert _states(engine) == {"produce": "FAILED", "consume": "FAILED"}
+
+
+_attempts = {"consume": 0}
+
+
+def _no_overrides(task):
+    """retry the task with the same inputs"""
+
+
+@task()
+def consume_once_broken(items) -> int:
+    _attempts["consume"] += 1
+    total = sum(items)
+    if _attempts["consume"] == 1:
+        raise ConnectionError("transient")
+    return total
+
+
+def test_generator_is_materialized_for_a_consumer_that_can_be_retried():
+    from node_graph.engine.retry import RetryPolicy
+
+    ng = Graph(name="retried", outputs=ns(total=Any))
+    source = ng.add_task(produce, "produce", n=4)
+    sink = ng.add_task(consume_once_broken, "consume", items=source.outputs.result)
+    ng.add_link(sink.outputs.result, ng.outputs.total)
+    _attempts["consume"] = 0
+    engine = LocalEngine(retry_policy=RetryPolicy(max_retries=1, delay=0))
+    assert engine.run(ng)["total"] == 6
+    assert _attempts["consume"] == 2
+
+    # an error handler may run the consumer again, too
+    sink.add_error_handler(
+        {"retry": {"executor": _no_overrides, "exit_codes": [], "max_retries": 1}}
+    )
+    _attempts["consume"] = 0
+    assert LocalEngine().run(ng)["total"] == 6
+    assert _attempts["consume"] == 2
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import threading
+from typing import Any
+
+import pytest
+
+from node_graph import Graph, task
+from node_graph.socket_spec import namespace as ns
+from node_graph.tasks.tests import test_add
+
+from node_graph.engine.thread_pool import ThreadPoolEngine
+
+
+_barrier = threading.Barrier(2, timeout=5)
+
+
+@task()
+def wait_for_peer(x: int) -> int:
+    # only passes if both branches are running at the same time
+    _barrier.wait()
+    return x
+
+
+@task()
+def fail(x: int) -> int:
+    if x:
+        raise ValueError("boom")
+    return x
+
+
+@task()
+def double(x: float) -> float:
+    return x * 2
+
+
+@task.graph(outputs=ns(final=float))
+def double_chain(x: float):
+    first = double(x=x)
+    second = double(x=first.result)
+    return {"final": second.result}
+
+
+def test_thread_pool_engine_runs_independent_branches_concurrently():
+    _barrier.reset()
+    ng = Graph(name="thread-parallel", outputs=ns(total=Any))
+    left = ng.add_task(wait_for_peer, "left", x=1)
+    right = ng.add_task(wait_for_peer, "right", x=2)
+    add = ng.add_task(test_add, "add", x=left.outputs.result, y=right.outputs.result)
+    ng.add_link(add.outputs.result, ng.outputs.total)
+
+    engine = ThreadPoolEngine(max_workers=2)
+    results = engine.run(ng)
+
+    assert results["total"] == 3
+    prov = engine.recorder.to_json()
+    states = {info["name"]: info["state"] for info in prov["process_nodes"].values()}
+    assert states["left"] == states["right"] == states["add"] == "FINISHED"
+    add_pid = next(
+        pid for pid, info in prov["process_nodes"].items() if info["name"] == "add"
+    )
+    labels = {edge["label"] for edge in prov["edges"] if edge["dst"] == add_pid}
+    assert {"input:x", "input:y"}.issubset(labels)
+
+
+def test_thread_pool_engine_runs_subgraphs():
+    ng = Graph(name="thread-subgraph", outputs=ns(result=Any))
+    chain = ng.add_task(double_chain, "chain", x=2)
+    final = ng.add_task(double, "final", x=chain.outputs.final)
+    ng.add_link(final.outputs.result, ng.outputs.result)
+
+    engine = ThreadPoolEngine(max_workers=4)
+    assert engine.run(ng)["result"] == 16
+
+    names = {p["name"] for p in engine.recorder.to_json()["process_nodes"].values()}
+    assert {"chain__subgraph", "final"}.issubset(names)
+
+
+def test_thread_pool_engine_propagates_failures():
+    ng = Graph(name="thread-fail")
+    bad = ng.add_task(fail, "bad", x=1)
+    ng.add_task(test_add, "after", x=bad.outputs.result, y=1)
+
+    engine = ThreadPoolEngine(max_workers=2)
+    with pytest.raises(ValueError, match="boom"):
+        engine.run(ng)
+
+    states = {
+        info["name"]: info["state"]
+        for info in engine.recorder.to_json()["process_nodes"].values()
+    }
+    assert states["bad"] == "FAILED"
+    assert states["thread-fail"] == "FAILED"
+    assert "after" not in states
@@ -208,3 +208,145 @@ def test_decorator_node_applies_error_handlers(monkeypatch):
     _assert_executor_roundtrips(eh.executor)
     assert eh.exit_codes == [123]
     assert eh.max_retries == 2
+
+
+_flaky = {"failures": 0}
+
+
+def increase_x(task, increment=1):
+    """fix the failing input of the task"""
+    return {"x": task.inputs.x.value + increment}
+
+
+def test_engine_dispatches_error_handler_on_exit_code():
+    from node_graph import Graph, task
+    from node_graph.engine.local import LocalEngine
+    from node_graph.error_handler import ExitCodeError
+
+    @task(
+        error_handlers={
+            "increase_x": {
+                "executor": increase_x,
+                "exit_codes": [DummyExitCodes.ERROR_A],
+                "max_retries": 3,
+                "kwargs": {"increment": 2},
+            }
+        }
+    )
+    def positive(x: int) -> int:
+        if x < 0:
+            raise ExitCodeError(DummyExitCodes.ERROR_A, "x must be positive")
+        return x
+
+    ng = Graph()
+    ng.add_task(positive, "positive", x=-1)
+    engine = LocalEngine()
+    engine.run(ng)
+    assert ng.tasks.positive.outputs.result.value == 1
+    # the override only applies to the retried attempt
+    assert ng.tasks.positive.inputs.x.value == -1
+
+    attempts = sorted(
+        engine.recorder.to_json()["process_nodes"].values(),
+        key=lambda p: p["meta"].get("attempt", 1),
+    )
+    attempts = [p for p in attempts if p["kind"] == "task"]
+    assert [p["state"] for p in attempts] == ["FAILED", "FINISHED"]
+    assert attempts[0]["meta"]["exit_code"] == DummyExitCodes.ERROR_A
+    assert attempts[1]["meta"] == {"attempt": 2, "retry_reason": "increase_x"}
+
+
+def test_engine_gives_up_when_handler_retries_are_exhausted():
+    from node_graph import Graph, task
+    from node_graph.engine.local import LocalEngine
+    from node_graph.error_handler import ExitCodeError
+
+    @task(
+        error_handlers={
+            "test": {"executor": sample_handler, "exit_codes": [7], "max_retries": 2}
+        }
+    )
+    def always_fails(x: int) -> int:
+        if x is not None:
+            raise ExitCodeError(7)
+        return x
+
+    ng = Graph()
+    ng.add_task(always_fails, "always_fails", x=1)
+    engine = LocalEngine()
+    with pytest.raises(ExitCodeError):
+        engine.run(ng)
+    states = [
+        p["state"]
+        for p in engine.recorder.to_json()["process_nodes"].values()
+        if p["kind"] == "task"
+    ]
+    assert states == ["FAILED"] * 3
+
+
+def test_handler_retries_wait_the_policy_backoff_and_count_earlier_retries():
+    from node_graph import Graph, task
+    from node_graph.engine.retry import RetryPolicy, TaskAttempts
+    from node_graph.error_handler import ExitCodeError
+
+    @task(
+        error_handlers={
+            "increase_x": {"executor": increase_x, "exit_codes": [7], "max_retries": 2}
+        }
+    )
+    def positive(x: int) -> int:
+        return x
+
+    ng = Graph()
+    handle = ng.add_task(positive, "positive", x=-1)
+    policy = RetryPolicy(delay=0.5, backoff=2.0, jitter=0.0)
+    attempts = TaskAttempts(handle, policy)
+    assert attempts.on_failure(ExitCodeError(7)) == (0.5, {"x": 0})
+    assert attempts.on_failure(ExitCodeError(7)) == (1.0, {"x": 0})
+    assert attempts.on_failure(ExitCodeError(7)) is None
+    # without a policy the handler retry starts immediately
+    assert TaskAttempts(handle).on_failure(ExitCodeError(7)) == (0.0, {"x": 0})
+
+    # one of the two retries was already used
+    handle.get_error_handlers()["increase_x"].retry = 1
+    attempts = TaskAttempts(handle)
+    assert attempts.on_failure(ExitCodeError(7)) is not None
+    assert attempts.on_failure(ExitCodeError(7)) is None
+
+
+def test_engine_retry_policy_retries_transient_failures():
+    from node_graph import Graph, task
+    from node_graph.engine.local import LocalEngine
+    from node_graph.engine.retry import RetryPolicy
+
+    @task()
+    def flaky(x: int) -> int:
+        if _flaky["failures"] < 2:
+            _flaky["failures"] += 1
+            raise ConnectionError("transient")
+        return x
+
+    _flaky["failures"] = 0
+    ng = Graph()
+    ng.add_task(flaky, "flaky", x=5)
+    LocalEngine(retry_policy=RetryPolicy(max_retries=2, delay=0)).run(ng)
+    assert ng.tasks.flaky.outputs.result.value == 5
+
+    _flaky["failures"] = 0
+    with pytest.raises(ConnectionError):
+        LocalEngine(retry_policy=RetryPolicy(max_retries=1, delay=0)).run(ng)
+
+    _flaky["failures"] = 0
+    with pytest.raises(ConnectionError):
+        LocalEngine(
+            retry_policy=RetryPolicy(max_retries=5, delay=0, retry_on=(ValueError,))
+        ).run(ng)
+
+
+def test_retry_policy_backoff_is_exponential_and_capped():
+    from node_graph.engine.retry import RetryPolicy
+
+    policy = RetryPolicy(delay=1.0, backoff=2.0, max_delay=5.0, jitter=0.0)
+    assert [policy.delay_for(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    jittered = RetryPolicy(delay=1.0, jitter=0.5)
+    assert all(1.0 <= jittered.delay_for(1) <= 1.5 for _ in range(20))
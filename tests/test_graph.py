@@ -81,6 +81,30 @@ def test_delete_node(ng):
     assert len(ng.links) == nlink
 
 
+def test_link_index(ng):
+    """Links are indexed by the tasks they connect."""
+    add1 = ng.tasks["add1"]
+    add3 = ng.add_task(test_add, name="add3", x=add1.outputs[0])
+    add4 = ng.add_task(test_add, name="add4", x=add3.outputs[0], y=add1.outputs[0])
+    assert [lk.to_task.name for lk in ng.links._get_output_links("add1")][-2:] == [
+        "add3",
+        "add4",
+    ]
+    assert {lk.from_task.name for lk in ng.links._get_input_links("add4")} == {
+        "add1",
+        "add3",
+    }
+    ng.delete_tasks("add3")
+    assert ng.links._get_input_links("add3") == []
+    assert [lk.from_task.name for lk in ng.links._get_input_links("add4")] == ["add1"]
+    assert add1.outputs[0]._links[-1].to_task is add4
+    assert add4.inputs["x"]._links == []
+    del ng.links[ng.links._get_input_links("add4")[0].name]
+    assert ng.links._get_input_links("add4") == []
+    ng.links.clear()
+    assert ng.links._get_output_links("add1") == []
+
+
 def test_copy(ng):
     """Test copy task graph"""
     n = len(ng.tasks)
@@ -87,3 +87,144 @@ def test_provenance_recorder_save_graphviz(tmp_path):
     assert "task (" in content
     assert "OUTPUT\\nresult" in content
     assert "#de707f77" in content
+
+
+def test_sqlite_provenance_store_keeps_lineage_on_disk(tmp_path):
+    from typing import Any
+
+    from node_graph import Graph
+    from node_graph.engine.local import LocalEngine
+    from node_graph.engine.provenance_store import SqliteProvenanceStore
+    from node_graph.socket_spec import namespace as ns
+    from node_graph.tasks.tests import test_add
+
+    path = tmp_path / "prov.sqlite"
+    store = SqliteProvenanceStore(path, batch_size=4)
+    engine = LocalEngine(recorder=ProvenanceRecorder("wf-sqlite", store=store))
+
+    ng = Graph(name="wf-sqlite", outputs=ns(total=Any))
+    add1 = ng.add_task(test_add, "add1", x=1, y=2)
+    add2 = ng.add_task(test_add, "add2", x=add1.outputs.result, y=3)
+    ng.add_link(add2.outputs.result, ng.outputs.total)
+    assert engine.run(ng)["total"] == 6
+
+    # nothing left in memory once the graph process has ended
+    assert not store._running and not store._pending()
+
+    # a fresh store on the same file sees the whole run
+    reopened = SqliteProvenanceStore(path)
+    finished = {p.name for p in reopened.processes_by_state("FINISHED")}
+    assert {"add1", "add2", "wf-sqlite"} <= finished
+    (add1_proc,) = reopened.processes_by_name("add1")
+    (add2_proc,) = reopened.processes_by_name("add2")
+
+    output = next(
+        e.dst
+        for e in reopened.iter_edges()
+        if e.src == add2_proc.id and e.label.startswith("create")
+    )
+    lineage = reopened.ancestors(output)
+    assert {add1_proc.id, add2_proc.id} <= lineage
+    # same answer as the generic in-memory traversal
+    assert lineage == super(SqliteProvenanceStore, reopened).ancestors(output)
+    assert ProvenanceRecorder("wf", store=reopened).to_json()["edges"]
+
+
+def test_background_recorder_matches_synchronous_recording():
+    from typing import Any
+
+    from node_graph import Graph
+    from node_graph.engine.thread_pool import ThreadPoolEngine
+    from node_graph.socket_spec import namespace as ns
+    from node_graph.tasks.tests import test_add
+
+    def build():
+        ng = Graph(name="wf-bg", outputs=ns(total=Any))
+        prev = ng.add_task(test_add, "add0", x=0, y=1)
+        for i in range(1, 20):
+            prev = ng.add_task(test_add, f"add{i}", x=prev.outputs.result, y=1)
+        ng.add_link(prev.outputs.result, ng.outputs.total)
+        return ng
+
+    def summary(recorder):
+        data = recorder.to_json()
+        procs = {
+            p["id"]: (p["name"], p["state"]) for p in data["process_nodes"].values()
+        }
+        edges = sorted(
+            (
+                procs.get(e["src"], ("data",))[0],
+                procs.get(e["dst"], ("data",))[0],
+                e["label"],
+            )
+            for e in data["edges"]
+        )
+        return sorted(procs.values()), edges, len(data["data_nodes"])
+
+    sync = ProvenanceRecorder("wf-bg")
+    background = ProvenanceRecorder("wf-bg", background=True, batch_size=8)
+    assert ThreadPoolEngine(recorder=sync).run(build())["total"] == 20
+    assert ThreadPoolEngine(recorder=background).run(build())["total"] == 20
+    # the end of the run is a flush barrier: nothing is left in the queue
+    assert background._events.unfinished_tasks == 0
+    assert summary(background) == summary(sync)
+
+
+def test_background_recorder_reports_writer_errors():
+    import pytest
+
+    recorder = ProvenanceRecorder("wf-error", background=True)
+    pid = recorder.process_start("task", None, None, None)
+    recorder.set_process_meta("proc:unknown", attempt=2)
+    with pytest.raises(RuntimeError, match="Recording provenance failed"):
+        recorder.flush()
+    recorder.process_end(pid, state="FINISHED")
+    assert recorder.to_json()["process_nodes"][pid]["state"] == "FINISHED"
+
+
+def test_provenance_detail_levels_and_sampling():
+    from typing import Any
+
+    import pytest
+
+    from node_graph import Graph
+    from node_graph.engine.local import LocalEngine
+    from node_graph.socket_spec import namespace as ns
+    from node_graph.tasks.tests import test_string
+
+    def build():
+        ng = Graph(name="wf-detail", outputs=ns(text=Any))
+        node = ng.add_task(test_string, "text", value="x" * 100)
+        ng.add_link(node.outputs.result, ng.outputs.text)
+        return ng
+
+    def run(**options):
+        recorder = ProvenanceRecorder("wf-detail", **options)
+        engine = LocalEngine(recorder=recorder)
+        for _ in range(4):
+            engine.run(build())
+        return recorder.to_json()
+
+    data = run(detail="off")
+    assert not data["process_nodes"] and not data["edges"]
+
+    data = run(detail="processes-only")
+    assert len(data["process_nodes"]) == 8
+    assert not data["data_nodes"]
+    assert {e["label"] for e in data["edges"]} == {"call"}
+
+    data = run(preview_chars=10)
+    previews = [d["preview"] for d in data["data_nodes"].values()]
+    assert "xxxxxxxxxx... (+90 chars)" in previews
+
+    data = run(detail="full")
+    sizes = {d["preview"]: d["size_hint"] for d in data["data_nodes"].values()}
+    assert sizes["x" * 100] == 100
+
+    # one in two runs of the flow is recorded, with all of its tasks
+    data = run(sample_every=2)
+    names = sorted(p["name"] for p in data["process_nodes"].values())
+    assert names == ["text", "text", "wf-detail", "wf-detail"]
+
+    with pytest.raises(ValueError, match="Unknown provenance detail"):
+        ProvenanceRecorder("wf", detail="everything")
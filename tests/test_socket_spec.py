@@ -377,6 +377,20 @@ def test_build_outputs_from_annotation():
     assert "product" in spec.fields
 
 
+def test_build_outputs_for_generator_and_no_return():
+    def produce(n):
+        for i in range(n):
+            yield i
+
+    def log(x):
+        print(x)
+
+    spec = ss.SocketSpecAPI.build_outputs_from_signature(produce, explicit=None)
+    assert "result" in spec.fields
+    spec = ss.SocketSpecAPI.build_outputs_from_signature(log, explicit=None)
+    assert "result" not in spec.fields
+
+
 def test_validate_socket_data():
     with pytest.raises(TypeError, match="All elements in the list must be strings"):
         ss.validate_socket_data(["a", 2])
@@ -1,4 +1,10 @@
-from node_graph import Graph, task
+from collections import Counter
+
+import pytest
+
+from node_graph import Graph, get_current_graph, task
+from node_graph.engine.local import LocalEngine
+from node_graph.engine.thread_pool import ThreadPoolEngine
 from node_graph.manager import If, While, Zone
 from node_graph.tasks.tests import test_add
 
@@ -78,3 +84,72 @@ def test_while_zone_nesting_and_inputs():
         even_cond._task.name,
         outer._task.name,
     }
+
+
+@task()
+def add(x, y):
+    return x + y
+
+
+@task.graph()
+def while_with_if(index=0, limit=10, total=0, increment=1):
+    graph = get_current_graph()
+    graph.ctx.total = total
+    graph.ctx.index = index
+    condition = smaller_than(graph.ctx.index, limit).result
+
+    with While(condition):
+        is_even_cond = is_even(graph.ctx.index).result
+        with If(is_even_cond) as if_zone:
+            graph.ctx.total = add(x=graph.ctx.total, y=graph.ctx.index).result
+        next_index = add(x=graph.ctx.index, y=increment).result
+        graph.ctx.index = next_index
+        if_zone >> next_index
+
+    return graph.ctx.total
+
+
+def _runs_per_task(engine):
+    processes = engine.recorder.to_json()["process_nodes"].values()
+    return Counter(p["name"] for p in processes if p["kind"] == "task")
+
+
+@pytest.mark.parametrize("engine_cls", [LocalEngine, ThreadPoolEngine])
+def test_engine_runs_while_and_if_zones(engine_cls):
+    graph = while_with_if.build(index=0, limit=10, total=0, increment=1)
+    engine = engine_cls()
+    assert engine.run(graph)["result"] == 0 + 2 + 4 + 6 + 8
+
+    runs = _runs_per_task(engine)
+    # the condition is evaluated once before each of the 10 iterations and once to stop
+    assert runs["smaller_than"] == 11
+    assert runs["is_even"] == 10
+    # the If body only runs for even indices
+    assert runs["add"] == 5
+    assert runs["add1"] == 10
+
+    zones = {
+        p["name"]: p["meta"]
+        for p in engine.recorder.to_json()["process_nodes"].values()
+        if p["kind"] == "zone"
+    }
+    assert zones["while_zone"]["iterations"] == 10
+
+
+def test_local_engine_skips_false_if_and_caps_while():
+    with Graph("skip") as graph:
+        base = test_add(x=1, y=2)
+        with If(smaller_than(base.result, 0).result):
+            test_add(x=base.result, y=10)
+        with If(smaller_than(base.result, 0).result, invert_condition=True):
+            taken = test_add(x=base.result, y=20)
+        with While(smaller_than(base.result, 5).result, max_iterations=3):
+            looped = test_add(x=base.result, y=1)
+
+    engine = LocalEngine()
+    engine.run(graph)
+    runs = _runs_per_task(engine)
+    assert runs["test_add1"] == 0
+    assert runs[taken._task.name] == 1
+    assert runs[looped._task.name] == 3
+    assert taken._task.outputs.result.value == 23